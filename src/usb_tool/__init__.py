@@ -1,19 +1,44 @@
 # src/usb_tool/__init__.py
+# Kept import-free so `usb` startup and `import usb_tool.cli` stay cheap; the
+# services layer and backends load on first use.
+from __future__ import annotations
+
 from importlib import import_module
-from typing import Any
 
-from .services import DeviceManager
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
 
 
 def find_apricorn_device(
     expanded: bool = False,
     profile_scan: bool = False,
+    deadline_s: float | None = None,
 ):
+    from .services import DeviceManager
+
+    manager = DeviceManager()
+    return manager.list_devices(expanded=expanded, profile_scan=profile_scan, deadline_s=deadline_s)
+
+
+def iter_devices(
+    expanded: bool = False,
+    profile_scan: bool = False,
+    sort: bool = False,
+    deadline_s: float | None = None,
+):
+    """Yield each device as soon as its record is complete; pass ``sort=True`` for list order."""
+    from .services import DeviceManager
+
     manager = DeviceManager()
-    return manager.list_devices(expanded=expanded, profile_scan=profile_scan)
+    return manager.iter_devices(
+        expanded=expanded, profile_scan=profile_scan, sort=sort, deadline_s=deadline_s
+    )
 
 
 def __getattr__(name: str) -> Any:
+    if name == "DeviceManager":
+        return import_module(".services", __name__).DeviceManager
     if name == "windows_usb":
         return import_module(".backend.windows", __name__)
     if name == "linux_usb":
@@ -23,4 +48,4 @@ def __getattr__(name: str) -> Any:
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 
-__all__ = ["windows_usb", "linux_usb", "mac_usb", "find_apricorn_device"]
+__all__ = ["windows_usb", "linux_usb", "mac_usb", "find_apricorn_device", "iter_devices"]
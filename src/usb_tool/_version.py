@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import importlib.metadata
 import os
 import re
 import sys
@@ -88,9 +87,10 @@ def get_version(dist_name: str = PACKAGE_NAME) -> str:
     if repo_version:
         return repo_version
     try:
+        # importlib.metadata is costly to import, so only pay for it when needed.
+        import importlib.metadata
+
         return importlib.metadata.version(dist_name)
-    except importlib.metadata.PackageNotFoundError:
-        pass
     except Exception:
         pass
     return "Unknown"
@@ -1,8 +1,32 @@
 # src/usb_tool/backend/base.py
 
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
+from ..models import PokeResult
+
+
+class PokeSession:
+    """Pokes one device repeatedly; backends override it to keep the handle open."""
+
+    def __init__(self, backend: "AbstractBackend", device_identifier: Any):
+        self.backend = backend
+        self.device_identifier = device_identifier
+
+    def poke(self, lba: int = 0) -> PokeResult:
+        return self.backend.poke_device_result(self.device_identifier, lba)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "PokeSession":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
 
 class AbstractBackend(ABC):
     @abstractmethod
@@ -14,12 +38,52 @@ class AbstractBackend(ABC):
         """Scan for Apricorn devices on the current platform."""
         pass
 
+    def iter_devices(
+        self,
+        expanded: bool = False,
+        profile_scan: bool = False,
+    ) -> Iterator[Any]:
+        """Yield devices as each record is complete; unsorted. Defaults to a full scan."""
+        yield from self.scan_devices(expanded=expanded, profile_scan=profile_scan)
+
     @abstractmethod
-    def poke_device(self, device_identifier: Any) -> bool:
-        """Send a SCSI READ(10) command to the specified device."""
+    def poke_device(self, device_identifier: Any, lba: int = 0) -> bool:
+        """Send a one-block SCSI READ(10) at ``lba`` to the specified device."""
         pass
 
+    def poke_device_result(self, device_identifier: Any, lba: int = 0) -> PokeResult:
+        """Poke the device and report status and latency alongside success."""
+        start = time.perf_counter()
+        success = self.poke_device(device_identifier, lba)
+        return PokeResult(
+            success=bool(success),
+            elapsed_ms=(time.perf_counter() - start) * 1000.0,
+        )
+
+    def open_poke_session(self, device_identifier: Any) -> PokeSession:
+        """Return a session for repeated pokes of one device; close it when done."""
+        return PokeSession(self, device_identifier)
+
     @abstractmethod
     def sort_devices(self, devices: list[Any]) -> list[Any]:
         """Sort devices in a platform-appropriate order."""
         pass
+
+    def device_fingerprints(self) -> dict[str, Any] | None:
+        """
+        Return a cheap fingerprint per candidate device, or None when the platform
+        cannot fingerprint without a full scan.
+
+        A backend that returns fingerprints also defines
+        ``scan_block_device(key) -> record | None`` to rebuild the one device under
+        a fingerprint key; without it ``DeviceManager.list_devices_incremental``
+        falls back to full scans.
+        """
+        return None
+
+    def create_hotplug_monitor(self, expanded: bool = False, device_lock: Any = None) -> Any | None:
+        """Return a hotplug monitor for this platform, or None if unsupported.
+
+        ``device_lock`` is held around the monitor's scans; see ``DeviceManager.subscribe``.
+        """
+        return None
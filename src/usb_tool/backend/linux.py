@@ -2,22 +2,52 @@
 
 import json
 import os
+import queue
 import re
+import struct
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from dataclasses import dataclass, field
 from typing import Any
 
 from ..constants import EXCLUDED_PIDS
+from ..deadline import call_before_deadline, get_deadline, with_current_deadline
 from ..device_config import closest_values
-from ..models import UsbDeviceInfo
-
-# For Phase 3/4, still import from legacy if not moved
-from ..services import populate_device_version, prune_hidden_version_fields
+from ..models import PokeResult, UsbDeviceInfo
+from ..probe_workers import get_probe_pool
+from ..services import (
+    VERSION_FIELD_NAMES,
+    needs_version_probe,
+    populate_device_version,
+    prune_hidden_version_fields,
+)
+from ..tracing import get_tracer
 from ..utils import bytes_to_gb, find_closest
-from .base import AbstractBackend
+from .base import AbstractBackend, PokeSession
+from .pci_ids import load_pci_ids_index
+
+_SYSFS_USB_DEVICES_ROOT = "/sys/bus/usb/devices"
+_SYSFS_CLASS_BLOCK_ROOT = "/sys/class/block"
+_SYSFS_PCI_DEVICES_ROOT = "/sys/bus/pci/devices"
+_UDEV_DATA_ROOT = "/run/udev/data"
+_LOOP_BLOCK_MAJOR = "7"
+_SYSFS_SECTOR_BYTES = 512
+_BLKGETSIZE64 = 0x80081272
+_APRICORN_VID = "0984"
+_DEFAULT_VERSION_PROBE_WORKERS = 16
+_SG_TIMEOUT_MS = 5000
+# sysfs directory names along a USB disk's device path, e.g.
+# .../0000:00:14.0/usb2/2-1/2-1.3/2-1.3:1.0/host5/target5:0:0/5:0:0:0/block/sdb
+_PCI_ADDRESS_NAME = re.compile(r"^[0-9a-fA-F]{4}:[0-9a-fA-F]{2}:[0-9a-fA-F]{2}\.[0-7]$")
+_USB_ROOT_HUB_NAME = re.compile(r"^usb\d+$")
+_USB_DEVICE_NAME = re.compile(r"^\d+-[\d.]+$")
+_USB_INTERFACE_NAME = re.compile(r"^\d+-[\d.]+:\d+\.\d+$")
 
 
 def _normalize_pid(pid: str) -> str:
@@ -38,7 +68,28 @@ def _normalize_linux_serial(value: Any) -> str:
     return serial
 
 
+def _controller_manufacturer(description: str) -> str:
+    # usbController shows the manufacturer only: "Intel Corporation Alder Lake PCH
+    # USB 3.2 xHCI Host Controller" -> "Intel".
+    manufacturer = description.split(None, 1)[0].strip() if description.strip() else ""
+    return manufacturer or "N/A"
+
+
+def _parse_sysfs_int(value: Any, default: int = -1) -> int:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return default
+
+
+def _unknown_version_info() -> dict[str, Any]:
+    version_info: dict[str, Any] = dict.fromkeys(VERSION_FIELD_NAMES, "N/A")
+    version_info["_unknown_fields"] = VERSION_FIELD_NAMES
+    return version_info
+
+
 def _emit_profile_event(enabled: bool, prefix: str, **fields: Any) -> None:
+    get_tracer().event(prefix, category="linux-scan", **fields)
     if not enabled:
         return
 
@@ -65,170 +116,573 @@ def _emit_profile_summary(
 @dataclass
 class _LinuxBlockDeviceProbe:
     # Field mapping for the Linux hot path:
-    # - serial: lsblk SERIAL, then sysfs USB serial, then udev properties
-    # - driver_name / driver_transport: sysfs USB interface driver, then udev
-    # - pci_addr: sysfs topology path, then udev ID_PATH/DEVPATH
+    # - serial: lsblk SERIAL, then the topology's USB serial, then udev properties
+    # - driver_name / driver_transport: the topology's interface driver, then udev
+    # - pci_addr: the topology's xHCI controller, then udev ID_PATH/DEVPATH
+    # - usb_device: the topology node; when set, descriptors come from it, not a serial join
     block_device: str
     serial: str = ""
+    usb_device_path: str = ""
     driver_name: str = ""
     driver_transport: str = "Unknown"
     pci_addr: str = ""
     controller_name: str = "N/A"
     udev_info: dict[str, str] = field(default_factory=dict)
+    usb_device: "_LinuxUsbDevice | None" = None
+    # Output fields left unresolved because the scan deadline ran out.
+    unknown_fields: set[str] = field(default_factory=set)
+
+
+@dataclass
+class _LinuxUsbInterface:
+    name: str
+    path: str
+    driver_name: str = ""
+
+
+@dataclass
+class _LinuxUsbDevice:
+    # ``name`` is the sysfs name, "<bus>-<port path>" (e.g. "2-1.3").
+    name: str
+    path: str
+    controller_pci_addr: str
+    descriptor: dict[str, Any]
+    interfaces: dict[str, _LinuxUsbInterface] = field(default_factory=dict)
+
+    @property
+    def serial(self) -> str:
+        return str(self.descriptor.get("iSerial", ""))
+
+    @property
+    def bus_number(self) -> int:
+        return _parse_sysfs_int(self.descriptor.get("busNumber"))
+
+    @property
+    def device_address(self) -> int:
+        return _parse_sysfs_int(self.descriptor.get("deviceAddress"))
+
+
+@dataclass
+class _LinuxUsbBlockDevice:
+    block_device: str
+    sysfs_path: str
+    device: _LinuxUsbDevice
+    interface: _LinuxUsbInterface
+
+
+class _LinuxUsbTopology:
+    """
+    Controller -> device -> interface -> block device, for every USB-attached whole
+    disk, resolved once from sysfs paths and looked up by block device.
+    """
+
+    def __init__(self) -> None:
+        self.by_block_device: dict[str, _LinuxUsbBlockDevice] = {}
+
+    def block_device(self, block_device: str) -> _LinuxUsbBlockDevice | None:
+        return self.by_block_device.get(block_device)
+
+
+def _split_usb_sysfs_path(sysfs_path: str) -> tuple[str, str, str] | None:
+    """
+    Split a block device's sysfs path into (controller PCI address, USB device path,
+    interface name). None if the path is not under a USB interface.
+    """
+    parts = sysfs_path.split(os.sep)
+    interface_index = next(
+        (
+            index
+            for index in range(len(parts) - 1, 0, -1)
+            if _USB_INTERFACE_NAME.match(parts[index])
+        ),
+        -1,
+    )
+    if interface_index < 1 or not _USB_DEVICE_NAME.match(parts[interface_index - 1]):
+        return None
+    root_hub_index = next(
+        (
+            index
+            for index in range(interface_index - 1, -1, -1)
+            if _USB_ROOT_HUB_NAME.match(parts[index])
+        ),
+        -1,
+    )
+    controller = ""
+    if root_hub_index > 0 and _PCI_ADDRESS_NAME.match(parts[root_hub_index - 1]):
+        controller = parts[root_hub_index - 1].lower()
+    return controller, os.sep.join(parts[:interface_index]), parts[interface_index]
+
+
+@dataclass
+class _LinuxDeviceCandidate:
+    # An Apricorn block device whose identity is resolved but whose version probe
+    # has not run yet.
+    drive: dict[str, Any]
+    probe: _LinuxBlockDeviceProbe
+    descriptor: dict[str, Any]
+    vid: str
+    pid: str
+    serial: str
+    bcd_device: str
+    size_gb: str
+
+    @property
+    def block_device(self) -> str:
+        return self.probe.block_device
+
+    @property
+    def identity(self) -> str:
+        # Bus and device address change on every re-enumeration, which is when a
+        # firmware update becomes visible.
+        bus = _parse_sysfs_int(self.descriptor.get("busNumber"))
+        address = _parse_sysfs_int(self.descriptor.get("deviceAddress"))
+        if bus < 0 or address < 0:
+            return ""
+        return f"usb:{bus}-{address}"
+
+
+class _LinuxPokeSession(PokeSession):
+    # One-block READ(10), mirroring WindowsBackend.poke_device, on a handle and
+    # buffers that stay open for the life of the session. The sg node goes through
+    # SgEngine; without one (or without write access to it) SG_IO on the block device.
+    def __init__(
+        self, backend: AbstractBackend, block_device: str, block_size: int, sg_device: str = ""
+    ):
+        super().__init__(backend, block_device)
+        self.block_size = block_size
+        self._engine: Any = None
+        self._sg_device = ""
+        self._session: Any = None
+        self._open_error = ""
+        if sg_device:
+            from .linux_sg import SgEngine
+
+            engine = SgEngine(max_queue_per_device=1)
+            try:
+                engine.open(sg_device)
+            except OSError:
+                engine.close()
+            else:
+                self._engine = engine
+                self._sg_device = sg_device
+                return
+        try:
+            from ..device_version import LinuxScsiSession
+
+            self._session = LinuxScsiSession(block_device, data_capacity=block_size)
+        except OSError as exc:
+            self._open_error = exc.strerror or str(exc)
+
+    def poke(self, lba: int = 0) -> PokeResult:
+        if self._engine is not None:
+            return self._poke_sg_engine(lba)
+        start = time.perf_counter()
+        if self._session is None:
+            return PokeResult(success=False, error=self._open_error or "device not open")
+        try:
+            result = self._session.read10(lba, self.block_size, _SG_TIMEOUT_MS)
+        except OSError as exc:
+            return PokeResult(
+                success=False,
+                elapsed_ms=(time.perf_counter() - start) * 1000.0,
+                error=exc.strerror or str(exc),
+            )
+        return PokeResult(
+            success=result.ok,
+            elapsed_ms=(time.perf_counter() - start) * 1000.0,
+            command_ms=result.elapsed_ms,
+            kernel_ms=result.duration_ms,
+            scsi_status=result.status,
+            host_status=result.host_status,
+            driver_status=result.driver_status,
+            sense=result.sense,
+        )
+
+    def _poke_sg_engine(self, lba: int) -> PokeResult:
+        from .linux_sg import read10_command
+
+        start = time.perf_counter()
+        command = read10_command(lba, self.block_size, _SG_TIMEOUT_MS)
+        (completion,) = self._engine.run([(self._sg_device, command)])
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if completion.error:
+            return PokeResult(success=False, elapsed_ms=elapsed_ms, error=completion.error)
+        return PokeResult(
+            success=completion.ok,
+            elapsed_ms=elapsed_ms,
+            command_ms=completion.elapsed_ms,
+            kernel_ms=float(completion.duration_ms),
+            scsi_status=completion.status,
+            host_status=completion.host_status,
+            driver_status=completion.driver_status,
+            sense=completion.sense,
+        )
+
+    def close(self) -> None:
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 
 class LinuxBackend(AbstractBackend):
+    def __init__(
+        self,
+        sysfs_root: str | None = None,
+        dev_root: str = "/dev",
+        udev_data_root: str | None = None,
+    ):
+        # Roots are injectable so a generated tree can stand in for /sys, /dev and
+        # /run/udev/data. None keeps the module-level defaults.
+        self.sysfs_root = sysfs_root
+        self.dev_root = dev_root
+        self.udev_data_root = udev_data_root
+
+    @property
+    def _class_block_root(self) -> str:
+        if self.sysfs_root is None:
+            return _SYSFS_CLASS_BLOCK_ROOT
+        return os.path.join(self.sysfs_root, "class", "block")
+
+    @property
+    def _usb_devices_root(self) -> str:
+        if self.sysfs_root is None:
+            return _SYSFS_USB_DEVICES_ROOT
+        return os.path.join(self.sysfs_root, "bus", "usb", "devices")
+
+    @property
+    def _pci_devices_root(self) -> str:
+        if self.sysfs_root is None:
+            return _SYSFS_PCI_DEVICES_ROOT
+        return os.path.join(self.sysfs_root, "bus", "pci", "devices")
+
+    @property
+    def _udev_data_root(self) -> str:
+        return _UDEV_DATA_ROOT if self.udev_data_root is None else self.udev_data_root
+
+    def _dev_path(self, entry: str) -> str:
+        # sysfs spells "/" in device names as "!" (cciss!c0d0).
+        return os.path.join(self.dev_root, entry.replace("!", "/"))
+
     def scan_devices(
         self,
         expanded: bool = False,
         profile_scan: bool = False,
     ) -> list[UsbDeviceInfo]:
+        built = sorted(self._iter_scanned_devices(expanded, profile_scan), key=lambda item: item[0])
+        return [device for _, device in built]
+
+    def iter_devices(
+        self,
+        expanded: bool = False,
+        profile_scan: bool = False,
+    ) -> Iterator[UsbDeviceInfo]:
+        for _, device in self._iter_scanned_devices(expanded, profile_scan):
+            yield device
+
+    def _iter_scanned_devices(
+        self,
+        expanded: bool,
+        profile_scan: bool,
+    ) -> Iterator[tuple[int, UsbDeviceInfo]]:
+        # Yields (enumeration position, device) as each version probe completes.
         self._profile_scan_enabled = profile_scan
         self._profile_helper_events_enabled = False
+        tracer = get_tracer()
         scan_start = time.perf_counter()
 
-        lsblk_start = time.perf_counter()
-        lsblk_drives = self._list_usb_drives()
-        lsblk_ms = (time.perf_counter() - lsblk_start) * 1000.0
+        topology_start = time.perf_counter()
+        with tracer.span("usb_topology", category="linux-scan") as span:
+            topology = self._build_usb_topology()
+            span.set(usb_block_devices=len(topology.by_block_device))
+        topology_ms = (time.perf_counter() - topology_start) * 1000.0
+
+        block_devices_start = time.perf_counter()
+        with tracer.span("block_devices", category="linux-scan") as span:
+            lsblk_drives = self._list_usb_drives()
+            span.set(drives=len(lsblk_drives))
+        block_devices_ms = (time.perf_counter() - block_devices_start) * 1000.0
 
         probe_start = time.perf_counter()
-        probe_map = self._probe_block_devices(lsblk_drives)
+        with tracer.span("device_probe", category="linux-scan") as span:
+            probe_map = self._probe_block_devices(lsblk_drives, topology)
+            span.set(probed_devices=len(probe_map))
         probe_ms = (time.perf_counter() - probe_start) * 1000.0
 
         controller_lookup_start = time.perf_counter()
-        controller_map = self._resolve_probe_controllers(probe_map)
+        with tracer.span("controller_lookup", category="linux-scan"):
+            controller_map = self._resolve_probe_controllers(probe_map)
         controller_lookup_ms = (time.perf_counter() - controller_lookup_start) * 1000.0
         for block_device, controller_name in controller_map.items():
             probe_map[block_device].controller_name = controller_name
 
         lsusb_start = time.perf_counter()
-        lsusb_details = self._get_lsusb_details()
+        with tracer.span("descriptor_lookup", category="linux-scan") as span:
+            # Topology-matched disks carry their own descriptor; only the rest are
+            # joined by serial against sysfs or lsusb.
+            lsusb_details: dict[str, dict[str, Any]] = {}
+            if not get_deadline().expired() and any(
+                probe.usb_device is None for probe in probe_map.values()
+            ):
+                lsusb_details = self._get_usb_descriptor_details()
+            span.set(devices=len(lsusb_details))
         descriptor_lookup_ms = (time.perf_counter() - lsusb_start) * 1000.0
 
-        devices = []
-        version_query_ms = 0.0
-        device_build_start = time.perf_counter()
+        candidates: list[_LinuxDeviceCandidate] = []
         for lsblk_info in lsblk_drives:
             block_path = lsblk_info.get("name", "")
             if not block_path:
                 continue
 
-            probe = probe_map.get(block_path) or _LinuxBlockDeviceProbe(block_device=block_path)
-            serial = probe.serial or _normalize_linux_serial(lsblk_info.get("serial"))
-
-            if not serial:
-                continue
-
-            lsusb_info = lsusb_details.get(serial)
-            if not lsusb_info:
-                continue
-
-            vid = lsusb_info.get("idVendor", "").lower()
-            pid = _normalize_pid(lsusb_info.get("idProduct", ""))
-            if vid != "0984" or pid in EXCLUDED_PIDS:
+            # Disks filtered out before probing are not Apricorn devices.
+            probe = probe_map.get(block_path)
+            if probe is None:
                 continue
 
-            bcd_usb = 0.0
-            try:
-                bcd_usb = float(lsusb_info.get("bcdUSB", "0"))
-            except (ValueError, TypeError):
-                pass
-
-            bcd_dev = (
-                lsusb_info.get("bcdDevice", "0000")
-                .lower()
-                .replace("0x", "")
-                .replace(".", "")
-                .zfill(4)
-            )
-
-            size_raw = lsblk_info.get("size_gb", 0.0)
-            size_gb = "N/A (OOB Mode)"
-            if size_raw > 0:
-                opts = (
-                    closest_values.get(pid, (None, []))[1]
-                    or closest_values.get(bcd_dev, (None, []))[1]
-                )
-                if opts:
-                    closest = find_closest(size_raw, opts)
-                    size_gb = str(closest) if closest else str(round(size_raw))
-                else:
-                    size_gb = str(round(size_raw))
-
-            version_info = self._timed_populate_device_version(
-                vid,
-                pid,
-                serial,
-                block_path,
-                size_gb,
-            )
-            version_query_ms += version_info.pop("_profile_ms", 0.0)
-
-            dev_info = UsbDeviceInfo(
-                bcdUSB=bcd_usb,
-                idVendor=vid,
-                idProduct=pid,
-                bcdDevice=bcd_dev,
-                iManufacturer=lsusb_info.get("iManufacturer", "Apricorn"),
-                iProduct=lsusb_info.get("iProduct", "Unknown"),
-                iSerial=serial,
-                driverTransport=probe.driver_transport or "Unknown",
-                driveSizeGB=size_gb,
-                mediaType=lsblk_info.get("mediaType", "Unknown"),
-                **version_info,
-            )
-            dev_info.blockDevice = block_path
-            dev_info.usbController = probe.controller_name or "N/A"
-            dev_info.readOnly = bool(lsblk_info.get("readOnly", False))
+            candidate = self._match_device_candidate(lsblk_info, probe, lsusb_details)
+            if candidate is not None:
+                candidates.append(candidate)
 
-            prune_hidden_version_fields(dev_info)
-            devices.append(dev_info)
+        positions = {candidate.block_device: index for index, candidate in enumerate(candidates)}
+        device_count = 0
+        version_query_ms = 0.0
+        version_timings = []
+        device_build_ms = 0.0
+        # Time the consumer holds the generator suspended is not scan time.
+        consumer_ms = 0.0
+        version_probe_start = time.perf_counter()
+        for candidate, version_info in self._iter_device_versions(candidates):
+            position = positions[candidate.block_device]
+            profile_ms = version_info.pop("_profile_ms", 0.0)
+            version_query_ms += profile_ms
+            version_timings.append((position, f"{candidate.block_device}:{profile_ms:.2f}ms"))
+            build_start = time.perf_counter()
+            with tracer.span(
+                "device_build", category="linux-scan", block_device=candidate.block_device
+            ):
+                device = self._build_device_info(candidate, version_info)
+            device_build_ms += (time.perf_counter() - build_start) * 1000.0
+            device_count += 1
+            yield_start = time.perf_counter()
+            yield position, device
+            consumer_ms += (time.perf_counter() - yield_start) * 1000.0
+        version_probe_ms = (
+            (time.perf_counter() - version_probe_start) * 1000.0 - device_build_ms - consumer_ms
+        )
 
-        device_build_ms = (time.perf_counter() - device_build_start) * 1000.0
         _emit_profile_event(
             profile_scan,
             "linux-scan-profile details",
             populate_device_version_total=f"{version_query_ms:.2f}ms",
-            device_count=len(devices),
+            version_probe_workers=self._version_probe_worker_count(len(candidates)),
+            version_probe_timings=",".join(text for _, text in sorted(version_timings)) or "none",
+            device_count=device_count,
         )
-        total_ms = (time.perf_counter() - scan_start) * 1000.0
+        total_ms = (time.perf_counter() - scan_start) * 1000.0 - consumer_ms
         _emit_profile_summary(
             profile_scan,
             "linux-scan-profile",
             [
-                ("lsblk", lsblk_ms),
+                ("usb_topology", topology_ms),
+                ("block_devices", block_devices_ms),
                 ("device_probe", probe_ms),
                 ("controller_lookup", controller_lookup_ms),
                 ("descriptor_lookup", descriptor_lookup_ms),
+                ("version_probe", version_probe_ms),
                 ("device_build", device_build_ms),
                 ("total", total_ms),
             ],
             expanded=str(expanded).lower(),
-            lsblk_drives=len(lsblk_drives),
+            block_devices=len(lsblk_drives),
             probed_devices=len(probe_map),
             unique_pci_addrs=len(
                 {probe.pci_addr for probe in probe_map.values() if probe.pci_addr}
             ),
             lsusb_devices=len(lsusb_details),
-            devices=len(devices),
+            topology_devices=len(topology.by_block_device),
+            devices=device_count,
+        )
+
+    def scan_block_device(self, block_device: str) -> UsbDeviceInfo | None:
+        """Build the device record for a single block device, or None if it is not Apricorn."""
+        drive = self._read_sysfs_block_device(os.path.basename(block_device))
+        if drive is None:
+            return None
+
+        topology = self._build_usb_topology([os.path.basename(block_device)])
+        probe_map = self._probe_block_devices([drive], topology)
+        probe = probe_map.get(drive["name"])
+        if probe is None:
+            return None
+        probe.controller_name = self._resolve_probe_controllers(probe_map).get(drive["name"], "N/A")
+
+        descriptor_details = {} if probe.usb_device else self._get_usb_descriptor_details()
+
+        candidate = self._match_device_candidate(drive, probe, descriptor_details)
+        if candidate is None:
+            return None
+        version_info = self._probe_device_versions([candidate])[candidate.block_device]
+        version_info.pop("_profile_ms", None)
+        return self._build_device_info(candidate, version_info)
+
+    def device_fingerprints(self) -> dict[str, tuple[str, ...]] | None:
+        """
+        Fingerprint every USB-attached whole disk from a handful of sysfs reads.
+
+        Covers dev_t, USB bus/device number, size and the ro/removable flags, which
+        change on re-enumeration, unlock/lock and write-protect toggles.
+        """
+        if not os.path.isdir(self._class_block_root):
+            return None
+
+        fingerprints: dict[str, tuple[str, ...]] = {}
+        for block_device, usb_block in self._build_usb_topology().by_block_device.items():
+            block_dir = usb_block.sysfs_path
+            dev_number = self._read_sysfs_text(os.path.join(block_dir, "dev"))
+            if not dev_number:
+                continue
+            fingerprints[block_device] = (
+                dev_number,
+                str(usb_block.device.bus_number),
+                str(usb_block.device.device_address),
+                self._read_sysfs_text(os.path.join(block_dir, "size")),
+                self._read_sysfs_text(os.path.join(block_dir, "ro")),
+                self._read_sysfs_text(os.path.join(block_dir, "removable")),
+            )
+        return fingerprints
+
+    def get_usb_device_path(self, block_device: str) -> str:
+        """Return the sysfs directory of the USB device that owns ``block_device``."""
+        sysfs_path = self._get_block_device_sysfs_path(block_device)
+        split = _split_usb_sysfs_path(sysfs_path) if sysfs_path else None
+        return split[1] if split else ""
+
+    def create_hotplug_monitor(self, expanded: bool = False, device_lock: Any = None) -> Any:
+        from .linux_hotplug import LinuxHotplugMonitor
+
+        return LinuxHotplugMonitor(self, expanded=expanded, device_lock=device_lock)
+
+    def _match_device_candidate(
+        self,
+        lsblk_info: dict[str, Any],
+        probe: _LinuxBlockDeviceProbe,
+        descriptor_details: dict[str, dict[str, Any]],
+    ) -> _LinuxDeviceCandidate | None:
+        serial = probe.serial or _normalize_linux_serial(lsblk_info.get("serial"))
+        if probe.usb_device is not None:
+            # Matched by sysfs topology, so a blank or duplicated serial cannot
+            # drop or cross-wire the device.
+            lsusb_info = probe.usb_device.descriptor
+        else:
+            if not serial:
+                return None
+            lsusb_info = descriptor_details.get(serial, {})
+        if not lsusb_info:
+            return None
+
+        vid = lsusb_info.get("idVendor", "").lower()
+        pid = _normalize_pid(lsusb_info.get("idProduct", ""))
+        if vid != _APRICORN_VID or pid in EXCLUDED_PIDS:
+            return None
+
+        bcd_dev = (
+            lsusb_info.get("bcdDevice", "0000").lower().replace("0x", "").replace(".", "").zfill(4)
         )
-        return devices
 
-    def poke_device(self, device_identifier: Any) -> bool:
-        # Ported logic from poke_device.py
+        size_raw = lsblk_info.get("size_gb", 0.0)
+        size_gb = "N/A (OOB Mode)"
+        if size_raw > 0:
+            opts = (
+                closest_values.get(pid, (None, []))[1] or closest_values.get(bcd_dev, (None, []))[1]
+            )
+            if opts:
+                closest = find_closest(size_raw, opts)
+                size_gb = str(closest) if closest else str(round(size_raw))
+            else:
+                size_gb = str(round(size_raw))
+
+        return _LinuxDeviceCandidate(
+            drive=lsblk_info,
+            probe=probe,
+            descriptor=lsusb_info,
+            vid=vid,
+            pid=pid,
+            serial=serial,
+            bcd_device=bcd_dev,
+            size_gb=size_gb,
+        )
 
+    def _build_device_info(
+        self, candidate: _LinuxDeviceCandidate, version_info: dict[str, Any]
+    ) -> UsbDeviceInfo:
+        descriptor = candidate.descriptor
+        unknown_version_fields = version_info.pop("_unknown_fields", ())
+        bcd_usb = 0.0
         try:
-            fd = os.open(device_identifier, os.O_RDWR)
-            # This is a stub for the complex IOCTL logic
-            os.close(fd)
-            return True  # Assume success for now if we can open it
-        except OSError:
-            return False
+            bcd_usb = float(descriptor.get("bcdUSB", "0"))
+        except (ValueError, TypeError):
+            pass
+
+        dev_info = UsbDeviceInfo(
+            bcdUSB=bcd_usb,
+            idVendor=candidate.vid,
+            idProduct=candidate.pid,
+            bcdDevice=candidate.bcd_device,
+            iManufacturer=descriptor.get("iManufacturer", "Apricorn"),
+            iProduct=descriptor.get("iProduct", "Unknown"),
+            iSerial=candidate.serial,
+            driverTransport=candidate.probe.driver_transport or "Unknown",
+            driveSizeGB=candidate.size_gb,
+            mediaType=candidate.drive.get("mediaType", "Unknown"),
+            **version_info,
+        )
+        dev_info.blockDevice = candidate.block_device
+        dev_info.usbController = candidate.probe.controller_name or "N/A"
+        dev_info.busNumber = _parse_sysfs_int(descriptor.get("busNumber"))
+        dev_info.deviceAddress = _parse_sysfs_int(descriptor.get("deviceAddress"))
+        dev_info.readOnly = bool(candidate.drive.get("readOnly", False))
+        unknown_fields = candidate.probe.unknown_fields | set(unknown_version_fields)
+        if unknown_fields:
+            dev_info.unknownFields = sorted(unknown_fields)
+
+        prune_hidden_version_fields(dev_info)
+        return dev_info
+
+    def poke_device(self, device_identifier: Any, lba: int = 0) -> bool:
+        return self.poke_device_result(device_identifier, lba).success
+
+    def poke_device_result(self, device_identifier: Any, lba: int = 0) -> PokeResult:
+        start = time.perf_counter()
+        with self.open_poke_session(device_identifier) as session:
+            result = session.poke(lba)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return result
+
+    def open_poke_session(self, device_identifier: Any) -> PokeSession:
+        block_device = str(device_identifier)
+        block_size = _parse_sysfs_int(
+            self._read_sysfs_text(
+                os.path.join(
+                    self._class_block_root,
+                    os.path.basename(block_device),
+                    "queue",
+                    "logical_block_size",
+                )
+            ),
+            _SYSFS_SECTOR_BYTES,
+        )
+        return _LinuxPokeSession(
+            self, block_device, block_size, self._resolve_sg_device(block_device)
+        )
 
     def sort_devices(self, devices: list[UsbDeviceInfo]) -> list[UsbDeviceInfo]:
+        dev_prefix = os.path.join(self.dev_root, "")
+
         def _key(dev):
             path = getattr(dev, "blockDevice", "")
-            return path if path.startswith("/dev/") else "~~~~~"
+            return path if path.startswith(dev_prefix) else "~~~~~"
 
         return sorted(devices, key=_key)
 
@@ -239,14 +693,28 @@ class LinuxBackend(AbstractBackend):
         serial: str,
         block_path: str,
         size_gb: str,
+        bcd_device: str | None = None,
+        identity: str = "",
+        parent: Any = None,
+        read_result: tuple[bytes, str] | None = None,
     ) -> dict[str, Any]:
         start = time.perf_counter()
-        version_info = populate_device_version(
-            int(vid, 16),
-            int(pid, 16),
-            serial,
-            device_path=block_path,
-        )
+        with get_tracer().span(
+            "populate_device_version",
+            category="linux-scan",
+            parent=parent,
+            block_device=block_path,
+            serial=serial,
+        ):
+            version_info = populate_device_version(
+                int(vid, 16),
+                int(pid, 16),
+                serial,
+                device_path=block_path,
+                bcd_device=bcd_device,
+                identity=identity,
+                read_result=read_result,
+            )
         profile_ms = (time.perf_counter() - start) * 1000.0
         version_info["_profile_ms"] = profile_ms
         _emit_profile_event(
@@ -259,61 +727,322 @@ class LinuxBackend(AbstractBackend):
         )
         return version_info
 
+    def _resolve_sg_device(self, block_device: str) -> str:
+        from .linux_sg import resolve_sg_device
+
+        return resolve_sg_device(block_device, self._class_block_root, self.dev_root)
+
+    def _sg_engine_targets(self, candidates: list[_LinuxDeviceCandidate]) -> dict[str, str]:
+        # Block device -> sg node for the probes SgEngine can issue from this thread.
+        # USB_TOOL_LINUX_SG_ENGINE=0 keeps every probe on SG_IO threads; a probe
+        # worker pool isolates probes in other processes, so it takes precedence.
+        if os.getenv("USB_TOOL_LINUX_SG_ENGINE") == "0" or get_probe_pool() is not None:
+            return {}
+        targets: dict[str, str] = {}
+        for candidate in candidates:
+            sg_device = self._resolve_sg_device(candidate.block_device)
+            if sg_device and needs_version_probe(
+                int(candidate.vid, 16),
+                int(candidate.pid, 16),
+                candidate.serial,
+                bcd_device=candidate.bcd_device,
+                identity=candidate.identity,
+            ):
+                targets[candidate.block_device] = sg_device
+        return targets
+
+    def _iter_sg_engine_versions(
+        self,
+        candidates: list[_LinuxDeviceCandidate],
+        sg_targets: dict[str, str],
+        probe: Callable[..., dict[str, Any]],
+    ) -> Generator[tuple[_LinuxDeviceCandidate, dict[str, Any]], None, list[_LinuxDeviceCandidate]]:
+        # Every READ BUFFER is in flight at once from this thread. Returns the
+        # candidates whose sg node would not open, for the SG_IO path to retry.
+        from .linux_sg import SgEngine, read_buffer_command
+
+        deadline = get_deadline()
+        unopened: list[_LinuxDeviceCandidate] = []
+        submitted: dict[int, _LinuxDeviceCandidate] = {}
+        with SgEngine() as engine:
+            for candidate in candidates:
+                try:
+                    request_id = engine.submit(
+                        sg_targets[candidate.block_device], read_buffer_command(_SG_TIMEOUT_MS)
+                    )
+                except OSError:
+                    unopened.append(candidate)
+                    continue
+                submitted[request_id] = candidate
+            while engine.pending_count() or engine.has_completions():
+                remaining = deadline.timeout(None)
+                if remaining is not None and remaining <= 0:
+                    break
+                for request_id, completion in engine.poll(remaining).items():
+                    candidate = submitted.pop(request_id)
+                    if completion.error:
+                        read_result = (b"", "OSError")
+                    elif not completion.data and completion.elapsed_ms >= _SG_TIMEOUT_MS:
+                        # Same inference as the blocking path: an empty read that ran
+                        # the full command timeout timed out.
+                        read_result = (b"", "TimeoutError")
+                    else:
+                        read_result = (completion.data, "")
+                    yield candidate, probe(candidate, read_result)
+        # Out of budget: closing the sg fds above orphans the commands still in flight.
+        for candidate in submitted.values():
+            yield candidate, _unknown_version_info()
+        return unopened
+
+    def _version_probe_worker_count(self, candidate_count: int) -> int:
+        # Probes spend their time blocked in SG_IO, so threads overlap them well.
+        # USB_TOOL_LINUX_VERSION_PROBE_WORKERS caps concurrency; 1 restores serial probing.
+        limit = _parse_sysfs_int(
+            os.getenv("USB_TOOL_LINUX_VERSION_PROBE_WORKERS"), _DEFAULT_VERSION_PROBE_WORKERS
+        )
+        return max(min(candidate_count, limit), 1)
+
+    def _probe_device_versions(
+        self, candidates: list[_LinuxDeviceCandidate]
+    ) -> dict[str, dict[str, Any]]:
+        return {
+            candidate.block_device: version_info
+            for candidate, version_info in self._iter_device_versions(candidates)
+        }
+
+    def _iter_device_versions(
+        self, candidates: list[_LinuxDeviceCandidate]
+    ) -> Iterator[tuple[_LinuxDeviceCandidate, dict[str, Any]]]:
+        # Yields in completion order so callers can act on the fastest device first.
+        parent = get_tracer().current()
+
+        def _probe(
+            candidate: _LinuxDeviceCandidate, read_result: tuple[bytes, str] | None = None
+        ) -> dict[str, Any]:
+            return self._timed_populate_device_version(
+                candidate.vid,
+                candidate.pid,
+                candidate.serial,
+                candidate.block_device,
+                candidate.size_gb,
+                bcd_device=candidate.bcd_device,
+                identity=candidate.identity,
+                parent=parent,
+                read_result=read_result,
+            )
+
+        sg_targets = self._sg_engine_targets(candidates)
+        if sg_targets:
+            remaining = [c for c in candidates if c.block_device not in sg_targets]
+            remaining += yield from self._iter_sg_engine_versions(
+                [c for c in candidates if c.block_device in sg_targets], sg_targets, _probe
+            )
+            candidates = remaining
+
+        deadline = get_deadline()
+        max_workers = self._version_probe_worker_count(len(candidates))
+        if max_workers <= 1:
+            for candidate in candidates:
+                finished, version_info = call_before_deadline(_probe, candidate)
+                yield candidate, version_info if finished else _unknown_version_info()
+            return
+
+        # Daemon threads rather than a ThreadPoolExecutor: the interpreter joins
+        # executor workers at exit, so a probe wedged in SG_IO would hold up the
+        # CLI for the full command timeout after partial results were printed.
+        work = deque(enumerate(candidates))
+        results: queue.Queue[tuple[int, dict[str, Any]]] = queue.Queue()
+        stop = threading.Event()
+
+        def _worker() -> None:
+            while not stop.is_set():
+                try:
+                    index, candidate = work.popleft()
+                except IndexError:
+                    return
+                try:
+                    version_info = _probe(candidate)
+                except Exception:
+                    version_info = dict.fromkeys(VERSION_FIELD_NAMES, "N/A")
+                results.put((index, version_info))
+
+        for _ in range(max_workers):
+            threading.Thread(
+                target=with_current_deadline(_worker), name="usb-tool-version-probe", daemon=True
+            ).start()
+
+        outstanding = set(range(len(candidates)))
+        try:
+            while outstanding:
+                try:
+                    index, version_info = results.get(timeout=deadline.timeout(None))
+                except queue.Empty:
+                    break
+                outstanding.discard(index)
+                yield candidates[index], version_info
+            # Out of budget: report the stragglers now and leave their probes running.
+            for index in sorted(outstanding):
+                yield candidates[index], _unknown_version_info()
+        finally:
+            # A consumer that stops early must not start probes it no longer needs.
+            stop.set()
+
     # --- Internal Helpers ---
     def list_usb_drives(self):
         return self._list_usb_drives()
 
     def _probe_block_devices(
-        self, lsblk_drives: list[dict[str, Any]]
+        self,
+        lsblk_drives: list[dict[str, Any]],
+        topology: _LinuxUsbTopology | None = None,
     ) -> dict[str, _LinuxBlockDeviceProbe]:
-        candidates = [drive for drive in lsblk_drives if drive.get("name")]
+        if topology is None:
+            topology = self._build_usb_topology()
+        candidates = self._select_apricorn_block_devices(
+            [drive for drive in lsblk_drives if drive.get("name")], topology
+        )
         if not candidates:
             return {}
 
+        # Per-scan data stays local: the hotplug thread scans on the same backend.
+        udev_records = self._load_udev_database(
+            self._get_block_device_number(drive["name"], drive) for drive in candidates
+        )
+        return self._probe_block_device_candidates(candidates, udev_records)
+
+    def _probe_block_device_candidates(
+        self,
+        candidates: list[dict[str, Any]],
+        udev_records: dict[str, dict[str, str]] | None = None,
+    ) -> dict[str, _LinuxBlockDeviceProbe]:
         max_workers = min(len(candidates), max(os.cpu_count() or 1, 1), 8)
+        parent = get_tracer().current()
+        deadline = get_deadline()
         if max_workers <= 1:
             return {
-                drive["name"]: self._probe_block_device_context(drive["name"], drive)
+                drive["name"]: (
+                    self._probe_block_device_fields(drive["name"], drive, allow_udev=False)
+                    if deadline.expired()
+                    else self._probe_block_device_context(
+                        drive["name"], drive, parent, udev_records
+                    )
+                )
                 for drive in candidates
             }
 
         results: dict[str, _LinuxBlockDeviceProbe] = {}
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
             futures = {
-                executor.submit(self._probe_block_device_context, drive["name"], drive): drive
+                executor.submit(
+                    with_current_deadline(self._probe_block_device_context),
+                    drive["name"],
+                    drive,
+                    parent,
+                    udev_records,
+                ): drive
                 for drive in candidates
             }
-            for future in as_completed(futures):
-                drive = futures[future]
-                block_device = drive["name"]
-                try:
-                    results[block_device] = future.result()
-                except Exception:
-                    results[block_device] = _LinuxBlockDeviceProbe(
-                        block_device=block_device,
-                        serial=_normalize_linux_serial(drive.get("serial")),
-                    )
+            try:
+                for future in as_completed(futures, timeout=deadline.timeout(None)):
+                    drive = futures[future]
+                    block_device = drive["name"]
+                    try:
+                        results[block_device] = future.result()
+                    except Exception:
+                        results[block_device] = _LinuxBlockDeviceProbe(
+                            block_device=block_device,
+                            serial=_normalize_linux_serial(drive.get("serial")),
+                        )
+            except FuturesTimeoutError:
+                # Keep what the topology already knows about probes stuck in udevadm.
+                for drive in candidates:
+                    if drive["name"] not in results:
+                        results[drive["name"]] = self._probe_block_device_fields(
+                            drive["name"], drive, allow_udev=False
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         return results
 
+    def _select_apricorn_block_devices(
+        self, candidates: list[dict[str, Any]], topology: _LinuxUsbTopology
+    ) -> list[dict[str, Any]]:
+        # Drop NVMe/SATA/other-vendor disks using the USB topology before any udev,
+        # lspci or SG_IO work, so probe cost scales with Apricorn devices only.
+        # Disks without a sysfs node cannot be classified here and are kept.
+        selected = []
+        for drive in candidates:
+            usb_block = topology.block_device(drive["name"])
+            if usb_block is None:
+                if not self._get_block_device_sysfs_path(drive["name"]):
+                    selected.append(drive)
+                continue
+
+            descriptor = usb_block.device.descriptor
+            if descriptor.get("idVendor") != _APRICORN_VID or _is_excluded_pid(
+                descriptor.get("idProduct", "")
+            ):
+                continue
+
+            drive["usb_block"] = usb_block
+            selected.append(drive)
+
+        _emit_profile_event(
+            getattr(self, "_profile_helper_events_enabled", False),
+            "linux-vendor-filter-profile",
+            candidates=len(candidates),
+            selected=len(selected),
+        )
+        return selected
+
     def _probe_block_device_context(
         self,
         block_device: str,
         lsblk_info: dict[str, Any],
+        parent: Any = None,
+        udev_records: dict[str, dict[str, str]] | None = None,
+    ) -> _LinuxBlockDeviceProbe:
+        with get_tracer().span(
+            "probe_block_device", category="linux-scan", parent=parent, block_device=block_device
+        ):
+            return self._probe_block_device_fields(
+                block_device, lsblk_info, udev_records=udev_records
+            )
+
+    def _probe_block_device_fields(
+        self,
+        block_device: str,
+        lsblk_info: dict[str, Any],
+        allow_udev: bool = True,
+        udev_records: dict[str, dict[str, str]] | None = None,
     ) -> _LinuxBlockDeviceProbe:
         probe = _LinuxBlockDeviceProbe(
             block_device=block_device,
             serial=_normalize_linux_serial(lsblk_info.get("serial")),
         )
-        sysfs_path = self._get_block_device_sysfs_path(block_device)
+        usb_block: _LinuxUsbBlockDevice | None = lsblk_info.get("usb_block")
 
-        if sysfs_path:
-            probe.driver_name = self._find_usb_driver_name_in_sysfs(sysfs_path)
+        if usb_block is not None:
+            probe.usb_device = usb_block.device
+            probe.usb_device_path = usb_block.device.path
+            probe.driver_name = usb_block.interface.driver_name
             if not probe.serial:
-                probe.serial = self._find_usb_serial_in_sysfs(sysfs_path)
-            probe.pci_addr = self._extract_pci_address_from_text(sysfs_path)
+                probe.serial = usb_block.device.serial
+            probe.pci_addr = usb_block.device.controller_pci_addr
 
-        if not probe.serial or not probe.driver_name or not probe.pci_addr:
-            probe.udev_info = self._get_udev_info(block_device)
+        if not allow_udev:
+            # Past the scan deadline: report what the topology could not answer.
+            if not probe.driver_name:
+                probe.unknown_fields.add("driverTransport")
+            if not probe.pci_addr:
+                probe.unknown_fields.add("usbController")
+        elif not probe.serial or not probe.driver_name or not probe.pci_addr:
+            probe.udev_info = self._get_udev_info(
+                block_device,
+                self._get_block_device_number(block_device, lsblk_info),
+                udev_records=udev_records,
+            )
             if not probe.serial:
                 probe.serial = self._extract_serial_from_udev_info(probe.udev_info)
             if not probe.driver_name:
@@ -334,17 +1063,30 @@ class LinuxBackend(AbstractBackend):
 
         max_workers = min(len(pci_addresses), 4)
         cache: dict[str, str] = {}
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self._get_pci_controller_name, pci_addr): pci_addr
-                for pci_addr in pci_addresses
-            }
-            for future in as_completed(futures):
+        parent = get_tracer().current()
+
+        def _lookup(pci_addr: str) -> str:
+            with get_tracer().span(
+                "pci_controller_name", category="linux-scan", parent=parent, pci_addr=pci_addr
+            ):
+                return self._get_pci_controller_name(pci_addr)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            lookup = with_current_deadline(_lookup)
+            futures = {executor.submit(lookup, pci_addr): pci_addr for pci_addr in pci_addresses}
+            for future in as_completed(futures, timeout=get_deadline().timeout(None)):
                 pci_addr = futures[future]
                 try:
                     cache[pci_addr] = future.result()
                 except Exception:
                     cache[pci_addr] = "N/A"
+        except FuturesTimeoutError:
+            for probe in probe_map.values():
+                if probe.pci_addr and probe.pci_addr not in cache:
+                    probe.unknown_fields.add("usbController")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
         return {
             block_device: cache.get(probe.pci_addr, "N/A") if probe.pci_addr else "N/A"
@@ -356,22 +1098,11 @@ class LinuxBackend(AbstractBackend):
         if not dev_name:
             return ""
 
-        sysfs_path = os.path.join("/sys/class/block", dev_name)
+        sysfs_path = os.path.join(self._class_block_root, dev_name)
         if not os.path.exists(sysfs_path):
             return ""
         return os.path.realpath(sysfs_path)
 
-    def _iter_sysfs_ancestors(self, start_path: str):
-        current = os.path.realpath(start_path)
-        seen: set[str] = set()
-        while current and current not in seen:
-            seen.add(current)
-            yield current
-            parent = os.path.dirname(current)
-            if parent == current:
-                break
-            current = parent
-
     def _read_sysfs_link_name(self, path: str) -> str:
         if not os.path.lexists(path):
             return ""
@@ -384,27 +1115,158 @@ class LinuxBackend(AbstractBackend):
         except OSError:
             return ""
 
-    def _find_usb_driver_name_in_sysfs(self, sysfs_path: str) -> str:
-        for candidate in self._iter_sysfs_ancestors(sysfs_path):
-            if self._read_sysfs_link_name(os.path.join(candidate, "subsystem")) != "usb":
+    def _build_usb_topology(self, entries: Iterable[str] | None = None) -> _LinuxUsbTopology:
+        # One realpath per class/block entry; the USB device, interface, hubs and
+        # controller are read off the path, and each device's attributes once.
+        build_start = time.perf_counter()
+        topology = _LinuxUsbTopology()
+        if entries is None:
+            try:
+                entries = sorted(os.listdir(self._class_block_root))
+            except OSError:
+                entries = []
+        entries = list(entries)
+
+        devices: dict[str, _LinuxUsbDevice] = {}
+        for entry in entries:
+            block_dir = os.path.join(self._class_block_root, entry)
+            if os.path.exists(os.path.join(block_dir, "partition")):
                 continue
-            driver_name = self._read_sysfs_link_name(os.path.join(candidate, "driver"))
-            if driver_name and driver_name != "usb":
-                return driver_name.strip().lower()
-        return ""
-
-    def _find_usb_serial_in_sysfs(self, sysfs_path: str) -> str:
-        for candidate in self._iter_sysfs_ancestors(sysfs_path):
-            if self._read_sysfs_link_name(os.path.join(candidate, "subsystem")) != "usb":
+            sysfs_path = os.path.realpath(block_dir)
+            split = _split_usb_sysfs_path(sysfs_path)
+            if split is None:
                 continue
-            serial = _normalize_linux_serial(
-                self._read_sysfs_text(os.path.join(candidate, "serial"))
+            controller, device_path, interface_name = split
+
+            device = devices.get(device_path)
+            if device is None:
+                device = _LinuxUsbDevice(
+                    name=os.path.basename(device_path),
+                    path=device_path,
+                    controller_pci_addr=controller,
+                    descriptor=self._read_sysfs_usb_descriptor(device_path),
+                )
+                devices[device_path] = device
+            interface = device.interfaces.get(interface_name)
+            if interface is None:
+                interface_path = os.path.join(device_path, interface_name)
+                interface = _LinuxUsbInterface(
+                    name=interface_name,
+                    path=interface_path,
+                    driver_name=self._read_sysfs_link_name(
+                        os.path.join(interface_path, "driver")
+                    ).lower(),
+                )
+                device.interfaces[interface_name] = interface
+
+            block_device = self._dev_path(entry)
+            topology.by_block_device[block_device] = _LinuxUsbBlockDevice(
+                block_device=block_device,
+                sysfs_path=sysfs_path,
+                device=device,
+                interface=interface,
             )
-            if serial:
-                return serial
-        return ""
+
+        _emit_profile_event(
+            getattr(self, "_profile_helper_events_enabled", False),
+            "linux-usb-topology-profile",
+            build_ms=f"{(time.perf_counter() - build_start) * 1000.0:.2f}",
+            entries=len(entries),
+            usb_devices=len(devices),
+            usb_block_devices=len(topology.by_block_device),
+        )
+        return topology
 
     def _list_usb_drives(self):
+        drives = self._list_sysfs_block_devices()
+        if drives is None:
+            return self._list_lsblk_drives()
+        return drives
+
+    def _list_sysfs_block_devices(self) -> list[dict[str, Any]] | None:
+        # Mirrors `lsblk -d -e 7` (whole disks, no loop devices) without spawning a process
+        # and keeps exact byte counts instead of lsblk's rounded SIZE column.
+        # Returns None when sysfs is unavailable so the caller can fall back to lsblk.
+        walk_start = time.perf_counter()
+        try:
+            entries = sorted(os.listdir(self._class_block_root))
+        except OSError:
+            return None
+
+        drives = []
+        for entry in entries:
+            drive = self._read_sysfs_block_device(entry)
+            if drive is not None:
+                drives.append(drive)
+
+        _emit_profile_event(
+            getattr(self, "_profile_helper_events_enabled", False),
+            "linux-sysfs-block-profile",
+            walk_ms=f"{(time.perf_counter() - walk_start) * 1000.0:.2f}",
+            entries=len(entries),
+            drives=len(drives),
+        )
+        return drives
+
+    def _read_sysfs_block_device(self, entry: str) -> dict[str, Any] | None:
+        block_dir = os.path.join(self._class_block_root, entry)
+        if not os.path.isdir(block_dir):
+            return None
+        if os.path.exists(os.path.join(block_dir, "partition")):
+            return None
+        dev_number = self._read_sysfs_text(os.path.join(block_dir, "dev"))
+        if dev_number.partition(":")[0] == _LOOP_BLOCK_MAJOR:
+            return None
+
+        block_device = self._dev_path(entry)
+        size_bytes = -1
+        prefer_ioctl = os.getenv("USB_TOOL_LINUX_BLKGETSIZE64") == "1"
+        if prefer_ioctl:
+            size_bytes = self._read_block_device_size_ioctl(block_device)
+        if size_bytes < 0:
+            sectors = _parse_sysfs_int(self._read_sysfs_text(os.path.join(block_dir, "size")))
+            if sectors >= 0:
+                size_bytes = sectors * _SYSFS_SECTOR_BYTES
+        if size_bytes < 0 and not prefer_ioctl:
+            size_bytes = self._read_block_device_size_ioctl(block_device)
+        size_bytes = max(size_bytes, 0)
+
+        logical_block_size = _parse_sysfs_int(
+            self._read_sysfs_text(os.path.join(block_dir, "queue", "logical_block_size")),
+            _SYSFS_SECTOR_BYTES,
+        )
+        removable = self._read_sysfs_text(os.path.join(block_dir, "removable"))
+        read_only = self._read_sysfs_text(os.path.join(block_dir, "ro"))
+        return {
+            "name": block_device,
+            "serial": "",
+            "size_bytes": size_bytes,
+            "size_gb": bytes_to_gb(size_bytes),
+            "logical_block_size": logical_block_size,
+            "dev": dev_number,
+            "mediaType": ("Removable Media" if removable == "1" else "Basic Disk"),
+            "readOnly": read_only == "1",
+        }
+
+    def _read_block_device_size_ioctl(self, block_device: str) -> int:
+        try:
+            import fcntl
+        except ImportError:
+            return -1
+
+        try:
+            fd = os.open(block_device, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            return -1
+        try:
+            result = fcntl.ioctl(fd, _BLKGETSIZE64, bytes(8))
+            return int(struct.unpack("Q", result)[0])
+        except OSError:
+            return -1
+        finally:
+            os.close(fd)
+
+    def _list_lsblk_drives(self):
         cmd = [
             "lsblk",
             "-p",
@@ -418,7 +1280,9 @@ class LinuxBackend(AbstractBackend):
         ]
         try:
             exec_start = time.perf_counter()
-            res = subprocess.run(cmd, capture_output=True, text=True)
+            res = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=get_deadline().timeout()
+            )
             exec_ms = (time.perf_counter() - exec_start) * 1000.0
             if res.returncode != 0:
                 _emit_profile_event(
@@ -486,6 +1350,7 @@ class LinuxBackend(AbstractBackend):
                 capture_output=True,
                 text=True,
                 check=False,
+                timeout=get_deadline().timeout(),
             )
             exec_ms = (time.perf_counter() - exec_start) * 1000.0
         except Exception:
@@ -587,6 +1452,7 @@ class LinuxBackend(AbstractBackend):
                 capture_output=True,
                 text=True,
                 check=False,
+                timeout=get_deadline().timeout(),
             )
             exec_ms = (time.perf_counter() - exec_start) * 1000.0
         except Exception:
@@ -636,11 +1502,13 @@ class LinuxBackend(AbstractBackend):
         return {block_device: self._get_udev_info(block_device) for block_device in block_devices}
 
     def _parse_udev_properties(self, output: str) -> dict[str, str]:
+        # Accepts both `udevadm info` output ("E: KEY=value") and raw udev database
+        # records ("E:KEY=value").
         info: dict[str, str] = {}
         for line in output.splitlines():
-            if not line.startswith("E: "):
+            if not line.startswith("E:"):
                 continue
-            key, _, value = line[3:].partition("=")
+            key, _, value = line[2:].lstrip().partition("=")
             if key:
                 info[key.strip()] = value.strip()
         return info
@@ -657,7 +1525,71 @@ class LinuxBackend(AbstractBackend):
                 return serial
         return ""
 
-    def _get_udev_info(self, block_device: str) -> dict[str, str]:
+    def _get_block_device_number(
+        self, block_device: str, drive: dict[str, Any] | None = None
+    ) -> str:
+        dev_number = str((drive or {}).get("dev", "") or "").strip()
+        if dev_number:
+            return dev_number
+        try:
+            rdev = os.stat(block_device).st_rdev
+        except OSError:
+            return ""
+        return f"{os.major(rdev)}:{os.minor(rdev)}"
+
+    def _read_udev_database_record(self, dev_number: str) -> dict[str, str]:
+        record_path = os.path.join(self._udev_data_root, f"b{dev_number}")
+        try:
+            with open(record_path, encoding="utf-8", errors="replace") as handle:
+                return self._parse_udev_properties(handle.read())
+        except OSError:
+            return {}
+
+    def _load_udev_database(self, dev_numbers: Iterable[str]) -> dict[str, dict[str, str]] | None:
+        # One read per needed b<major>:<minor> record instead of one `udevadm info`
+        # process per disk. Returns None when the database is unavailable.
+        if not os.path.isdir(self._udev_data_root):
+            return None
+
+        load_start = time.perf_counter()
+        records = {
+            dev_number: self._read_udev_database_record(dev_number)
+            for dev_number in dict.fromkeys(dev_numbers)
+            if dev_number
+        }
+        _emit_profile_event(
+            getattr(self, "_profile_helper_events_enabled", False),
+            "linux-udev-db-profile",
+            load_ms=f"{(time.perf_counter() - load_start) * 1000.0:.2f}",
+            records=len(records),
+        )
+        return records
+
+    def _get_udev_database_info(
+        self,
+        block_device: str,
+        dev_number: str = "",
+        udev_records: dict[str, dict[str, str]] | None = None,
+    ) -> dict[str, str] | None:
+        dev_number = dev_number or self._get_block_device_number(block_device)
+        if udev_records is not None and dev_number in udev_records:
+            return dict(udev_records[dev_number])
+        if not os.path.isdir(self._udev_data_root):
+            return None
+        if not dev_number:
+            return {}
+        return self._read_udev_database_record(dev_number)
+
+    def _get_udev_info(
+        self,
+        block_device: str,
+        dev_number: str = "",
+        udev_records: dict[str, dict[str, str]] | None = None,
+    ) -> dict[str, str]:
+        database_info = self._get_udev_database_info(block_device, dev_number, udev_records)
+        if database_info is not None:
+            return database_info
+
         try:
             exec_start = time.perf_counter()
             res = subprocess.run(
@@ -665,6 +1597,7 @@ class LinuxBackend(AbstractBackend):
                 capture_output=True,
                 text=True,
                 check=False,
+                timeout=get_deadline().timeout(),
             )
             exec_ms = (time.perf_counter() - exec_start) * 1000.0
         except Exception:
@@ -721,6 +1654,45 @@ class LinuxBackend(AbstractBackend):
         return ""
 
     def _get_pci_controller_name(self, pci_addr: str) -> str:
+        controller = self._get_pci_controller_name_from_ids(pci_addr)
+        if controller is not None:
+            return controller
+        return self._get_pci_controller_name_from_lspci(pci_addr)
+
+    def _get_pci_controller_name_from_ids(self, pci_addr: str) -> str | None:
+        # Resolve sysfs vendor/device IDs against pci.ids in-process. Returns None when
+        # either source is unavailable so the caller can fall back to lspci.
+        lookup_start = time.perf_counter()
+        device_dir = os.path.join(self._pci_devices_root, pci_addr)
+        try:
+            vendor_id = int(self._read_sysfs_text(os.path.join(device_dir, "vendor")), 16)
+            device_id = int(self._read_sysfs_text(os.path.join(device_dir, "device")), 16)
+        except ValueError:
+            return None
+
+        index = load_pci_ids_index()
+        if index is None:
+            return None
+
+        # Build the same "<vendor> <device>" description lspci prints, using the
+        # vendor name alone only when pci.ids does not list the device.
+        vendor_name = index.vendor_name(vendor_id) or ""
+        device_name = index.device_name(vendor_id, device_id) if vendor_name else None
+        description = f"{vendor_name} {device_name}" if device_name else vendor_name
+        controller = _controller_manufacturer(description)
+        _emit_profile_event(
+            getattr(self, "_profile_helper_events_enabled", False),
+            "linux-pci-ids-profile",
+            pci_addr=pci_addr,
+            lookup_ms=f"{(time.perf_counter() - lookup_start) * 1000.0:.2f}",
+            vendor=f"{vendor_id:04x}",
+            device=f"{device_id:04x}",
+            description=json.dumps(description),
+            controller=controller,
+        )
+        return controller
+
+    def _get_pci_controller_name_from_lspci(self, pci_addr: str) -> str:
         try:
             exec_start = time.perf_counter()
             res = subprocess.run(
@@ -728,6 +1700,7 @@ class LinuxBackend(AbstractBackend):
                 capture_output=True,
                 text=True,
                 check=False,
+                timeout=get_deadline().timeout(),
             )
             exec_ms = (time.perf_counter() - exec_start) * 1000.0
         except Exception:
@@ -761,9 +1734,8 @@ class LinuxBackend(AbstractBackend):
             return "N/A"
         parts = line[0].split(": ", 1)
         description = parts[1].strip() if len(parts) == 2 else line[0].strip()
-        manufacturer = description.split(None, 1)[0].strip()
+        controller = _controller_manufacturer(description)
         parse_ms = (time.perf_counter() - parse_start) * 1000.0
-        controller = manufacturer or "N/A"
         _emit_profile_event(
             getattr(self, "_profile_helper_events_enabled", False),
             "linux-lspci-profile",
@@ -775,10 +1747,81 @@ class LinuxBackend(AbstractBackend):
         )
         return controller
 
-    def _get_lsusb_details(self):
+    def _get_usb_descriptor_details(self) -> dict[str, dict[str, Any]]:
+        details = self._get_sysfs_usb_details()
+        if details is None:
+            return self._get_lsusb_details()
+        return details
+
+    def _get_sysfs_usb_details(self) -> dict[str, dict[str, Any]] | None:
+        # One pass over /sys/bus/usb/devices replaces `lsusb` plus one `lsusb -v` per PID.
+        # Returns None when sysfs is unavailable so the caller can fall back to lsusb.
+        walk_start = time.perf_counter()
+        try:
+            entries = os.listdir(self._usb_devices_root)
+        except OSError:
+            return None
+
+        details: dict[str, dict[str, Any]] = {}
+        apricorn_devices = 0
+        for entry in entries:
+            # Interface nodes ("1-1:1.0") carry no device descriptor attributes.
+            if ":" in entry:
+                continue
+            device_path = os.path.join(self._usb_devices_root, entry)
+            vid = self._read_sysfs_text(os.path.join(device_path, "idVendor")).lower()
+            if vid != _APRICORN_VID:
+                continue
+            apricorn_devices += 1
+            descriptor = self._read_sysfs_usb_descriptor(device_path)
+            serial = descriptor.get("iSerial", "")
+            if serial:
+                details[serial] = descriptor
+
+        _emit_profile_event(
+            getattr(self, "_profile_helper_events_enabled", False),
+            "linux-sysfs-usb-profile",
+            walk_ms=f"{(time.perf_counter() - walk_start) * 1000.0:.2f}",
+            entries=len(entries),
+            apricorn_devices=apricorn_devices,
+            serials=len(details),
+        )
+        return details
+
+    def _read_sysfs_usb_descriptor(self, device_path: str) -> dict[str, Any]:
+        descriptor: dict[str, Any] = {}
+        for key, attribute in (
+            ("idVendor", "idVendor"),
+            ("idProduct", "idProduct"),
+            ("bcdDevice", "bcdDevice"),
+            ("bcdUSB", "version"),
+            ("iManufacturer", "manufacturer"),
+            ("iProduct", "product"),
+        ):
+            value = self._read_sysfs_text(os.path.join(device_path, attribute))
+            if value:
+                descriptor[key] = value.lower() if key in {"idVendor", "idProduct"} else value
+
+        serial = _normalize_linux_serial(self._read_sysfs_text(os.path.join(device_path, "serial")))
+        if serial:
+            descriptor["iSerial"] = serial
+
+        for key, attribute in (("busNumber", "busnum"), ("deviceAddress", "devnum")):
+            number = _parse_sysfs_int(self._read_sysfs_text(os.path.join(device_path, attribute)))
+            if number >= 0:
+                descriptor[key] = number
+        return descriptor
+
+    def _get_lsusb_details(self) -> dict[str, dict[str, Any]]:
         try:
             list_exec_start = time.perf_counter()
-            res = subprocess.run(["lsusb"], capture_output=True, text=True, check=False)
+            res = subprocess.run(
+                ["lsusb"],
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=get_deadline().timeout(),
+            )
             list_exec_ms = (time.perf_counter() - list_exec_start) * 1000.0
         except Exception:
             return {}
@@ -808,6 +1851,8 @@ class LinuxBackend(AbstractBackend):
         verbose_parse_total_ms = 0.0
 
         for pid in apricorn_pairs:
+            if get_deadline().expired():
+                break
             try:
                 verbose_exec_start = time.perf_counter()
                 verbose = subprocess.run(
@@ -815,6 +1860,7 @@ class LinuxBackend(AbstractBackend):
                     capture_output=True,
                     text=True,
                     check=False,
+                    timeout=get_deadline().timeout(),
                 )
                 verbose_exec_ms = (time.perf_counter() - verbose_exec_start) * 1000.0
                 verbose_exec_total_ms += verbose_exec_ms
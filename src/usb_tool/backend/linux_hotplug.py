@@ -0,0 +1,356 @@
+# src/usb_tool/backend/linux_hotplug.py
+
+"""Kernel uevent hotplug monitoring for the Linux backend.
+
+A ``NETLINK_KOBJECT_UEVENT`` socket delivers add/remove/change events. The
+monitor keeps an in-memory inventory of Apricorn devices keyed by block device
+and rebuilds only the entry an event touches, so consumers never need to rescan
+the whole bus to stay current.
+
+When udev is running the monitor listens to udev's re-broadcast instead of the
+raw kernel events. udev sends an event only after its rules have run and
+``/run/udev/data`` holds the device's record, which the scan reads.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import select
+import socket
+import struct
+import threading
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..device_version import scsi_session_scope
+from ..models import UsbDeviceInfo
+
+NETLINK_KOBJECT_UEVENT = 15
+# Group 1 carries raw kernel events; group 2 is udev's re-broadcast.
+UEVENT_KERNEL_GROUP = 1
+UEVENT_UDEV_GROUP = 2
+_UDEV_PREFIX = b"libudev\0"
+_UDEV_MAGIC = 0xFEEDCAFE
+# prefix[8], magic (big-endian), then header_size, properties_off and
+# properties_len in host byte order.
+_UDEV_HEADER = struct.Struct("=8s4sIII")
+_RECEIVE_BUFFER_BYTES = 1024 * 1024
+_MAX_UEVENT_BYTES = 8192
+
+HotplugCallback = Callable[[str, UsbDeviceInfo], None]
+
+
+@dataclass
+class UEvent:
+    action: str
+    devpath: str
+    subsystem: str = ""
+    devtype: str = ""
+    devname: str = ""
+    properties: dict[str, str] = field(default_factory=dict)
+
+    def block_device(self, dev_root: str = "/dev") -> str:
+        if not self.devname:
+            return ""
+        # The kernel sends "sdb"; udev's re-broadcast sends "/dev/sdb".
+        return os.path.join(dev_root, self.devname.removeprefix("/dev/"))
+
+    def sysfs_path(self, sysfs_root: str = "/sys") -> str:
+        return f"{sysfs_root.rstrip('/')}{self.devpath}" if self.devpath else ""
+
+
+def _udev_properties(payload: bytes) -> list[bytes] | None:
+    if len(payload) < _UDEV_HEADER.size:
+        return None
+    _, magic, _, properties_off, properties_len = _UDEV_HEADER.unpack_from(payload)
+    if int.from_bytes(magic, "big") != _UDEV_MAGIC:
+        return None
+    if properties_off < _UDEV_HEADER.size or properties_off + properties_len > len(payload):
+        return None
+    return payload[properties_off : properties_off + properties_len].split(b"\0")
+
+
+def parse_uevent(payload: bytes) -> UEvent | None:
+    """Parse a kernel (``action@devpath\\0KEY=value\\0...``) or udev uevent datagram."""
+    if payload.startswith(_UDEV_PREFIX):
+        # udev's re-broadcast: a binary header, then the same KEY=value list.
+        raw_properties = _udev_properties(payload)
+        if raw_properties is None:
+            return None
+        header = ""
+    else:
+        fields = payload.split(b"\0")
+        header = fields[0].decode("utf-8", errors="replace")
+        if "@" not in header:
+            return None
+        raw_properties = fields[1:]
+
+    properties: dict[str, str] = {}
+    for raw in raw_properties:
+        key, sep, value = raw.decode("utf-8", errors="replace").partition("=")
+        if sep:
+            properties[key] = value
+
+    action, _, devpath = header.partition("@")
+    if not properties.get("ACTION", action) or not properties.get("DEVPATH", devpath):
+        return None
+    return UEvent(
+        action=properties.get("ACTION", action),
+        devpath=properties.get("DEVPATH", devpath),
+        subsystem=properties.get("SUBSYSTEM", ""),
+        devtype=properties.get("DEVTYPE", ""),
+        devname=properties.get("DEVNAME", ""),
+        properties=properties,
+    )
+
+
+def udev_is_running(udev_data_root: str = "/run/udev/data") -> bool:
+    # udevd owns /run/udev/control next to its database while it runs.
+    return os.path.exists(os.path.join(os.path.dirname(udev_data_root.rstrip("/")), "control"))
+
+
+def open_uevent_socket(group: int = UEVENT_KERNEL_GROUP) -> socket.socket:
+    """Open a non-blocking socket bound to a uevent multicast group."""
+    sock = socket.socket(
+        socket.AF_NETLINK,  # type: ignore[attr-defined,unused-ignore]
+        socket.SOCK_DGRAM,
+        NETLINK_KOBJECT_UEVENT,
+    )
+    try:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RECEIVE_BUFFER_BYTES)
+        except OSError:
+            pass
+        sock.bind((0, group))
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class LinuxHotplugMonitor:
+    """Maintain the Apricorn device inventory from kernel hotplug events."""
+
+    def __init__(
+        self,
+        backend: Any,
+        expanded: bool = False,
+        device_lock: AbstractContextManager[Any] | None = None,
+    ):
+        self._backend = backend
+        # Passed to every full scan so resyncs keep the fields consumers asked for.
+        self.expanded = expanded
+        # Held around every scan, which sends READ BUFFER, so callers issuing their
+        # own pass-through commands can keep the two from overlapping.
+        self.device_lock: AbstractContextManager[Any] = (
+            device_lock if device_lock is not None else nullcontext()
+        )
+        self._lock = threading.RLock()
+        self._inventory: dict[str, UsbDeviceInfo] = {}
+        # block device -> sysfs path of the owning USB device, for usb remove events
+        self._usb_paths: dict[str, str] = {}
+        self._subscribers: list[HotplugCallback] = []
+        self._socket: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._wake_pipe: tuple[int, int] | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def _dev_root(self) -> str:
+        # Resolve event paths under the backend's roots, so inventory keys match its scans.
+        return str(getattr(self._backend, "dev_root", "/dev"))
+
+    @property
+    def _sysfs_root(self) -> str:
+        # get_usb_device_path reports resolved paths; resolve the root to match.
+        return os.path.realpath(getattr(self._backend, "sysfs_root", None) or "/sys")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        # Subscribe before the initial scan so nothing plugged in during it is missed.
+        udev_data_root = getattr(self._backend, "_udev_data_root", "/run/udev/data")
+        group = UEVENT_UDEV_GROUP if udev_is_running(udev_data_root) else UEVENT_KERNEL_GROUP
+        self._socket = open_uevent_socket(group)
+        self._wake_pipe = os.pipe()
+        self._stopping.clear()
+        self.resync()
+        self._thread = threading.Thread(target=self._run, name="usb-tool-hotplug", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._wake_pipe is not None:
+            try:
+                os.write(self._wake_pipe[1], b"\0")
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self._wake_pipe is not None:
+            for fd in self._wake_pipe:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self._wake_pipe = None
+
+    def devices(self) -> list[UsbDeviceInfo]:
+        with self._lock:
+            devices = list(self._inventory.values())
+        sorted_devices: list[UsbDeviceInfo] = self._backend.sort_devices(devices)
+        return sorted_devices
+
+    def subscribe(self, callback: HotplugCallback) -> Callable[[], None]:
+        """Register ``callback(action, device)``; returns a function that unsubscribes it."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def resync(self) -> None:
+        """Replace the inventory with a full scan, notifying subscribers of differences."""
+        with self.device_lock, scsi_session_scope():
+            devices = self._backend.scan_devices(expanded=self.expanded)
+        scanned = {
+            device.blockDevice: device for device in devices if getattr(device, "blockDevice", "")
+        }
+        with self._lock:
+            previous = self._inventory
+            self._inventory = {}
+            self._usb_paths = {}
+        for block_device, device in scanned.items():
+            self._store(block_device, device, previous.get(block_device))
+        for block_device, device in previous.items():
+            if block_device not in scanned:
+                self._notify("remove", device)
+
+    def handle_event(self, event: UEvent) -> None:
+        if event.subsystem == "block":
+            block_device = event.block_device(self._dev_root)
+            if event.devtype != "disk" or not block_device:
+                return
+            if event.action == "remove":
+                self._remove(block_device)
+            elif event.action in ("add", "change"):
+                self._refresh(block_device)
+        elif event.subsystem == "usb":
+            if event.devtype != "usb_device" or event.action != "remove":
+                return
+            # Block removals normally arrive first; this catches any that did not.
+            usb_path = event.sysfs_path(self._sysfs_root)
+            with self._lock:
+                orphaned = [
+                    block_device
+                    for block_device, path in self._usb_paths.items()
+                    if path == usb_path
+                ]
+            for block_device in orphaned:
+                self._remove(block_device)
+
+    def _refresh(self, block_device: str) -> None:
+        with self.device_lock, scsi_session_scope():
+            device = self._backend.scan_block_device(block_device)
+        with self._lock:
+            previous = self._inventory.get(block_device)
+        if device is None:
+            if previous is not None:
+                self._remove(block_device)
+            return
+        self._store(block_device, device, previous)
+
+    def _store(
+        self, block_device: str, device: UsbDeviceInfo, previous: UsbDeviceInfo | None
+    ) -> None:
+        usb_path = self._backend.get_usb_device_path(block_device)
+        with self._lock:
+            self._inventory[block_device] = device
+            if usb_path:
+                self._usb_paths[block_device] = usb_path
+        if previous is None:
+            self._notify("add", device)
+        elif previous.to_dict() != device.to_dict():
+            self._notify("change", device)
+
+    def _remove(self, block_device: str) -> None:
+        with self._lock:
+            device = self._inventory.pop(block_device, None)
+            self._usb_paths.pop(block_device, None)
+        if device is not None:
+            self._notify("remove", device)
+
+    def _notify(self, action: str, device: UsbDeviceInfo) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(action, device)
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        sock = self._socket
+        wake_pipe = self._wake_pipe
+        if sock is None or wake_pipe is None:
+            return
+        while not self._stopping.is_set():
+            try:
+                readable, _, _ = select.select([sock.fileno(), wake_pipe[0]], [], [])
+            except (OSError, ValueError):
+                return
+            if wake_pipe[0] in readable:
+                return
+            while True:
+                try:
+                    payload = sock.recv(_MAX_UEVENT_BYTES)
+                except BlockingIOError:
+                    break
+                except OSError as exc:
+                    if exc.errno == errno.ENOBUFS:
+                        # Events were dropped; only a full rescan is trustworthy now.
+                        self._safe_resync()
+                        continue
+                    return
+                event = parse_uevent(payload)
+                if event is None:
+                    continue
+                try:
+                    self.handle_event(event)
+                except Exception:
+                    pass
+
+    def _safe_resync(self) -> None:
+        try:
+            self.resync()
+        except Exception:
+            pass
+
+
+__all__ = [
+    "NETLINK_KOBJECT_UEVENT",
+    "UEVENT_KERNEL_GROUP",
+    "UEVENT_UDEV_GROUP",
+    "HotplugCallback",
+    "LinuxHotplugMonitor",
+    "UEvent",
+    "open_uevent_socket",
+    "parse_uevent",
+    "udev_is_running",
+]
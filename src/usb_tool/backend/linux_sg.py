@@ -0,0 +1,452 @@
+# src/usb_tool/backend/linux_sg.py
+
+"""Asynchronous SCSI pass-through over the Linux sg v3 read/write interface.
+
+``SG_IO`` blocks the calling thread until the command completes, so probing
+many devices at once needs one thread per command. The sg driver also accepts
+an ``sg_io_hdr`` via ``write()`` on a ``/dev/sg*`` node and returns it through
+``read()`` once the command finishes; the file descriptor turns readable at
+that point. ``SgEngine`` keeps commands in flight on any number of devices from
+a single thread, collecting completions with ``epoll`` (or ``select``), and
+``SgEngine.execute`` exposes the same machinery to asyncio via
+``loop.add_reader``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import errno
+import itertools
+import os
+import select
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..device_version import (
+    SG_DXFER_FROM_DEV,
+    SG_IO_HDR,
+    _build_read10_cdb,
+    _build_read_buffer_cdb,
+)
+
+SG_DXFER_NONE = -1
+SG_DXFER_TO_DEV = -2
+# Per-fd command queue depth of the sg driver (SG_MAX_QUEUE).
+SG_MAX_QUEUE = 16
+_SENSE_BUFFER_BYTES = 32
+_SYSFS_CLASS_BLOCK_ROOT = "/sys/class/block"
+
+
+@dataclass
+class ScsiCommand:
+    cdb: bytes
+    data_in_length: int = 0
+    data_out: bytes = b""
+    timeout_ms: int = 5000
+
+
+@dataclass
+class ScsiCompletion:
+    device_path: str
+    data: bytes = b""
+    status: int = 0
+    masked_status: int = 0
+    host_status: int = 0
+    driver_status: int = 0
+    sense: bytes = b""
+    resid: int = 0
+    # Kernel-reported command time, in whole milliseconds.
+    duration_ms: int = 0
+    # perf_counter time from write() to the completion being read back.
+    elapsed_ms: float = 0.0
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return (
+            not self.error
+            and self.status == 0
+            and self.host_status == 0
+            and (self.driver_status & 0x07) == 0
+        )
+
+
+@dataclass
+class _PendingCommand:
+    request_id: int
+    device_path: str
+    header: Any
+    # ctypes buffers referenced by header pointers; must outlive the command.
+    buffers: tuple[Any, ...]
+    data_in_length: int
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+def resolve_sg_device(
+    block_device: str,
+    class_block_root: str = _SYSFS_CLASS_BLOCK_ROOT,
+    dev_root: str = "/dev",
+) -> str:
+    """Return the ``/dev/sg*`` node backing ``block_device``, or "" if there is none."""
+    if os.path.basename(block_device).startswith("sg"):
+        return block_device
+    generic_dir = os.path.join(
+        class_block_root, os.path.basename(block_device), "device", "scsi_generic"
+    )
+    try:
+        entries = sorted(os.listdir(generic_dir))
+    except OSError:
+        return ""
+    return os.path.join(dev_root, entries[0]) if entries else ""
+
+
+def read_buffer_command(timeout_ms: int = 5000) -> ScsiCommand:
+    """The vendor READ BUFFER used for version probes."""
+    return ScsiCommand(cdb=_build_read_buffer_cdb(), data_in_length=1024, timeout_ms=timeout_ms)
+
+
+def read10_command(lba: int = 0, block_size: int = 512, timeout_ms: int = 5000) -> ScsiCommand:
+    """A one-block READ(10), as used by poke."""
+    return ScsiCommand(cdb=_build_read10_cdb(lba), data_in_length=block_size, timeout_ms=timeout_ms)
+
+
+class SgEngine:
+    """Keep SCSI commands in flight on many sg devices from one thread."""
+
+    def __init__(self, max_queue_per_device: int = SG_MAX_QUEUE):
+        self.max_queue_per_device = max(1, min(int(max_queue_per_device), SG_MAX_QUEUE))
+        self._fds: dict[str, int] = {}
+        self._paths_by_fd: dict[int, str] = {}
+        self._in_flight: dict[int, dict[int, _PendingCommand]] = {}
+        self._backlog: dict[int, deque[_PendingCommand]] = {}
+        self._completed: dict[int, ScsiCompletion] = {}
+        self._request_ids = itertools.count(1)
+        self._poller: Any = select.epoll() if hasattr(select, "epoll") else None
+        self._waiters: dict[int, asyncio.Future[ScsiCompletion]] = {}
+        self._reader_loops: dict[int, asyncio.AbstractEventLoop] = {}
+
+    # --- submission ---
+
+    def open(self, device_path: str) -> None:
+        """Open ``device_path`` now, so permission errors surface before the first submit."""
+        self._get_fd(device_path)
+
+    def submit(self, device_path: str, command: ScsiCommand) -> int:
+        """Queue ``command`` on ``device_path`` and return its request id."""
+        fd = self._get_fd(device_path)
+        pending = self._build_pending(next(self._request_ids), device_path, command)
+        if len(self._in_flight[fd]) >= self.max_queue_per_device:
+            self._backlog[fd].append(pending)
+        else:
+            self._dispatch(fd, pending)
+        return pending.request_id
+
+    def has_completions(self) -> bool:
+        return bool(self._completed)
+
+    def pending_count(self) -> int:
+        return sum(len(commands) for commands in self._in_flight.values()) + sum(
+            len(backlog) for backlog in self._backlog.values()
+        )
+
+    def is_pending(self, request_id: int) -> bool:
+        """Whether ``request_id`` is still queued or in flight on its device."""
+        return any(request_id in commands for commands in self._in_flight.values()) or any(
+            pending.request_id == request_id
+            for backlog in self._backlog.values()
+            for pending in backlog
+        )
+
+    # --- completion (blocking) ---
+
+    def poll(self, timeout: float | None = None) -> dict[int, ScsiCompletion]:
+        """Wait up to ``timeout`` seconds and return the commands that completed."""
+        busy = [fd for fd, commands in self._in_flight.items() if commands]
+        if busy and not self._completed:
+            for fd in self._wait_readable(busy, timeout):
+                self._drain(fd)
+        completed, self._completed = self._completed, {}
+        return completed
+
+    def run(
+        self, requests: Iterable[tuple[str, ScsiCommand]], timeout: float | None = None
+    ) -> list[ScsiCompletion]:
+        """Submit all ``requests`` at once and return completions in request order."""
+        request_ids = [self.submit(path, command) for path, command in requests]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results: dict[int, ScsiCompletion] = {}
+        while len(results) < len(request_ids):
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            results.update(self.poll(remaining))
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            # Completions an asyncio waiter or another poll() took will never show up here.
+            if not any(
+                self.is_pending(request_id)
+                for request_id in request_ids
+                if request_id not in results
+            ):
+                break
+        return [
+            results.get(request_id)
+            or ScsiCompletion(device_path="", error=os.strerror(errno.ETIMEDOUT))
+            for request_id in request_ids
+        ]
+
+    # --- completion (asyncio) ---
+
+    async def execute(self, device_path: str, command: ScsiCommand) -> ScsiCompletion:
+        """Run ``command`` and await its completion on the running event loop."""
+        loop = asyncio.get_running_loop()
+        request_id = self.submit(device_path, command)
+        future: asyncio.Future[ScsiCompletion] = loop.create_future()
+        self._waiters[request_id] = future
+        fd = self._fds[device_path]
+        if fd not in self._reader_loops:
+            loop.add_reader(fd, self._on_readable, fd)
+            self._reader_loops[fd] = loop
+        # A completion drained by a blocking poll() before we registered.
+        if request_id in self._completed:
+            self._resolve(request_id, self._completed.pop(request_id))
+        try:
+            return await future
+        finally:
+            self._waiters.pop(request_id, None)
+
+    async def execute_many(
+        self, requests: Iterable[tuple[str, ScsiCommand]]
+    ) -> list[ScsiCompletion]:
+        return list(
+            await asyncio.gather(*(self.execute(path, command) for path, command in requests))
+        )
+
+    # --- lifecycle ---
+
+    def close(self) -> None:
+        for fd, loop in list(self._reader_loops.items()):
+            try:
+                loop.remove_reader(fd)
+            except Exception:
+                pass
+        self._reader_loops.clear()
+        for fd in list(self._paths_by_fd):
+            self._close_fd(fd)
+        for future in self._waiters.values():
+            if not future.done():
+                future.cancel()
+        self._waiters.clear()
+        if self._poller is not None:
+            self._poller.close()
+            self._poller = None
+
+    def __enter__(self) -> SgEngine:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    # --- internals ---
+
+    def _open_device(self, device_path: str) -> int:
+        # The sg write/read interface needs O_RDWR; O_NONBLOCK keeps read() from
+        # waiting on commands that have not finished.
+        return os.open(device_path, os.O_RDWR | os.O_NONBLOCK)
+
+    def _write_request(self, fd: int, header: Any) -> None:
+        os.write(fd, memoryview(header).cast("B"))
+
+    def _read_completion(self, fd: int) -> bytes:
+        return os.read(fd, ctypes.sizeof(SG_IO_HDR))
+
+    def _get_fd(self, device_path: str) -> int:
+        fd = self._fds.get(device_path)
+        if fd is None:
+            fd = self._open_device(device_path)
+            self._fds[device_path] = fd
+            self._paths_by_fd[fd] = device_path
+            self._in_flight[fd] = {}
+            self._backlog[fd] = deque()
+            if self._poller is not None:
+                self._poller.register(fd, select.EPOLLIN)
+        return fd
+
+    def _close_fd(self, fd: int) -> None:
+        device_path = self._paths_by_fd.pop(fd, "")
+        self._fds.pop(device_path, None)
+        if self._poller is not None:
+            try:
+                self._poller.unregister(fd)
+            except (OSError, ValueError):
+                pass
+        for pending in [*self._in_flight.pop(fd, {}).values(), *self._backlog.pop(fd, ())]:
+            self._finish(pending, ScsiCompletion(device_path, error="device closed"))
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+    def _build_pending(
+        self, request_id: int, device_path: str, command: ScsiCommand
+    ) -> _PendingCommand:
+        cdb = ctypes.create_string_buffer(command.cdb, len(command.cdb))
+        sense = ctypes.create_string_buffer(_SENSE_BUFFER_BYTES)
+        header = SG_IO_HDR()
+        header.interface_id = ord("S")
+        header.cmd_len = len(command.cdb)
+        header.mx_sb_len = _SENSE_BUFFER_BYTES
+        header.cmdp = ctypes.cast(cdb, ctypes.c_void_p)
+        header.sbp = ctypes.cast(sense, ctypes.c_void_p)
+        header.timeout = max(int(command.timeout_ms), 1)
+        header.pack_id = request_id
+
+        if command.data_out:
+            data = ctypes.create_string_buffer(command.data_out, len(command.data_out))
+            header.dxfer_direction = SG_DXFER_TO_DEV
+            header.dxfer_len = len(command.data_out)
+        elif command.data_in_length > 0:
+            data = ctypes.create_string_buffer(command.data_in_length)
+            header.dxfer_direction = SG_DXFER_FROM_DEV
+            header.dxfer_len = command.data_in_length
+        else:
+            data = ctypes.create_string_buffer(0)
+            header.dxfer_direction = SG_DXFER_NONE
+        header.dxferp = ctypes.cast(data, ctypes.c_void_p)
+
+        return _PendingCommand(
+            request_id=request_id,
+            device_path=device_path,
+            header=header,
+            buffers=(cdb, sense, data),
+            data_in_length=command.data_in_length if not command.data_out else 0,
+        )
+
+    def _dispatch(self, fd: int, pending: _PendingCommand) -> None:
+        pending.submitted_at = time.perf_counter()
+        try:
+            self._write_request(fd, pending.header)
+        except OSError as exc:
+            self._finish(pending, ScsiCompletion(pending.device_path, error=str(exc)))
+            return
+        self._in_flight[fd][pending.request_id] = pending
+
+    def _wait_readable(self, fds: list[int], timeout: float | None) -> list[int]:
+        if self._poller is not None:
+            events = self._poller.poll(-1 if timeout is None else timeout)
+            return [fd for fd, _mask in events if fd in self._in_flight]
+        readable, _, _ = select.select(fds, [], [], timeout)
+        return list(readable)
+
+    def _drain(self, fd: int) -> None:
+        in_flight = self._in_flight.get(fd)
+        while in_flight:
+            try:
+                raw = self._read_completion(fd)
+            except BlockingIOError:
+                break
+            except OSError as exc:
+                for pending in list(in_flight.values()):
+                    self._finish(pending, ScsiCompletion(pending.device_path, error=str(exc)))
+                in_flight.clear()
+                break
+            if len(raw) < ctypes.sizeof(SG_IO_HDR):
+                break
+            reply = SG_IO_HDR.from_buffer_copy(raw)
+            completed = in_flight.pop(reply.pack_id, None)
+            if completed is not None:
+                self._finish(completed, self._completion_from_reply(completed, reply))
+
+        backlog = self._backlog.get(fd)
+        while backlog and in_flight is not None:
+            if len(in_flight) >= self.max_queue_per_device:
+                break
+            self._dispatch(fd, backlog.popleft())
+
+    def _completion_from_reply(self, pending: _PendingCommand, reply: Any) -> ScsiCompletion:
+        _cdb, sense, data = pending.buffers
+        data_length = max(0, pending.data_in_length - max(reply.resid, 0))
+        return ScsiCompletion(
+            device_path=pending.device_path,
+            data=data.raw[:data_length] if pending.data_in_length else b"",
+            status=reply.status,
+            masked_status=reply.masked_status,
+            host_status=reply.host_status,
+            driver_status=reply.driver_status,
+            sense=sense.raw[: reply.sb_len_wr],
+            resid=reply.resid,
+            duration_ms=reply.duration,
+            elapsed_ms=(time.perf_counter() - pending.submitted_at) * 1000.0,
+        )
+
+    def _finish(self, pending: _PendingCommand, completion: ScsiCompletion) -> None:
+        future = self._waiters.get(pending.request_id)
+        if future is not None:
+            self._resolve(pending.request_id, completion)
+        else:
+            self._completed[pending.request_id] = completion
+
+    def _resolve(self, request_id: int, completion: ScsiCompletion) -> None:
+        future = self._waiters.get(request_id)
+        if future is not None and not future.done():
+            future.set_result(completion)
+
+    def _on_readable(self, fd: int) -> None:
+        self._drain(fd)
+        if not self._in_flight.get(fd) and not self._backlog.get(fd):
+            loop = self._reader_loops.pop(fd, None)
+            if loop is not None:
+                loop.remove_reader(fd)
+
+
+def read_buffers(
+    block_devices: Iterable[str],
+    timeout: float | None = None,
+    class_block_root: str = _SYSFS_CLASS_BLOCK_ROOT,
+    dev_root: str = "/dev",
+) -> dict[str, ScsiCompletion]:
+    """Issue the version READ BUFFER on every device concurrently from this thread.
+
+    Devices still outstanding when ``timeout`` runs out report ``ETIMEDOUT``.
+    """
+    results: dict[str, ScsiCompletion] = {}
+    with SgEngine() as engine:
+        submitted: dict[int, str] = {}
+        for block_device in block_devices:
+            sg_device = resolve_sg_device(block_device, class_block_root, dev_root)
+            if not sg_device:
+                results[block_device] = ScsiCompletion(block_device, error="no sg device")
+                continue
+            try:
+                submitted[engine.submit(sg_device, read_buffer_command())] = block_device
+            except OSError as exc:
+                results[block_device] = ScsiCompletion(block_device, error=str(exc))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while engine.pending_count() or engine.has_completions():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            for request_id, completion in engine.poll(remaining).items():
+                completion.device_path = submitted[request_id]
+                results[completion.device_path] = completion
+
+    for block_device in submitted.values():
+        results.setdefault(
+            block_device, ScsiCompletion(block_device, error=os.strerror(errno.ETIMEDOUT))
+        )
+    return results
+
+
+__all__ = [
+    "SG_MAX_QUEUE",
+    "ScsiCommand",
+    "ScsiCompletion",
+    "SgEngine",
+    "read10_command",
+    "read_buffer_command",
+    "read_buffers",
+    "resolve_sg_device",
+]
@@ -7,12 +7,19 @@ import re
 import subprocess
 import sys
 import time
+from collections.abc import Iterator
 from typing import Any
 
 from ..constants import EXCLUDED_PIDS
+from ..deadline import call_before_deadline, get_deadline
 from ..device_config import closest_values
 from ..models import UsbDeviceInfo
-from ..services import populate_device_version, prune_hidden_version_fields
+from ..services import (
+    VERSION_FIELD_NAMES,
+    populate_device_version,
+    prune_hidden_version_fields,
+)
+from ..tracing import get_tracer
 from ..utils import bytes_to_gb, find_closest
 from .base import AbstractBackend
 
@@ -110,6 +117,7 @@ def _parse_ioreg_bool(value: Any) -> bool | None:
 
 
 def _emit_profile_event(enabled: bool, prefix: str, **fields: Any) -> None:
+    get_tracer().event(prefix, category="macos-scan", **fields)
     if not enabled:
         return
 
@@ -139,15 +147,30 @@ class MacOSBackend(AbstractBackend):
         expanded: bool = False,
         profile_scan: bool = False,
     ) -> list[UsbDeviceInfo]:
+        return list(self.iter_devices(expanded=expanded, profile_scan=profile_scan))
+
+    def iter_devices(
+        self,
+        expanded: bool = False,
+        profile_scan: bool = False,
+    ) -> Iterator[UsbDeviceInfo]:
+        tracer = get_tracer()
+        deadline = get_deadline()
         scan_start = time.perf_counter()
-        all_drives = self._list_usb_drives()
+        with tracer.span("system_profiler", category="macos-scan") as span:
+            all_drives = self._list_usb_drives()
+            span.set(matches=len(all_drives))
         system_profiler_ms = (time.perf_counter() - scan_start) * 1000.0
 
         ioreg_start = time.perf_counter()
-        storage_info_map = self._get_mass_storage_info_map()
+        with tracer.span("ioreg_mass_storage", category="macos-scan") as span:
+            storage_info_map = self._get_mass_storage_info_map()
+            span.set(storage_nodes=len(storage_info_map))
         ioreg_mass_storage_ms = (time.perf_counter() - ioreg_start) * 1000.0
 
-        devices = []
+        device_count = 0
+        # Time the consumer holds the generator suspended is not scan time.
+        consumer_ms = 0.0
         version_query_ms = 0.0
         diskutil_fallback_ms = 0.0
         diskutil_fallback_count = 0
@@ -163,6 +186,7 @@ class MacOSBackend(AbstractBackend):
             if vid != "0984" or _is_excluded_pid(pid):
                 continue
 
+            build_start = time.perf_counter()
             serial = drive.get("serial_num", "")
             bcd_dev = drive.get("bcd_device", "").replace(".", "")
             storage_info = storage_info_map.get(serial) or {}
@@ -185,7 +209,10 @@ class MacOSBackend(AbstractBackend):
             else:
                 size_gb = "N/A (OOB Mode)"
 
-            if media_type == "Unknown" and block_device:
+            unknown_fields: list[str] = []
+            if media_type == "Unknown" and block_device and deadline.expired():
+                unknown_fields.append("mediaType")
+            elif media_type == "Unknown" and block_device:
                 diskutil_fallback_count += 1
                 _emit_profile_event(
                     profile_scan,
@@ -195,7 +222,10 @@ class MacOSBackend(AbstractBackend):
                     serial=serial or "unknown",
                 )
                 media_type_start = time.perf_counter()
-                media_type = self._get_media_type_from_diskutil(block_device)
+                with tracer.span(
+                    "diskutil_fallback", category="macos-scan", block_device=block_device
+                ):
+                    media_type = self._get_media_type_from_diskutil(block_device)
                 diskutil_fallback_ms += (time.perf_counter() - media_type_start) * 1000.0
                 _emit_profile_event(
                     profile_scan,
@@ -208,15 +238,24 @@ class MacOSBackend(AbstractBackend):
             if media_type == "Unknown":
                 media_type = _fallback_media_type(pid, name)
 
-            version_info = {}
+            version_info: dict[str, Any] = {}
             if self._should_probe_version_info(size_gb, block_device):
-                version_info = self._timed_populate_device_version(
+                # The probe unmounts and waits for the disk to settle; past the
+                # deadline it is abandoned and the version fields stay unknown.
+                # The abandoned probe still remounts the disk, and exit waits for it.
+                finished, probed = call_before_deadline(
+                    self._timed_populate_device_version,
                     vid,
                     pid,
                     serial,
                     block_device or bsd_name,
+                    bcd_device=f"0{bcd_dev}" if bcd_dev else None,
                 )
-                version_query_ms += version_info.pop("_profile_ms", 0.0)
+                if finished:
+                    version_info = probed
+                    version_query_ms += version_info.pop("_profile_ms", 0.0)
+                else:
+                    unknown_fields.extend(VERSION_FIELD_NAMES)
             else:
                 _emit_profile_event(
                     profile_scan,
@@ -244,20 +283,32 @@ class MacOSBackend(AbstractBackend):
             )
             if block_device:
                 dev_info.blockDevice = block_device
+            if unknown_fields:
+                dev_info.unknownFields = sorted(unknown_fields)
 
             prune_hidden_version_fields(dev_info)
-            devices.append(dev_info)
+            device_count += 1
+            tracer.add_span(
+                "device_build",
+                build_start,
+                time.perf_counter(),
+                category="macos-scan",
+                serial=serial or "unknown",
+            )
+            yield_start = time.perf_counter()
+            yield dev_info
+            consumer_ms += (time.perf_counter() - yield_start) * 1000.0
 
-        device_build_ms = (time.perf_counter() - device_build_start) * 1000.0
+        device_build_ms = (time.perf_counter() - device_build_start) * 1000.0 - consumer_ms
         _emit_profile_event(
             profile_scan,
             "macos-scan-profile details",
             populate_device_version_total=f"{version_query_ms:.2f}ms",
             diskutil_fallback_total=f"{diskutil_fallback_ms:.2f}ms",
             diskutil_fallback_count=diskutil_fallback_count,
-            device_count=len(devices),
+            device_count=device_count,
         )
-        total_ms = (time.perf_counter() - scan_start) * 1000.0
+        total_ms = (time.perf_counter() - scan_start) * 1000.0 - consumer_ms
         _emit_profile_summary(
             profile_scan,
             "macos-scan-profile",
@@ -270,11 +321,10 @@ class MacOSBackend(AbstractBackend):
             expanded=str(expanded).lower(),
             profiler_matches=len(all_drives),
             storage_nodes=len(storage_info_map),
-            devices=len(devices),
+            devices=device_count,
         )
-        return devices
 
-    def poke_device(self, device_identifier: Any) -> bool:
+    def poke_device(self, device_identifier: Any, lba: int = 0) -> bool:
         raise RuntimeError("macOS poke is not currently supported.")
 
     def sort_devices(self, devices: list[UsbDeviceInfo]) -> list[UsbDeviceInfo]:
@@ -292,14 +342,21 @@ class MacOSBackend(AbstractBackend):
         pid: str,
         serial: str,
         device_path: str,
+        bcd_device: str | None = None,
     ) -> dict[str, Any]:
         start = time.perf_counter()
-        version_info = populate_device_version(
-            int(vid, 16),
-            int(pid, 16),
-            serial,
-            bsd_name=device_path,
-        )
+        # A cache hit skips the unmount and settle delay _query_usb_core needs.
+        with get_tracer().span(
+            "populate_device_version", category="macos-scan", device_path=device_path, serial=serial
+        ):
+            version_info = populate_device_version(
+                int(vid, 16),
+                int(pid, 16),
+                serial,
+                bsd_name=device_path,
+                bcd_device=bcd_device,
+                identity=device_path,
+            )
         version_info["_profile_ms"] = (time.perf_counter() - start) * 1000.0
         return version_info
 
@@ -326,6 +383,7 @@ class MacOSBackend(AbstractBackend):
                 ["system_profiler", "SPUSBDataType", "-json"],
                 capture_output=True,
                 text=True,
+                timeout=get_deadline().timeout(),
             )
             if res.returncode != 0:
                 return []
@@ -362,7 +420,10 @@ class MacOSBackend(AbstractBackend):
                 if name and bsd:
                     try:
                         res = subprocess.run(
-                            ["diskutil", "info", bsd], capture_output=True, text=True
+                            ["diskutil", "info", bsd],
+                            capture_output=True,
+                            text=True,
+                            timeout=get_deadline().timeout(),
                         )
                         if (
                             res.returncode == 0
@@ -388,6 +449,7 @@ class MacOSBackend(AbstractBackend):
                 capture_output=True,
                 text=True,
                 check=False,
+                timeout=get_deadline().timeout(),
             )
         except Exception:
             return {}
@@ -464,6 +526,7 @@ class MacOSBackend(AbstractBackend):
                 ["diskutil", "info", "-plist", block_device],
                 capture_output=True,
                 check=False,
+                timeout=get_deadline().timeout(),
             )
         except Exception:
             return "Unknown"
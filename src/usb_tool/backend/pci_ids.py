@@ -0,0 +1,93 @@
+# src/usb_tool/backend/pci_ids.py
+
+"""Indexed vendor/device name lookup against the system ``pci.ids`` database.
+
+The file is read once per process and reduced to a vendor-id -> byte-offset
+index. Device names are resolved by scanning only the lines that belong to
+the requested vendor, so a lookup never walks the whole database.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+
+PCI_IDS_PATHS = (
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+    "/usr/local/share/pci.ids",
+)
+
+_VENDOR_LINE_RE = re.compile(rb"^([0-9a-fA-F]{4})  ", re.MULTILINE)
+
+_index_cache: dict[tuple[str, ...], PciIdsIndex | None] = {}
+_index_lock = threading.Lock()
+
+
+class PciIdsIndex:
+    def __init__(self, data: bytes):
+        self._data = data
+        # vendor id -> offset of the vendor's name (just past "xxxx  ")
+        self._vendor_offsets: dict[int, int] = {
+            int(match.group(1), 16): match.end() for match in _VENDOR_LINE_RE.finditer(data)
+        }
+
+    def __len__(self) -> int:
+        return len(self._vendor_offsets)
+
+    def _line_at(self, offset: int) -> tuple[str, int]:
+        end = self._data.find(b"\n", offset)
+        if end < 0:
+            end = len(self._data)
+        return self._data[offset:end].decode("utf-8", errors="replace").strip(), end + 1
+
+    def vendor_name(self, vendor_id: int) -> str | None:
+        offset = self._vendor_offsets.get(vendor_id)
+        if offset is None:
+            return None
+        name, _ = self._line_at(offset)
+        return name or None
+
+    def device_name(self, vendor_id: int, device_id: int) -> str | None:
+        offset = self._vendor_offsets.get(vendor_id)
+        if offset is None:
+            return None
+
+        _, position = self._line_at(offset)
+        prefix = f"\t{device_id:04x}  ".encode("ascii")
+        data = self._data
+        while position < len(data):
+            # Device lines are indented by one tab, subsystems by two. Comments are
+            # skipped; anything else (the next vendor or class) ends the block.
+            if data.startswith(prefix, position):
+                name, _ = self._line_at(position + len(prefix))
+                return name or None
+            if not data.startswith((b"\t", b"#"), position):
+                return None
+            next_line = data.find(b"\n", position)
+            if next_line < 0:
+                return None
+            position = next_line + 1
+        return None
+
+
+def load_pci_ids_index(paths: tuple[str, ...] = PCI_IDS_PATHS) -> PciIdsIndex | None:
+    """Return the memoized index for the first readable ``pci.ids`` in ``paths``."""
+    with _index_lock:
+        if paths in _index_cache:
+            return _index_cache[paths]
+
+        index = None
+        for path in paths:
+            try:
+                with open(path, "rb") as handle:
+                    index = PciIdsIndex(handle.read())
+            except OSError:
+                continue
+            break
+        _index_cache[paths] = index
+        return index
+
+
+__all__ = ["PCI_IDS_PATHS", "PciIdsIndex", "load_pci_ids_index"]
@@ -7,18 +7,26 @@ import subprocess
 import sys
 import time
 from collections import defaultdict
+from collections.abc import Iterator
 from ctypes import wintypes
 from importlib import import_module
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, cast
 
+from .. import device_version
 from ..constants import EXCLUDED_PIDS
+from ..deadline import call_before_deadline, get_deadline
 from ..device_config import closest_values
-from ..models import UsbDeviceInfo
-from ..services import populate_device_version, prune_hidden_version_fields
+from ..models import PokeResult, UsbDeviceInfo
+from ..services import (
+    VERSION_FIELD_NAMES,
+    populate_device_version,
+    prune_hidden_version_fields,
+)
+from ..tracing import get_tracer
 from ..utils import bytes_to_gb, find_closest, parse_usb_version
-from .base import AbstractBackend
+from .base import AbstractBackend, PokeSession
 
 _usb_module: Any | None = None
 _usb_import_attempted = False
@@ -26,6 +34,8 @@ _TRUTHY_VALUES = {"1", "true", "yes", "on"}
 _FALSY_VALUES = {"0", "false", "no", "off"}
 _DRIVE_REMOVABLE = 2
 _DRIVE_FIXED = 3
+_POKE_BLOCK_BYTES = 512
+_POKE_TIMEOUT_SEC = 5
 
 
 def _get_usb_module() -> Any | None:
@@ -183,6 +193,16 @@ def _normalize_serial_candidates(serial: str) -> list[str]:
     return candidates
 
 
+def _enumeration_identity(bus_number: Any, dev_address: Any) -> str:
+    # The USB address is reassigned on every re-enumeration; the PhysicalDrive
+    # number is not, since Windows hands a replugged disk its old index back.
+    if not isinstance(bus_number, int) or not isinstance(dev_address, int):
+        return ""
+    if bus_number < 0 or dev_address < 0:
+        return ""
+    return f"usb:{bus_number}-{dev_address}"
+
+
 def _get_attr(record: Any, name: str, default: Any = None) -> Any:
     if isinstance(record, dict):
         return record.get(name, default)
@@ -192,15 +212,19 @@ def _get_attr(record: Any, name: str, default: Any = None) -> Any:
 class _StageTimer:
     def __init__(self, enabled: bool):
         self.enabled = enabled
-        self.start = time.perf_counter() if enabled else 0.0
+        self.tracer = get_tracer()
+        # Stages are timed for --profile-scan output, an active tracer, or both.
+        self.timing = enabled or self.tracer.enabled
+        self.start = time.perf_counter() if self.timing else 0.0
         self.last = self.start
         self.measurements: list[tuple[str, float]] = []
 
     def mark(self, label: str) -> None:
-        if not self.enabled:
+        if not self.timing:
             return
         now = time.perf_counter()
         self.measurements.append((label, (now - self.last) * 1000.0))
+        self.tracer.add_span(label, self.last, now, category="windows-scan")
         self.last = now
 
     def emit(self, suffix: str = "") -> None:
@@ -216,6 +240,7 @@ class _StageTimer:
 
 
 def _emit_profile_json(line: str, payload: dict[str, Any]) -> None:
+    get_tracer().event(line, category="windows-scan", **payload)
     print(
         f"{line}: {json.dumps(payload, sort_keys=True, indent=2)}",
         file=sys.stderr,
@@ -265,6 +290,47 @@ OPEN_EXISTING = 0x3
 INVALID_HANDLE_VALUE = -1
 
 
+class _WindowsPokeSession(PokeSession):
+    # One-block READ(10) via IOCTL_SCSI_PASS_THROUGH_DIRECT on a PhysicalDrive
+    # handle and buffers that stay open for the life of the session.
+    def __init__(self, backend: AbstractBackend, device_identifier: Any):
+        super().__init__(backend, device_identifier)
+        self._session: Any = None
+        self._open_error = ""
+        session_class = getattr(device_version, "WindowsScsiSession", None)
+        if session_class is None:
+            self._open_error = "SCSI pass-through is unavailable on this platform"
+            return
+        try:
+            self._session = session_class(int(device_identifier), data_capacity=_POKE_BLOCK_BYTES)
+        except (OSError, ValueError) as exc:
+            self._open_error = str(exc)
+
+    def poke(self, lba: int = 0) -> PokeResult:
+        start = time.perf_counter()
+        if self._session is None:
+            return PokeResult(success=False, error=self._open_error or "device not open")
+        try:
+            result = self._session.read10(lba, _POKE_BLOCK_BYTES, _POKE_TIMEOUT_SEC)
+        except OSError as exc:
+            return PokeResult(
+                success=False,
+                elapsed_ms=(time.perf_counter() - start) * 1000.0,
+                error=str(exc),
+            )
+        return PokeResult(
+            success=result.ok,
+            elapsed_ms=(time.perf_counter() - start) * 1000.0,
+            scsi_status=result.status,
+            sense=result.sense,
+        )
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
 class WindowsBackend(AbstractBackend):
     def __init__(self):
         self._profile_scan_enabled = False
@@ -334,9 +400,29 @@ class WindowsBackend(AbstractBackend):
             if native_devices is not None:
                 return self.sort_devices(native_devices)
 
+        return self._scan_devices_wmi(expanded)
+
+    def iter_devices(
+        self,
+        expanded: bool = False,
+        profile_scan: bool = False,
+    ) -> Iterator[UsbDeviceInfo]:
+        self._profile_scan_enabled = profile_scan
+        self._scan_pass_index = 1
+
+        if self._native_scan_enabled:
+            native_devices = self._iter_devices_native(profile_scan=profile_scan)
+            if native_devices is not None:
+                yield from native_devices
+                return
+
+        # WMI passes only make sense as a whole, so they are yielded after the scan.
+        yield from self._scan_devices_wmi(expanded)
+
+    def _scan_devices_wmi(self, expanded: bool) -> list[UsbDeviceInfo]:
         self._ensure_wmi_ready()
         devices, lengths = self._perform_scan_pass(minimal=False, expanded=expanded)
-        if not devices and len(set(lengths)) != 1 and any(lengths):
+        if not devices and len(set(lengths)) != 1 and any(lengths) and not get_deadline().expired():
             time.sleep(1.0)
             self._scan_pass_index = 2
             devices, _ = self._perform_scan_pass(minimal=False, expanded=expanded)
@@ -346,6 +432,17 @@ class WindowsBackend(AbstractBackend):
         self,
         profile_scan: bool = False,
     ) -> list[UsbDeviceInfo] | None:
+        native_devices = self._iter_devices_native(profile_scan=profile_scan)
+        if native_devices is None:
+            return None
+        return list(native_devices)
+
+    def _iter_devices_native(
+        self,
+        profile_scan: bool = False,
+    ) -> Iterator[UsbDeviceInfo] | None:
+        # Returns None when the helper cannot run; otherwise a generator that yields
+        # devices needing no version probe first, then each probed device in turn.
         native_path = self._native_scan_binary
         if native_path is None:
             return None
@@ -354,15 +451,19 @@ class WindowsBackend(AbstractBackend):
         if profile_scan:
             cmd.append("--profile")
 
+        tracer = get_tracer()
         run_start = time.perf_counter()
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=30,
-            )
+            with tracer.span(
+                "native_helper", category="windows-scan", helper=Path(native_path).name
+            ):
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=get_deadline().timeout(),
+                )
         except Exception as exc:
             if profile_scan:
                 _emit_profile_json(
@@ -406,24 +507,58 @@ class WindowsBackend(AbstractBackend):
 
         devices = self._native_payload_to_devices(payload)
         parse_ms = (time.perf_counter() - parse_start) * 1000.0
+        tracer.add_span(
+            "native_parse",
+            parse_start,
+            parse_start + parse_ms / 1000.0,
+            category="windows-scan",
+            devices=len(devices),
+        )
+        return self._finish_native_devices(
+            devices, payload, native_path, elapsed_ms, parse_ms, profile_scan
+        )
+
+    def _finish_native_devices(
+        self,
+        devices: list[UsbDeviceInfo],
+        payload: dict[str, Any],
+        native_path: Path,
+        elapsed_ms: float,
+        parse_ms: float,
+        profile_scan: bool,
+    ) -> Iterator[UsbDeviceInfo]:
+        pending = []
+        for dev_info in devices:
+            serial = str(getattr(dev_info, "iSerial", "") or "").strip()
+            drive_size = str(getattr(dev_info, "driveSizeGB", "") or "").strip()
+            if serial and drive_size == "N/A":
+                pending.append(dev_info)
+            else:
+                yield dev_info
+
         version_query_ms = 0.0
         version_create_file_ms = 0.0
         version_device_io_control_ms = 0.0
         version_parse_payload_ms = 0.0
-        for dev_info in devices:
+        for dev_info in pending:
             serial = str(getattr(dev_info, "iSerial", "") or "").strip()
-            if not serial:
-                continue
-            drive_size = str(getattr(dev_info, "driveSizeGB", "") or "").strip()
-            if drive_size != "N/A":
-                continue
-
-            version_info = self._timed_populate_device_version(
+            finished, version_info = call_before_deadline(
+                self._timed_populate_device_version,
                 getattr(dev_info, "idVendor", ""),
                 getattr(dev_info, "idProduct", ""),
                 serial,
                 getattr(dev_info, "physicalDriveNum", -1),
+                bcd_device=str(getattr(dev_info, "bcdDevice", "") or "") or None,
+                identity=_enumeration_identity(
+                    getattr(dev_info, "busNumber", -1), getattr(dev_info, "deviceAddress", -1)
+                ),
             )
+            if not finished:
+                # Out of budget: the probe keeps running on its own thread.
+                dev_info.unknownFields = sorted(VERSION_FIELD_NAMES)
+                prune_hidden_version_fields(dev_info)
+                yield dev_info
+                continue
             version_query_ms += version_info.pop("_profile_ms", 0.0)
             version_create_file_ms += version_info.pop("_profile_create_file_ms", 0.0)
             version_device_io_control_ms += version_info.pop("_profile_device_io_control_ms", 0.0)
@@ -435,6 +570,7 @@ class WindowsBackend(AbstractBackend):
                 setattr(dev_info, key, value)
 
             prune_hidden_version_fields(dev_info)
+            yield dev_info
         self._native_scan_path_for_run = native_path
 
         if profile_scan:
@@ -464,8 +600,6 @@ class WindowsBackend(AbstractBackend):
                 )
             _emit_profile_json("windows-native-scan-profile", native_profile_json)
 
-        return devices
-
     def _native_payload_to_devices(self, payload: dict[str, Any]) -> list[UsbDeviceInfo]:
         devices: list[UsbDeviceInfo] = []
         raw_devices = payload.get("devices", [])
@@ -675,97 +809,18 @@ class WindowsBackend(AbstractBackend):
 
         return devices, [len(wmi_usb_devices), len(wmi_usb_drives), len(libusb_data)]
 
-    def poke_device(self, device_identifier: Any) -> bool:
-        # Simplified version of _windows_read10 from poke_device.py
-        from ctypes import wintypes
-
-        GENERIC_READ = 0x80000000
-        GENERIC_WRITE = 0x40000000
-        FILE_SHARE_READ = 0x1
-        FILE_SHARE_WRITE = 0x2
-        OPEN_EXISTING = 0x3
-        INVALID_HANDLE_VALUE = -1
-        IOCTL_SCSI_PASS_THROUGH_DIRECT = 0x4D014
-        SCSI_IOCTL_DATA_IN = 1
-
-        class SCSI_PASS_THROUGH_DIRECT(ct.Structure):
-            _fields_ = [
-                ("Length", wintypes.USHORT),
-                ("ScsiStatus", ct.c_byte),
-                ("PathId", ct.c_byte),
-                ("TargetId", ct.c_byte),
-                ("Lun", ct.c_byte),
-                ("CdbLength", ct.c_byte),
-                ("SenseInfoLength", ct.c_byte),
-                ("DataIn", ct.c_byte),
-                ("DataTransferLength", wintypes.ULONG),
-                ("TimeOutValue", wintypes.ULONG),
-                ("DataBuffer", ct.c_void_p),
-                ("SenseInfoOffset", wintypes.ULONG),
-                ("Cdb", ct.c_byte * 16),
-            ]
-
-        class SPTD_WITH_SENSE(ct.Structure):
-            _pack_ = 1
-            _fields_ = [
-                ("sptd", SCSI_PASS_THROUGH_DIRECT),
-                ("ucSenseBuf", ct.c_ubyte * 32),
-            ]
+    def poke_device(self, device_identifier: Any, lba: int = 0) -> bool:
+        return self.poke_device_result(device_identifier, lba).success
 
-        windll = getattr(ct, "windll", None)
-        if windll is None:
-            return False
-        kernel32 = getattr(windll, "kernel32", None)
-        if kernel32 is None:
-            return False
+    def poke_device_result(self, device_identifier: Any, lba: int = 0) -> PokeResult:
+        start = time.perf_counter()
+        with self.open_poke_session(device_identifier) as session:
+            result = session.poke(lba)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return result
 
-        drive_path = rf"\\.\PhysicalDrive{device_identifier}"
-        h_drive = kernel32.CreateFileW(
-            drive_path,
-            GENERIC_READ | GENERIC_WRITE,
-            FILE_SHARE_READ | FILE_SHARE_WRITE,
-            None,
-            OPEN_EXISTING,
-            0,
-            None,
-        )
-        if h_drive == INVALID_HANDLE_VALUE:
-            return False
-
-        try:
-            sptd_sense = SPTD_WITH_SENSE()
-            ct.memset(ct.byref(sptd_sense), 0, ct.sizeof(sptd_sense))
-            sptd = sptd_sense.sptd
-
-            cdb = [0] * 10
-            cdb[0] = 0x28  # READ(10)
-            cdb[8] = 1  # Transfer 1 block
-
-            data_buffer = ct.create_string_buffer(512)
-            sptd.Length = ct.sizeof(SCSI_PASS_THROUGH_DIRECT)
-            sptd.CdbLength = 10
-            sptd.SenseInfoLength = 32
-            sptd.DataIn = SCSI_IOCTL_DATA_IN
-            sptd.DataTransferLength = 512
-            sptd.TimeOutValue = 5
-            sptd.DataBuffer = ct.addressof(data_buffer)
-            sptd.SenseInfoOffset = sptd.Length
-            ct.memmove(sptd.Cdb, (ct.c_ubyte * 10)(*cdb), 10)
-
-            returned = wintypes.DWORD(0)
-            ok = kernel32.DeviceIoControl(
-                h_drive,
-                IOCTL_SCSI_PASS_THROUGH_DIRECT,
-                ct.byref(sptd_sense),
-                ct.sizeof(sptd_sense),
-                ct.byref(sptd_sense),
-                ct.sizeof(sptd_sense),
-                ct.byref(returned),
-                None,
-            )
-            return bool(ok and sptd.ScsiStatus == 0)
-        finally:
-            kernel32.CloseHandle(h_drive)
+    def open_poke_session(self, device_identifier: Any) -> PokeSession:
+        return _WindowsPokeSession(self, device_identifier)
 
     def sort_devices(self, devices: list[UsbDeviceInfo]) -> list[UsbDeviceInfo]:
         def _key(dev):
@@ -786,6 +841,7 @@ class WindowsBackend(AbstractBackend):
                 capture_output=True,
                 text=True,
                 check=False,
+                timeout=get_deadline().timeout(),
             )
             letter = result.stdout.strip()
             if not letter:
@@ -1489,14 +1545,19 @@ class WindowsBackend(AbstractBackend):
             drive_letter = "Not Formatted"
             media_type = _normalize_disk_media_type(wmi_usb_drives[i].get("mediaType", "Unknown"))
 
+            probe_version = bool(serial) and not get_deadline().expired()
             version_info = (
                 {}
-                if not serial
+                if not probe_version
                 else self._timed_populate_device_version(
                     vid,
                     pid,
                     serial,
                     drive_num,
+                    bcd_device=str(libusb_data[i].get("bcdDevice", "") or "") or None,
+                    identity=_enumeration_identity(
+                        libusb_data[i].get("bus_number"), libusb_data[i].get("dev_address")
+                    ),
                 )
             )
             version_query_ms += version_info.pop("_profile_ms", 0.0)
@@ -1534,6 +1595,8 @@ class WindowsBackend(AbstractBackend):
             dev_info.busNumber = libusb_data[i]["bus_number"]
             dev_info.deviceAddress = libusb_data[i]["dev_address"]
             dev_info.physicalDriveNum = drive_num
+            if serial and not probe_version:
+                dev_info.unknownFields = sorted(VERSION_FIELD_NAMES)
             if include_drive_letter:
                 drive_letter = drive_letters_map.get(drive_num, "Not Formatted")
                 if (
@@ -1599,20 +1662,32 @@ class WindowsBackend(AbstractBackend):
         return devices
 
     def _timed_populate_device_version(
-        self, vid: str, pid: str, serial: str, drive_num: int
+        self,
+        vid: str,
+        pid: str,
+        serial: str,
+        drive_num: int,
+        bcd_device: str | None = None,
+        identity: str = "",
     ) -> dict[str, Any]:
         start = time.perf_counter()
         profile: dict[str, Any] = {
             "serial": serial,
             "drive_num": drive_num,
         }
-        version_info = populate_device_version(
-            int(vid, 16),
-            int(pid, 16),
-            serial,
-            physical_drive_num=drive_num if drive_num != -1 else None,
-            profile=profile,
-        )
+        with get_tracer().span(
+            "populate_device_version", category="windows-scan", serial=serial, drive_num=drive_num
+        ) as span:
+            version_info = populate_device_version(
+                int(vid, 16),
+                int(pid, 16),
+                serial,
+                physical_drive_num=drive_num if drive_num != -1 else None,
+                profile=profile,
+                bcd_device=bcd_device,
+                identity=identity,
+            )
+            span.set(version_cache=profile.get("version_cache", "n/a"))
         total_ms = (time.perf_counter() - start) * 1000.0
         version_info["_profile_ms"] = total_ms
         try:
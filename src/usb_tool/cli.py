@@ -1,19 +1,31 @@
 # src/usb_tool/cli.py
 
-import argparse
-import ctypes
-import json
+# Startup cost is paid by every `usb` invocation, so only os/sys are imported
+# eagerly; everything else is imported by the code path that needs it.
+# tests/test_import_time.py enforces this against benchmarks/import_time_budget.json.
+from __future__ import annotations
+
 import os
-import platform
 import sys
-import traceback
-from collections.abc import Callable
-from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, cast
 
-_SYSTEM = platform.system().lower()
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from pathlib import Path
+    from typing import Any
+
+
+def _detect_system() -> str:
+    # Matches platform.system().lower() for the platforms the CLI checks, without
+    # importing platform.
+    if sys.platform.startswith("win"):
+        return "windows"
+    return sys.platform
+
+
+_SYSTEM = _detect_system()
 _TRUTHY_VALUES = {"1", "true", "yes", "on"}
+_DEFAULT_WATCH_INTERVAL_S = 1.0
 _WINDOWS_TERMINAL_PARENTS = {
     "cmd.exe",
     "powershell.exe",
@@ -55,6 +67,8 @@ def is_admin_windows() -> bool:
     if not _SYSTEM.startswith("win"):
         return False
     try:
+        import ctypes
+
         windll = getattr(ctypes, "windll", None)
         if windll is None:
             return False
@@ -77,10 +91,8 @@ def is_root_posix() -> bool:
     if not callable(geteuid):
         return False
 
-    geteuid_fn = cast(Callable[[], int], geteuid)
-
     try:
-        return geteuid_fn() == 0
+        return bool(geteuid() == 0)
     except OSError:
         return False
 
@@ -94,6 +106,7 @@ def _get_parent_process_chain_windows() -> list[str]:
         return []
 
     try:
+        import ctypes
         from ctypes import wintypes
 
         TH32CS_SNAPPROCESS = 0x00000002
@@ -217,6 +230,8 @@ def _wait_for_user_acknowledgement() -> None:
 
 
 def _error_log_path() -> Path:
+    from pathlib import Path
+
     override = os.getenv("USB_TOOL_ERROR_LOG", "").strip()
     if override:
         return Path(override)
@@ -236,6 +251,9 @@ def _write_startup_error_log(exc: BaseException) -> str | None:
         pass
 
     try:
+        import traceback
+        from datetime import datetime, timezone
+
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         tb_text = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
         with path.open("a", encoding="utf-8", newline="\n") as fh:
@@ -268,6 +286,39 @@ def _load_device_manager_class():
         return _DeviceManager
 
 
+def _load_module(name: str) -> Any:
+    """Import ``usb_tool.<name>`` when a code path first needs it."""
+    import importlib
+
+    try:
+        return importlib.import_module(f"usb_tool.{name}")
+    except Exception:
+        return importlib.import_module(f".{name}", __package__)
+
+
+def _connect_daemon(socket_path: str | None) -> Any | None:
+    daemon = _load_module("daemon")
+    client = daemon.DaemonClient(socket_path)
+    if client.ping():
+        return client
+    print(
+        f"usb daemon not reachable at {client.socket_path}; scanning locally.",
+        file=sys.stderr,
+    )
+    return None
+
+
+def _serve(socket_path: str | None) -> None:
+    daemon = _load_module("daemon")
+    path = socket_path or daemon.default_socket_path()
+    print(f"Serving Apricorn device inventory on {path} (Ctrl+C to stop)...", file=sys.stderr)
+    try:
+        daemon.serve(path)
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+
 def _device_mode_from_drive_size(drive_size: Any) -> str:
     size_text = str(drive_size if drive_size is not None else "").strip().upper()
     return "OOB Mode" if size_text.startswith("N/A") else "Unlocked"
@@ -367,10 +418,116 @@ def _json_default(value: Any) -> Any:
     return str(value)
 
 
+def _scan_options(
+    expanded: bool, profile_scan: bool, deadline_s: float | None = None
+) -> dict[str, Any]:
+    options: dict[str, Any] = {"expanded": expanded, "profile_scan": profile_scan}
+    # Daemon clients and older managers take no deadline; only pass one when asked.
+    if deadline_s is not None:
+        options["deadline_s"] = deadline_s
+    return options
+
+
+def _stream_json_devices(
+    manager: Any, profile_scan: bool = False, deadline_s: float | None = None
+) -> int:
+    """Write one filtered device object per line as soon as the backend yields it."""
+    import json
+
+    options = _scan_options(True, profile_scan, deadline_s)
+    iter_devices = getattr(manager, "iter_devices", None)
+    if iter_devices is None:
+        devices = manager.list_devices(**options)
+    else:
+        devices = iter_devices(**options)
+    count = 0
+    for device in devices:
+        sys.stdout.write(
+            json.dumps(_filter_json_fields(device.to_dict()), default=_json_default) + "\n"
+        )
+        sys.stdout.flush()
+        count += 1
+    return count
+
+
+def _watch_events(diff: Any, previous: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """Turn a ScanDiff into arrival/departure/change events, tracking emitted fields."""
+    from datetime import datetime, timezone
+
+    from .services import device_key
+
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    events: list[dict[str, Any]] = []
+    for device in diff.removed:
+        key = device_key(device)
+        fields = previous.pop(key, None) or _filter_json_fields(device.to_dict())
+        events.append({"event": "departure", "time": timestamp, "key": key, "device": fields})
+    for device in diff.added:
+        key = device_key(device)
+        fields = _filter_json_fields(device.to_dict())
+        previous[key] = fields
+        events.append({"event": "arrival", "time": timestamp, "key": key, "device": fields})
+    for device in diff.changed:
+        key = device_key(device)
+        fields = _filter_json_fields(device.to_dict())
+        old_fields = previous.get(key, {})
+        previous[key] = fields
+        changes = {
+            name: {"old": old_fields.get(name), "new": fields.get(name)}
+            for name in sorted(set(old_fields) | set(fields))
+            if old_fields.get(name) != fields.get(name)
+        }
+        # Changes confined to fields hidden from JSON output are not reported.
+        if changes:
+            events.append(
+                {
+                    "event": "change",
+                    "time": timestamp,
+                    "key": key,
+                    "changes": changes,
+                    "device": fields,
+                }
+            )
+    return events
+
+
+def _watch_devices(
+    manager: Any,
+    interval: float,
+    max_polls: int | None = None,
+    deadline_s: float | None = None,
+) -> None:
+    import json
+    import time
+
+    previous: dict[str, dict[str, Any]] = {}
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        if polls:
+            time.sleep(interval)
+        polls += 1
+        try:
+            diff = manager.list_devices_incremental(expanded=True, deadline_s=deadline_s)
+        except Exception as e:
+            print(f"Error during device scan: {e}", file=sys.stderr)
+            continue
+        for event in _watch_events(diff, previous):
+            sys.stdout.write(json.dumps(event, default=_json_default) + "\n")
+        sys.stdout.flush()
+
+
 def _filter_printable_fields(device_dict: dict[str, Any]) -> dict[str, Any]:
     printable = dict(device_dict)
     printable.pop("bridgeFW", None)
     _apply_device_mode_output_fields(printable)
+    if isinstance(printable.get("unknownFields"), list):
+        printable["unknownFields"] = ", ".join(printable["unknownFields"])
+    quarantine = printable.get("quarantine")
+    if isinstance(quarantine, dict):
+        printable["quarantine"] = (
+            f"{quarantine.get('failures')} failed probe(s), last {quarantine.get('lastError')}; "
+            f"retry after {quarantine.get('retryAfter')}"
+        )
 
     if _SYSTEM.startswith("win"):
         for field_name in (
@@ -408,6 +565,8 @@ def _filter_printable_fields(device_dict: dict[str, Any]) -> dict[str, Any]:
 
 def _handle_list_action(devices: list[Any], json_mode: bool = False) -> None:
     if json_mode:
+        import json
+
         payload = _devices_to_json_payload(devices)
         print(json.dumps(payload, indent=2, default=_json_default))
         return
@@ -522,6 +681,58 @@ def _parse_poke_targets(
     return targets, skipped
 
 
+def _format_poke_details(result: Any) -> str:
+    details = []
+    if not result.success:
+        if result.error:
+            details.append(result.error)
+        if result.scsi_status is not None:
+            details.append(f"status=0x{result.scsi_status:02x}")
+        if result.host_status is not None:
+            details.append(f"host=0x{result.host_status:04x}")
+        if result.driver_status is not None:
+            details.append(f"driver=0x{result.driver_status:04x}")
+        if result.sense:
+            details.append(f"sense={result.sense.hex(' ')}")
+    if result.command_ms is not None:
+        details.append(f"command {result.command_ms:.2f} ms")
+    details.append(f"total {result.elapsed_ms:.2f} ms")
+    return ", ".join(details)
+
+
+def _format_poke_burst(burst: Any) -> str:
+    summary = burst.latency_summary()
+    line = f"{burst.count} commands, {burst.error_count} errors"
+    if summary["min"] is None:
+        return line
+    latencies = " / ".join(f"{name} {summary[name]:.2f}" for name in summary)
+    return f"{line}; latency ms {latencies}"
+
+
+def _parse_poke_burst_options(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> tuple[int, tuple[int, ...], float] | None:
+    # Any burst option given, even at its default value, selects burst mode.
+    if args.poke_count is None and args.poke_lba is None and args.poke_interval is None:
+        return None
+    if not args.poke:
+        parser.error("--poke-count, --poke-lba and --poke-interval require --poke.")
+    count = 1 if args.poke_count is None else args.poke_count
+    interval_ms = 0.0 if args.poke_interval is None else args.poke_interval
+    lba_text = "0" if args.poke_lba is None else args.poke_lba
+    if count < 1:
+        parser.error("--poke-count must be at least 1.")
+    if interval_ms < 0:
+        parser.error("--poke-interval cannot be negative.")
+    try:
+        lbas = tuple(int(token, 0) for token in lba_text.split(",") if token.strip())
+    except ValueError:
+        parser.error(f"Invalid --poke-lba value: {lba_text}")
+    if not lbas or any(lba < 0 or lba > 0xFFFFFFFF for lba in lbas):
+        parser.error(f"Invalid --poke-lba value: {lba_text}")
+    return count, lbas, interval_ms
+
+
 def _validate_poke_permissions(parser: argparse.ArgumentParser) -> None:
     if _SYSTEM.startswith("darwin"):
         parser.error("--poke is not currently supported on macOS.")
@@ -530,11 +741,41 @@ def _validate_poke_permissions(parser: argparse.ArgumentParser) -> None:
 
 
 def main() -> None:
+    # Frozen builds start their probe workers through the entry point; see probe_workers.
+    if sys.argv[1:] == ["--probe-worker"]:
+        _load_module("probe_workers").run_worker()
+        return
+
+    # Bare help needs neither argparse nor a backend.
+    if sys.argv[1:] in (["-h"], ["--help"]):
+        _load_print_help()()
+        sys.exit(0)
+
+    import argparse
+
     parser = argparse.ArgumentParser(description="USB tool for Apricorn devices.", add_help=False)
     parser.add_argument("-h", "--help", action="store_true")
     parser.add_argument("-p", "--poke", type=str, metavar="TARGETS")
+    parser.add_argument("--poke-count", type=int, default=None, metavar="N")
+    parser.add_argument("--poke-lba", type=str, default=None, metavar="LBAS")
+    parser.add_argument("--poke-interval", type=float, default=None, metavar="MS")
     parser.add_argument("--json", action="store_true")
+    parser.add_argument("--ndjson", action="store_true")
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--via-daemon", action="store_true")
+    parser.add_argument("--socket", type=str, metavar="PATH")
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--watch-interval", type=float, metavar="SECONDS")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS")
+    parser.add_argument("--probe-workers", type=int, metavar="N")
     parser.add_argument("--profile-scan", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", type=str, metavar="PATH", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--trace-format",
+        choices=("chrome", "json", "text"),
+        default="chrome",
+        help=argparse.SUPPRESS,
+    )
     args = parser.parse_args()
 
     if args.help:
@@ -545,22 +786,138 @@ def main() -> None:
     if args.json and args.poke:
         parser.error("--json cannot be used together with --poke.")
 
+    if args.ndjson and (args.json or args.poke):
+        parser.error("--ndjson cannot be combined with --json or --poke.")
+
+    if args.serve or args.via_daemon:
+        import socket
+
+        if not hasattr(socket, "AF_UNIX"):
+            parser.error("--serve and --via-daemon require Unix domain socket support.")
+        if args.serve and (args.json or args.ndjson or args.poke or args.via_daemon):
+            parser.error(
+                "--serve cannot be combined with --json, --ndjson, --poke or --via-daemon."
+            )
+    elif args.socket:
+        parser.error("--socket requires --serve or --via-daemon.")
+
+    if args.watch:
+        # --watch prints its own event stream, so any other output mode would be ignored.
+        conflicting = [
+            flag
+            for flag, given in (
+                ("--json", args.json),
+                ("--ndjson", args.ndjson),
+                ("--poke", args.poke),
+                ("--poke-count", args.poke_count is not None),
+                ("--poke-lba", args.poke_lba is not None),
+                ("--poke-interval", args.poke_interval is not None),
+                ("--profile-scan", args.profile_scan),
+                ("--serve", args.serve),
+                ("--via-daemon", args.via_daemon),
+            )
+            if given
+        ]
+        if conflicting:
+            parser.error(f"--watch cannot be combined with {', '.join(conflicting)}.")
+        if args.watch_interval is not None and args.watch_interval <= 0:
+            parser.error("--watch-interval must be greater than zero.")
+    elif args.watch_interval is not None:
+        parser.error("--watch-interval requires --watch.")
+
+    if args.deadline is not None:
+        if args.serve or args.via_daemon:
+            parser.error("--deadline cannot be combined with --serve or --via-daemon.")
+        if args.deadline <= 0:
+            parser.error("--deadline must be greater than zero.")
+
+    if args.trace and (args.serve or args.watch or args.via_daemon):
+        parser.error("--trace cannot be combined with --serve, --watch or --via-daemon.")
+
+    if args.probe_workers is not None:
+        if args.via_daemon:
+            parser.error("--probe-workers cannot be combined with --via-daemon.")
+        if args.probe_workers <= 0:
+            parser.error("--probe-workers must be greater than zero.")
+
+    if args.probe_workers is None:
+        _dispatch(parser, args)
+        return
+
+    probe_workers = _load_module("probe_workers")
+    with probe_workers.probe_workers(args.probe_workers):
+        _dispatch(parser, args)
+
+
+def _dispatch(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.serve:
+        _serve(args.socket)
+        return
+
+    if args.watch:
+        DeviceManager = _load_device_manager_class()
+        watch_manager = DeviceManager()
+        print("Watching for Apricorn device changes (Ctrl+C to stop)...", file=sys.stderr)
+        try:
+            _watch_devices(
+                watch_manager,
+                _DEFAULT_WATCH_INTERVAL_S if args.watch_interval is None else args.watch_interval,
+                deadline_s=args.deadline,
+            )
+        finally:
+            watch_manager.close()
+        return
+
     if args.poke:
         _validate_poke_permissions(parser)
+    poke_burst_options = _parse_poke_burst_options(parser, args)
+
+    if not args.trace:
+        _run_device_command(parser, args, poke_burst_options)
+        return
 
-    DeviceManager = _load_device_manager_class()
-    manager = DeviceManager()
+    # The trace is written even when the scan or a poke fails, since that is when it helps.
+    tracing = _load_module("tracing")
+    tracer = tracing.Tracer()
+    try:
+        with tracing.tracing(tracer):
+            _run_device_command(parser, args, poke_burst_options)
+    finally:
+        # A failed trace write must not replace the scan's own error.
+        try:
+            tracing.write_trace(tracer, args.trace, args.trace_format)
+        except Exception as e:
+            print(f"Failed to write scan trace to {args.trace}: {e}", file=sys.stderr)
+        else:
+            print(f"Scan trace written to: {args.trace}", file=sys.stderr)
+
+
+def _run_device_command(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    poke_burst_options: tuple[int, tuple[int, ...], float] | None,
+) -> None:
+    manager = _connect_daemon(args.socket) if args.via_daemon else None
+    if manager is None:
+        DeviceManager = _load_device_manager_class()
+        manager = DeviceManager()
     scan_message = "Scanning for Apricorn devices..."
-    if args.json:
+    if args.json or args.ndjson:
         print(scan_message, file=sys.stderr)
     else:
         print(scan_message)
 
+    if args.ndjson:
+        try:
+            _stream_json_devices(manager, profile_scan=args.profile_scan, deadline_s=args.deadline)
+        except Exception as e:
+            print(f"Error during device scan: {e}", file=sys.stderr)
+            print("Device scan failed.", file=sys.stderr)
+            sys.exit(1)
+        return
+
     try:
-        devices = manager.list_devices(
-            expanded=args.json,
-            profile_scan=args.profile_scan,
-        )
+        devices = manager.list_devices(**_scan_options(args.json, args.profile_scan, args.deadline))
     except Exception as e:
         print(f"Error during device scan: {e}", file=sys.stderr)
         devices = None
@@ -586,12 +943,26 @@ def main() -> None:
                 print(f"  Device {label}: SKIPPED (OOB Mode / No drive index)")
                 continue
 
+            if poke_burst_options is not None:
+                count, lbas, interval_ms = poke_burst_options
+                print(f"Poking device {label} x{count}...")
+                try:
+                    burst = manager.poke_burst(identifier, count, lbas, interval_ms)
+                    print(f"  Device {label}: {_format_poke_burst(burst)}")
+                    if burst.error_count:
+                        had_poke_failure = True
+                except Exception as e:
+                    print(f"  Device {label}: ERROR ({e})")
+                    had_poke_failure = True
+                continue
+
             print(f"Poking device {label}...")
             try:
-                if manager.poke(identifier):
-                    print(f"  Device {label}: SUCCESS")
+                result = manager.poke_with_result(identifier)
+                if result.success:
+                    print(f"  Device {label}: SUCCESS ({_format_poke_details(result)})")
                 else:
-                    print(f"  Device {label}: FAILED")
+                    print(f"  Device {label}: FAILED ({_format_poke_details(result)})")
                     had_poke_failure = True
             except Exception as e:
                 print(f"  Device {label}: ERROR ({e})")
@@ -623,6 +994,8 @@ if __name__ == "__main__":
         print(f"\nAn unexpected error occurred: {e}", file=sys.stderr)
         if log_path:
             print(f"Full traceback saved to: {log_path}", file=sys.stderr)
+        import traceback
+
         traceback.print_exc()
         exit_code = 1
     finally:
@@ -0,0 +1,356 @@
+# src/usb_tool/daemon.py
+
+"""Long-lived inventory daemon answering JSON queries over a Unix domain socket.
+
+``usb --serve`` owns the backend, keeps the device list current through
+hotplug events where the platform supports them (periodic rescans
+otherwise), and serializes device access so concurrent clients never issue
+overlapping pass-through commands. Each request and response is one JSON
+object per line:
+
+    {"op": "list"}                                  -> {"ok": true, "devices": [...]}
+    {"op": "get", "serial": "..."}                  -> {"ok": true, "device": {...}}
+    {"op": "poke", "target": "/dev/sdb", "lba": 0}  -> {"ok": true, "result": {...}}
+    {"op": "poke", "target": "/dev/sdb", "count": 100, "lbas": [0], "interval_ms": 0}
+                                                    -> {"ok": true, "results": [...]}
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from typing import Any
+
+from .models import PokeBurstResult, PokeResult, UsbDeviceInfo
+
+__all__ = [
+    "DEFAULT_REFRESH_INTERVAL",
+    "DaemonClient",
+    "DaemonUnavailableError",
+    "InventoryDaemon",
+    "default_socket_path",
+    "device_from_dict",
+    "serve",
+]
+
+DEFAULT_REFRESH_INTERVAL = 5.0
+_MAX_REQUEST_BYTES = 1024 * 1024
+_SOCKET_NAME = "apricorn-usb-tool.sock"
+_DEVICE_FIELDS = {field.name for field in dataclasses.fields(UsbDeviceInfo)}
+
+
+class DaemonUnavailableError(ConnectionError):
+    pass
+
+
+def default_socket_path() -> str:
+    override = os.getenv("USB_TOOL_DAEMON_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, _SOCKET_NAME)
+    getuid = getattr(os, "getuid", None)
+    suffix = f"-{getuid()}" if callable(getuid) else ""
+    return os.path.join(tempfile.gettempdir(), f"apricorn-usb-tool{suffix}.sock")
+
+
+def device_from_dict(payload: dict[str, Any]) -> UsbDeviceInfo:
+    """Rebuild a ``UsbDeviceInfo`` from ``to_dict()`` output, keeping extra fields."""
+    known = {key: value for key, value in payload.items() if key in _DEVICE_FIELDS}
+    device = UsbDeviceInfo(
+        **{
+            "bcdUSB": 0.0,
+            "idVendor": "",
+            "idProduct": "",
+            "bcdDevice": "",
+            "iManufacturer": "",
+            "iProduct": "",
+            "iSerial": "",
+            "driveSizeGB": "",
+            "mediaType": "",
+            **known,
+        }
+    )
+    for key, value in payload.items():
+        if key not in _DEVICE_FIELDS:
+            setattr(device, key, value)
+    return device
+
+
+def _poke_result_to_dict(result: PokeResult) -> dict[str, Any]:
+    payload = dataclasses.asdict(result)
+    payload["sense"] = result.sense.hex()
+    return payload
+
+
+def _poke_result_from_dict(payload: dict[str, Any]) -> PokeResult:
+    fields = {field.name for field in dataclasses.fields(PokeResult)}
+    values = {key: value for key, value in payload.items() if key in fields}
+    values["sense"] = bytes.fromhex(str(values.get("sense") or ""))
+    return PokeResult(**values)
+
+
+class InventoryDaemon:
+    """Owns a ``DeviceManager`` and answers inventory/poke requests."""
+
+    def __init__(
+        self,
+        manager: Any = None,
+        socket_path: str | None = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        if manager is None:
+            from .services import DeviceManager
+
+            manager = DeviceManager()
+        self.manager = manager
+        self.socket_path = socket_path or default_socket_path()
+        self.refresh_interval = max(float(refresh_interval), 0.5)
+        # Scans and pass-through commands are serialized through this lock.
+        self._device_lock = threading.Lock()
+        self._inventory_lock = threading.Lock()
+        self._devices: list[Any] = []
+        self._uses_hotplug = False
+        self._stopping = threading.Event()
+        self._refresh_thread: threading.Thread | None = None
+        self._server: socketserver.BaseServer | None = None
+
+    # --- inventory ---
+
+    def start_inventory(self) -> None:
+        try:
+            # The monitor's per-device refreshes send READ BUFFER, so they take the
+            # same lock as pokes.
+            self.manager.subscribe(
+                lambda _action, _device: None, expanded=True, device_lock=self._device_lock
+            )
+            self._uses_hotplug = True
+            return
+        except (NotImplementedError, OSError):
+            self._uses_hotplug = False
+        self.refresh()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="usb-tool-daemon-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def refresh(self) -> None:
+        with self._device_lock:
+            devices = self.manager.list_devices(expanded=True)
+        with self._inventory_lock:
+            self._devices = list(devices)
+
+    def devices(self) -> list[Any]:
+        if self._uses_hotplug:
+            return list(self.manager.inventory())
+        with self._inventory_lock:
+            return list(self._devices)
+
+    def _refresh_loop(self) -> None:
+        while not self._stopping.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                pass
+
+    # --- requests ---
+
+    def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        op = request.get("op")
+        try:
+            if op == "ping":
+                return {"ok": True, "pid": os.getpid(), "hotplug": self._uses_hotplug}
+            if op == "list":
+                return {"ok": True, "devices": [device.to_dict() for device in self.devices()]}
+            if op == "get":
+                device = self._find_device(request)
+                if device is None:
+                    return {"ok": False, "error": "device not found"}
+                return {"ok": True, "device": device.to_dict()}
+            if op == "poke":
+                return self._handle_poke(request)
+        except Exception as exc:
+            return {"ok": False, "error": str(exc)}
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    def _find_device(self, request: dict[str, Any]) -> Any | None:
+        devices = self.devices()
+        if "index" in request:
+            index = int(request["index"])
+            return devices[index - 1] if 1 <= index <= len(devices) else None
+        for key in ("serial", "blockDevice", "physicalDriveNum"):
+            if key not in request:
+                continue
+            attribute = "iSerial" if key == "serial" else key
+            for device in devices:
+                if getattr(device, attribute, None) == request[key]:
+                    return device
+            return None
+        return None
+
+    def _handle_poke(self, request: dict[str, Any]) -> dict[str, Any]:
+        target = request.get("target")
+        if target is None or target == -1:
+            return {"ok": False, "error": "poke requires a target"}
+        count = int(request.get("count", 1))
+        with self._device_lock:
+            if "count" in request:
+                lbas = tuple(int(lba) for lba in request.get("lbas") or (0,))
+                burst = self.manager.poke_burst(
+                    target, count, lbas, float(request.get("interval_ms", 0.0))
+                )
+                return {
+                    "ok": True,
+                    "results": [_poke_result_to_dict(result) for result in burst.results],
+                }
+            result = self.manager.poke_with_result(target, int(request.get("lba", 0)))
+        return {"ok": True, "result": _poke_result_to_dict(result)}
+
+    # --- socket server ---
+
+    def serve_forever(self) -> None:
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                while True:
+                    line = self.rfile.readline(_MAX_REQUEST_BYTES)
+                    if not line:
+                        return
+                    try:
+                        request = json.loads(line)
+                        if not isinstance(request, dict):
+                            raise ValueError("request must be a JSON object")
+                        response = daemon.handle_request(request)
+                    except ValueError as exc:
+                        response = {"ok": False, "error": f"bad request: {exc}"}
+                    self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        self._claim_socket_path()
+        self.start_inventory()
+        previous_umask = os.umask(0o177)
+        try:
+            server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(previous_umask)
+        self._server = server
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self._remove_socket()
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+        close = getattr(self.manager, "close", None)
+        if callable(close):
+            close()
+
+    def _claim_socket_path(self) -> None:
+        if not os.path.exists(self.socket_path):
+            return
+        if DaemonClient(self.socket_path).ping():
+            raise RuntimeError(f"A usb daemon is already serving {self.socket_path}")
+        os.unlink(self.socket_path)
+
+    def _remove_socket(self) -> None:
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+class DaemonClient:
+    """Client for ``InventoryDaemon`` with the ``DeviceManager`` methods the CLI uses."""
+
+    def __init__(self, socket_path: str | None = None, timeout: float = 30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(self, op: str, **fields: Any) -> dict[str, Any]:
+        return self._send({"op": op, **fields}, self.timeout)
+
+    def _send(self, request: dict[str, Any], timeout: float) -> dict[str, Any]:
+        payload = json.dumps(request).encode("utf-8") + b"\n"
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(payload)
+                with sock.makefile("rb") as reader:
+                    line = reader.readline(_MAX_REQUEST_BYTES)
+        except OSError as exc:
+            raise DaemonUnavailableError(f"usb daemon unavailable: {exc}") from exc
+        if not line:
+            raise DaemonUnavailableError("usb daemon closed the connection")
+        response = json.loads(line)
+        if not isinstance(response, dict):
+            raise DaemonUnavailableError("usb daemon sent a malformed response")
+        return response
+
+    def ping(self) -> bool:
+        try:
+            return bool(self._send({"op": "ping"}, min(self.timeout, 1.0)).get("ok"))
+        except (DaemonUnavailableError, ValueError):
+            return False
+
+    def list_devices(self, expanded: bool = False, profile_scan: bool = False) -> list[Any]:
+        response = self._checked("list")
+        return [device_from_dict(device) for device in response.get("devices", [])]
+
+    def get_device(self, **selector: Any) -> UsbDeviceInfo | None:
+        response = self.request("get", **selector)
+        if not response.get("ok"):
+            return None
+        return device_from_dict(response["device"])
+
+    def poke_with_result(self, device_identifier: Any, lba: int = 0) -> PokeResult:
+        response = self._checked("poke", target=device_identifier, lba=lba)
+        return _poke_result_from_dict(response["result"])
+
+    def poke(self, device_identifier: Any, lba: int = 0) -> bool:
+        return self.poke_with_result(device_identifier, lba).success
+
+    def poke_burst(
+        self,
+        device_identifier: Any,
+        count: int,
+        lbas: tuple[int, ...] = (0,),
+        interval_ms: float = 0.0,
+    ) -> PokeBurstResult:
+        response = self._checked(
+            "poke",
+            target=device_identifier,
+            count=count,
+            lbas=list(lbas),
+            interval_ms=interval_ms,
+        )
+        return PokeBurstResult([_poke_result_from_dict(item) for item in response["results"]])
+
+    def _checked(self, op: str, **fields: Any) -> dict[str, Any]:
+        response = self.request(op, **fields)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error") or f"usb daemon {op} failed")
+        return response
+
+
+def serve(
+    socket_path: str | None = None, refresh_interval: float = DEFAULT_REFRESH_INTERVAL
+) -> None:
+    daemon = InventoryDaemon(socket_path=socket_path, refresh_interval=refresh_interval)
+    try:
+        daemon.serve_forever()
+    finally:
+        daemon.shutdown()
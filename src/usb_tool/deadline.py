@@ -0,0 +1,149 @@
+# src/usb_tool/deadline.py
+
+"""Scan deadline: one wall-clock budget shared by every stage of a scan.
+
+``DeviceManager.list_devices(deadline_s=...)`` makes a deadline active for the
+scan. Backends ask ``get_deadline()`` for a per-stage timeout and stop starting
+new work once it has expired, returning the devices found so far with the
+unfinished fields listed in ``UsbDeviceInfo.unknownFields``.
+
+Without a budget the deadline is unbounded. Helper processes still get
+``HELPER_TIMEOUT_S`` so one hung helper cannot stall a scan forever.
+
+The active deadline is a context variable, so concurrent scans on different
+threads each see their own. Worker threads start with an empty context; wrap
+their targets in ``with_current_deadline`` to carry the caller's deadline over.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+__all__ = [
+    "HELPER_TIMEOUT_S",
+    "ScanDeadline",
+    "call_before_deadline",
+    "get_deadline",
+    "scan_deadline",
+    "use_deadline",
+    "with_current_deadline",
+]
+
+_T = TypeVar("_T")
+
+# Cap for any single helper process (lsblk, lsusb, system_profiler, ...).
+HELPER_TIMEOUT_S = 30.0
+# subprocess and as_completed treat 0 as "poll once"; keep a usable floor.
+_MIN_TIMEOUT_S = 0.01
+
+
+class ScanDeadline:
+    """A monotonic budget. ``budget_s=None`` never expires."""
+
+    def __init__(self, budget_s: float | None = None):
+        self.budget_s = budget_s
+        self.expires_at: float | None = None
+        if budget_s is not None:
+            self.expires_at = time.monotonic() + max(budget_s, 0.0)
+
+    @property
+    def bounded(self) -> bool:
+        return self.expires_at is not None
+
+    def remaining(self) -> float | None:
+        """Seconds left, never negative; None when unbounded."""
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, cap: float | None = HELPER_TIMEOUT_S) -> float | None:
+        """Timeout for one stage or helper: the remaining budget, capped at ``cap``."""
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        limit = remaining if cap is None else min(remaining, cap)
+        return max(limit, _MIN_TIMEOUT_S)
+
+
+_UNBOUNDED = ScanDeadline()
+_active: contextvars.ContextVar[ScanDeadline] = contextvars.ContextVar(
+    "usb_tool_scan_deadline", default=_UNBOUNDED
+)
+
+
+def get_deadline() -> ScanDeadline:
+    """Return the active deadline; an unbounded one unless inside ``scan_deadline()``."""
+    return _active.get()
+
+
+@contextmanager
+def use_deadline(deadline: ScanDeadline | None) -> Iterator[ScanDeadline]:
+    """Make ``deadline`` active in this context; None leaves the current one.
+
+    Do not hold this open across a ``yield``: the generator's consumer would run
+    under the deadline too. Enter it around each step instead.
+    """
+    if deadline is None:
+        yield _active.get()
+        return
+    token = _active.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def scan_deadline(budget_s: float | None) -> Iterator[ScanDeadline]:
+    """Make a new ``budget_s`` deadline active; None leaves the current one."""
+    with use_deadline(None if budget_s is None else ScanDeadline(budget_s)) as active:
+        yield active
+
+
+def with_current_deadline(func: Callable[..., _T]) -> Callable[..., _T]:
+    """Wrap ``func`` so the thread that runs it sees the caller's active deadline."""
+    context = contextvars.copy_context()
+
+    def _run(*args: Any, **kwargs: Any) -> _T:
+        # One copy per call: a Context cannot be entered by two threads at once.
+        return context.copy().run(func, *args, **kwargs)
+
+    return _run
+
+
+def call_before_deadline(func: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[bool, Any]:
+    """Run ``func`` and return ``(True, result)``, or ``(False, None)`` past the deadline.
+
+    With a bounded deadline the call runs on a daemon thread so a probe stuck in
+    the kernel is abandoned rather than joined. Exceptions from ``func`` propagate.
+    """
+    deadline = get_deadline()
+    if not deadline.bounded:
+        return True, func(*args, **kwargs)
+    if deadline.expired():
+        return False, None
+
+    outcome: dict[str, Any] = {}
+
+    def _run() -> None:
+        try:
+            outcome["result"] = func(*args, **kwargs)
+        except BaseException as exc:
+            outcome["error"] = exc
+
+    worker = threading.Thread(target=with_current_deadline(_run), name="deadline-call", daemon=True)
+    worker.start()
+    worker.join(deadline.timeout(None))
+    if worker.is_alive():
+        return False, None
+    if "error" in outcome:
+        raise outcome["error"]
+    return True, outcome.get("result")
@@ -1,21 +1,200 @@
 from __future__ import annotations
 
+import atexit
 import ctypes
 import errno
 import os
 import re
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
 from typing import Any
 
+from .tracing import get_tracer
+
 
 def _build_read_buffer_cdb() -> bytes:
     # READ BUFFER (6) - 0x3C
     return bytes([0x3C, 0x01, 0x00, 0x00, 0x00, 0x00])
 
 
+def _build_read10_cdb(lba: int = 0, blocks: int = 1) -> bytes:
+    # READ (10) - 0x28
+    return bytes(
+        [0x28, 0x00, *int(lba).to_bytes(4, "big"), 0x00, *int(blocks).to_bytes(2, "big"), 0x00]
+    )
+
+
+READ_BUFFER_LENGTH = 1024
+SENSE_BUFFER_LENGTH = 32
+_CDB_BUFFER_LENGTH = 16
+# Transport timeout for READ BUFFER; an empty read that took this long timed out.
+_READ_BUFFER_TIMEOUT_SEC = 5
+# Longest exit waits for an abandoned macOS probe to remount its disk.
+_REMOUNT_EXIT_WAIT_SEC = 15.0
+
+
+@dataclass
+class ScsiCommandResult:
+    status: int = 0
+    host_status: int = 0
+    driver_status: int = 0
+    sense: bytes = b""
+    transferred: int = 0
+    # Command time reported by the kernel, when the platform provides one.
+    duration_ms: float | None = None
+    # perf_counter time spent in the pass-through call.
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        # driver_status carries DRIVER_SENSE (0x08) alongside real errors; only the
+        # remaining low bits indicate a failed command.
+        return self.status == 0 and self.host_status == 0 and (self.driver_status & 0x07) == 0
+
+
+class _ScsiBuffers:
+    """Preallocated CDB/data/sense buffers exposed as memoryviews and raw addresses."""
+
+    def __init__(self, data_capacity: int):
+        self.cdb = bytearray(_CDB_BUFFER_LENGTH)
+        self.sense = bytearray(SENSE_BUFFER_LENGTH)
+        self._cdb_c = (ctypes.c_char * _CDB_BUFFER_LENGTH).from_buffer(self.cdb)
+        self._sense_c = (ctypes.c_char * SENSE_BUFFER_LENGTH).from_buffer(self.sense)
+        self._allocate_data(data_capacity)
+
+    def _allocate_data(self, capacity: int) -> None:
+        self.data = bytearray(max(int(capacity), 1))
+        self._data_c = (ctypes.c_char * len(self.data)).from_buffer(self.data)
+
+    @property
+    def cdb_address(self) -> int:
+        return ctypes.addressof(self._cdb_c)
+
+    @property
+    def data_address(self) -> int:
+        return ctypes.addressof(self._data_c)
+
+    @property
+    def sense_address(self) -> int:
+        return ctypes.addressof(self._sense_c)
+
+    def prepare(self, cdb: bytes, data_length: int) -> None:
+        if len(cdb) > _CDB_BUFFER_LENGTH:
+            raise ValueError(f"CDB longer than {_CDB_BUFFER_LENGTH} bytes")
+        if data_length > len(self.data):
+            # Grow once; later commands of this size reuse the larger buffer.
+            self._allocate_data(data_length)
+        self.cdb[: len(cdb)] = cdb
+        self.sense[:] = bytes(SENSE_BUFFER_LENGTH)
+        # A short transfer must not leave the previous command's bytes behind.
+        ctypes.memset(self.data_address, 0, data_length)
+
+
+@dataclass
+class _CachedSession:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    session: Any = None
+
+
+class _SessionCache:
+    """Open pass-through sessions keyed by device, shared by repeated probes.
+
+    Commands on one device are serialized. Sessions stay open only while a
+    ``scope()`` is active (one scan or poke burst); when the outermost scope
+    exits they are all closed, and outside any scope each command closes its
+    session when it finishes. No device handle outlives the work that opened it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[Any, _CachedSession] = {}
+        self._scopes = 0
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        with self._lock:
+            self._scopes += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._scopes -= 1
+                last = self._scopes == 0
+            if last:
+                self.close_all()
+
+    def run(self, key: Any, open_session: Callable[[], Any], command: Callable[[Any], Any]) -> Any:
+        """Run ``command`` on the session for ``key``, opening it if needed."""
+        with self._lock:
+            entry = self._entries.setdefault(key, _CachedSession())
+
+        with entry.lock:
+            try:
+                reused = entry.session is not None and not entry.session.closed
+                if not reused:
+                    entry.session = open_session()
+                try:
+                    return command(entry.session)
+                except OSError:
+                    # The device went away, or was replaced under the same path.
+                    self._drop(entry)
+                    if not reused:
+                        raise
+                entry.session = open_session()
+                return command(entry.session)
+            finally:
+                with self._lock:
+                    keep = self._scopes > 0 and self._entries.get(key) is entry
+                if not keep:
+                    self._drop(entry)
+
+    def close_all(self) -> None:
+        # A session busy with a command (possibly one the deadline abandoned) is
+        # left to that command, which closes it when no scope is active.
+        with self._lock:
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            if not entry.lock.acquire(blocking=False):
+                continue
+            try:
+                self._drop(entry)
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+            finally:
+                entry.lock.release()
+
+    @staticmethod
+    def _drop(entry: _CachedSession) -> None:
+        if entry.session is not None:
+            entry.session.close()
+            entry.session = None
+
+
+_SCSI_SESSIONS = _SessionCache()
+atexit.register(_SCSI_SESSIONS.close_all)
+
+
+def scsi_session_scope() -> AbstractContextManager[None]:
+    """Keep READ BUFFER sessions open for reuse until the outermost scope exits."""
+    return _SCSI_SESSIONS.scope()
+
+
+def close_scsi_sessions() -> None:
+    """Close every idle READ BUFFER session now."""
+    _SCSI_SESSIONS.close_all()
+
+
+# Disks _query_usb_core has unmounted and not yet remounted (macOS).
+_unmounted_disks: set[str] = set()
+_remounts_pending = threading.Condition()
+
+
 # --- Windows Logic ---
 if sys.platform == "win32":
     from ctypes import wintypes
@@ -52,17 +231,24 @@ if sys.platform == "win32":
             ("ucSenseBuf", ctypes.c_ubyte * 32),
         ]
 
-    def _windows_read_buffer(
-        physical_drive_num: int,
-        timeout_sec: int = 5,
-        profile: dict[str, Any] | None = None,
-    ) -> bytes:
-        drive_path = rf"\\.\PhysicalDrive{physical_drive_num}"
-        h = INVALID_HANDLE_VALUE
-        try:
+    class WindowsScsiSession:
+        """Open PhysicalDrive handle with reusable SCSI pass-through buffers."""
+
+        def __init__(
+            self,
+            physical_drive_num: int,
+            data_capacity: int = READ_BUFFER_LENGTH,
+            profile: dict[str, Any] | None = None,
+        ):
+            self.drive_path = rf"\\.\PhysicalDrive{physical_drive_num}"
+            self._handle = INVALID_HANDLE_VALUE
+            self._buffers = _ScsiBuffers(data_capacity)
+            self._sptd_sense = SPTD_WITH_SENSE()
+            self._returned = wintypes.DWORD(0)
+
             open_start = time.perf_counter()
-            h = ctypes.windll.kernel32.CreateFileW(
-                drive_path,
+            handle = ctypes.windll.kernel32.CreateFileW(
+                self.drive_path,
                 GENERIC_READ | GENERIC_WRITE,
                 FILE_SHARE_READ | FILE_SHARE_WRITE,
                 None,
@@ -71,60 +257,108 @@ if sys.platform == "win32":
                 None,
             )
             if profile is not None:
-                profile["drive_path"] = drive_path
+                profile["drive_path"] = self.drive_path
                 profile["create_file_ms"] = (time.perf_counter() - open_start) * 1000.0
-            if h == INVALID_HANDLE_VALUE:
+            if handle == INVALID_HANDLE_VALUE:
                 win_error = ctypes.GetLastError()
                 if profile is not None:
                     profile["open_error"] = win_error
                 if win_error == errno.EACCES:
                     raise PermissionError("Administrator privileges required")
                 raise ctypes.WinError(win_error)
-
-            cdb = _build_read_buffer_cdb()
-            data_len = 1024
-            data_buf = ctypes.create_string_buffer(data_len)
-            sptd_sense = SPTD_WITH_SENSE()
+            self._handle = handle
+
+        @property
+        def data(self) -> memoryview:
+            return memoryview(self._buffers.data)
+
+        @property
+        def closed(self) -> bool:
+            return self._handle == INVALID_HANDLE_VALUE
+
+        def execute(
+            self,
+            cdb: bytes,
+            data_in_length: int,
+            timeout_sec: int = 5,
+            profile: dict[str, Any] | None = None,
+        ) -> ScsiCommandResult:
+            if self.closed:
+                raise ValueError("SCSI session is closed")
+            buffers = self._buffers
+            buffers.prepare(cdb, data_in_length)
+            sptd_sense = self._sptd_sense
             ctypes.memset(ctypes.byref(sptd_sense), 0, ctypes.sizeof(sptd_sense))
             sptd = sptd_sense.sptd
             sptd.Length = ctypes.sizeof(SCSI_PASS_THROUGH_DIRECT)
-            sptd.PathId = 0
-            sptd.TargetId = 0
-            sptd.Lun = 0
             sptd.CdbLength = len(cdb)
             sptd.SenseInfoLength = len(sptd_sense.ucSenseBuf)
             sptd.DataIn = 1  # DATA_IN
-            sptd.DataTransferLength = data_len
+            sptd.DataTransferLength = data_in_length
             sptd.TimeOutValue = int(timeout_sec)
-            sptd.DataBuffer = ctypes.cast(ctypes.pointer(data_buf), ctypes.c_void_p)
+            sptd.DataBuffer = buffers.data_address
             sptd.SenseInfoOffset = sptd.Length
-            ctypes.memmove(sptd.Cdb, (ctypes.c_ubyte * len(cdb))(*cdb), len(cdb))
+            ctypes.memmove(sptd.Cdb, buffers.cdb_address, len(cdb))
 
-            returned_bytes = wintypes.DWORD(0)
+            self._returned.value = 0
             ioctl_start = time.perf_counter()
             ok = ctypes.windll.kernel32.DeviceIoControl(
-                h,
+                self._handle,
                 IOCTL_SCSI_PASS_THROUGH_DIRECT,
                 ctypes.byref(sptd_sense),
                 ctypes.sizeof(sptd_sense),
                 ctypes.byref(sptd_sense),
                 ctypes.sizeof(sptd_sense),
-                ctypes.byref(returned_bytes),
+                ctypes.byref(self._returned),
                 None,
             )
             if profile is not None:
                 profile["device_io_control_ms"] = (time.perf_counter() - ioctl_start) * 1000.0
-                profile["returned_bytes"] = int(returned_bytes.value)
+                profile["returned_bytes"] = int(self._returned.value)
                 profile["scsi_status"] = int(sptd.ScsiStatus)
             if ok == 0:
                 if profile is not None:
                     profile["ioctl_error"] = ctypes.GetLastError()
                 raise ctypes.WinError(ctypes.GetLastError())
+            sense_length = min(int(sptd.SenseInfoLength) & 0xFF, SENSE_BUFFER_LENGTH)
+            return ScsiCommandResult(
+                status=int(sptd.ScsiStatus) & 0xFF,
+                sense=bytes(sptd_sense.ucSenseBuf[:sense_length]) if sptd.ScsiStatus else b"",
+                transferred=int(sptd.DataTransferLength),
+            )
+
+        def read_buffer(self, timeout_sec: int = 5, profile: dict[str, Any] | None = None) -> bytes:
+            self.execute(_build_read_buffer_cdb(), READ_BUFFER_LENGTH, timeout_sec, profile=profile)
             # We return the data buffer regardless of ScsiStatus to support OOB mode
-            return data_buf.raw
-        finally:
-            if h != INVALID_HANDLE_VALUE:
-                ctypes.windll.kernel32.CloseHandle(h)
+            return bytes(self.data[:READ_BUFFER_LENGTH])
+
+        def read10(
+            self, lba: int = 0, block_size: int = 512, timeout_sec: int = 5
+        ) -> ScsiCommandResult:
+            return self.execute(_build_read10_cdb(lba), block_size, timeout_sec)
+
+        def close(self) -> None:
+            if not self.closed:
+                ctypes.windll.kernel32.CloseHandle(self._handle)
+                self._handle = INVALID_HANDLE_VALUE
+
+        def __enter__(self) -> WindowsScsiSession:
+            return self
+
+        def __exit__(self, *_exc: object) -> None:
+            self.close()
+
+    def _windows_read_buffer(
+        physical_drive_num: int,
+        timeout_sec: int = 5,
+        profile: dict[str, Any] | None = None,
+    ) -> bytes:
+        result: bytes = _SCSI_SESSIONS.run(
+            ("spti", physical_drive_num),
+            lambda: WindowsScsiSession(physical_drive_num, profile=profile),
+            lambda session: session.read_buffer(timeout_sec, profile=profile),
+        )
+        return result
 
 
 if sys.platform.startswith("linux"):
@@ -159,35 +393,89 @@ if sys.platform.startswith("linux"):
             ("info", ctypes.c_uint),
         ]
 
+    class LinuxScsiSession:
+        """Open block/sg device with a reusable SG_IO header and buffers."""
+
+        def __init__(
+            self,
+            device_path: str,
+            data_capacity: int = READ_BUFFER_LENGTH,
+            flags: int = os.O_RDONLY | os.O_NONBLOCK,
+        ):
+            self.device_path = device_path
+            self._buffers = _ScsiBuffers(data_capacity)
+            self._header = SG_IO_HDR()
+            self._fd = os.open(device_path, flags)
+
+        @property
+        def data(self) -> memoryview:
+            return memoryview(self._buffers.data)
+
+        @property
+        def closed(self) -> bool:
+            return self._fd < 0
+
+        def execute(
+            self, cdb: bytes, data_in_length: int, timeout_ms: int = 5000
+        ) -> ScsiCommandResult:
+            if self.closed:
+                raise ValueError("SCSI session is closed")
+            buffers = self._buffers
+            buffers.prepare(cdb, data_in_length)
+            header = self._header
+            ctypes.memset(ctypes.byref(header), 0, ctypes.sizeof(header))
+            header.interface_id = ord("S")
+            header.dxfer_direction = SG_DXFER_FROM_DEV
+            header.cmd_len = len(cdb)
+            header.mx_sb_len = SENSE_BUFFER_LENGTH
+            header.dxfer_len = data_in_length
+            header.dxferp = buffers.data_address
+            header.cmdp = buffers.cdb_address
+            header.sbp = buffers.sense_address
+            header.timeout = int(timeout_ms)
+
+            start = time.perf_counter()
+            fcntl.ioctl(self._fd, SG_IO, header)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            return ScsiCommandResult(
+                status=header.status,
+                host_status=header.host_status,
+                driver_status=header.driver_status,
+                sense=bytes(buffers.sense[: header.sb_len_wr]),
+                transferred=max(0, data_in_length - max(header.resid, 0)),
+                duration_ms=float(header.duration),
+                elapsed_ms=elapsed_ms,
+            )
+
+        def read_buffer(self, timeout_sec: int = 5) -> bytes:
+            result = self.execute(
+                _build_read_buffer_cdb(), READ_BUFFER_LENGTH, int(timeout_sec * 1000)
+            )
+            return bytes(self.data[: result.transferred])
+
+        def read10(
+            self, lba: int = 0, block_size: int = 512, timeout_ms: int = 5000
+        ) -> ScsiCommandResult:
+            return self.execute(_build_read10_cdb(lba), block_size, timeout_ms)
+
+        def close(self) -> None:
+            if not self.closed:
+                os.close(self._fd)
+                self._fd = -1
+
+        def __enter__(self) -> LinuxScsiSession:
+            return self
+
+        def __exit__(self, *_exc: object) -> None:
+            self.close()
+
     def _linux_read_buffer(device_path: str, timeout_sec: int = 5) -> bytes:
-        fd = -1
-        try:
-            fd = os.open(device_path, os.O_RDONLY)
-
-            cdb_bytes = _build_read_buffer_cdb()
-            cdb = ctypes.create_string_buffer(cdb_bytes, len(cdb_bytes))
-            data_len = 1024
-            data_buf = ctypes.create_string_buffer(data_len)
-            sense_buf = ctypes.create_string_buffer(32)
-
-            sg_io = SG_IO_HDR()
-            ctypes.memset(ctypes.byref(sg_io), 0, ctypes.sizeof(sg_io))
-            sg_io.interface_id = ord("S")
-            sg_io.dxfer_direction = SG_DXFER_FROM_DEV
-            sg_io.cmd_len = len(cdb_bytes)
-            sg_io.mx_sb_len = ctypes.sizeof(sense_buf)
-            sg_io.dxfer_len = data_len
-            sg_io.dxferp = ctypes.cast(data_buf, ctypes.c_void_p)
-            sg_io.cmdp = ctypes.cast(cdb, ctypes.c_void_p)
-            sg_io.sbp = ctypes.cast(sense_buf, ctypes.c_void_p)
-            sg_io.timeout = int(timeout_sec * 1000)
-
-            fcntl.ioctl(fd, SG_IO, sg_io)
-            actual_len = max(0, data_len - max(sg_io.resid, 0))
-            return data_buf.raw[:actual_len]
-        finally:
-            if fd >= 0:
-                os.close(fd)
+        result: bytes = _SCSI_SESSIONS.run(
+            ("sg_io", device_path),
+            lambda: LinuxScsiSession(device_path, flags=os.O_RDONLY),
+            lambda session: session.read_buffer(timeout_sec),
+        )
+        return result
 
 
 @dataclass
@@ -205,22 +493,53 @@ def _query_usb_core(
 ) -> bytes:
     # Ensure usb modules are available
     try:
-        import usb.core
-        import usb.util
+        import usb.core  # noqa: F401
+        import usb.util  # noqa: F401
     except ImportError:
         # If pyusb isn't available, we can't use this method.
         # This is expected on minimized Windows builds.
         return b""
 
-    if sys.platform == "darwin" and bsd_name:
-        # On macOS, we must unmount the disk to detach the kernel driver safely
-        # and allow pyusb to claim the interface.
+    if not (sys.platform == "darwin" and bsd_name):
+        return _libusb_read_buffer(vendor_id, product_id, serial_number)
+
+    # On macOS, we must unmount the disk to detach the kernel driver safely and
+    # allow pyusb to claim the interface. A scan deadline can abandon this thread,
+    # so the remount runs in finally and exit waits for it (_wait_for_remounts).
+    with _remounts_pending:
+        _unmounted_disks.add(bsd_name)
+    try:
         try:
             subprocess.run(["diskutil", "unmountDisk", bsd_name], capture_output=True, check=False)
             # Give the OS a moment to release the device
             time.sleep(1)
         except Exception:
             pass
+        return _libusb_read_buffer(vendor_id, product_id, serial_number)
+    finally:
+        try:
+            subprocess.run(["diskutil", "mountDisk", bsd_name], capture_output=True, check=False)
+        except Exception:
+            pass
+        with _remounts_pending:
+            _unmounted_disks.discard(bsd_name)
+            _remounts_pending.notify_all()
+
+
+def _wait_for_remounts(timeout: float = _REMOUNT_EXIT_WAIT_SEC) -> bool:
+    """Block until every disk _query_usb_core unmounted is mounted again."""
+    with _remounts_pending:
+        return _remounts_pending.wait_for(lambda: not _unmounted_disks, timeout)
+
+
+if sys.platform == "darwin":
+    # Runs before daemon threads are stopped at interpreter exit.
+    atexit.register(_wait_for_remounts)
+
+
+def _libusb_read_buffer(vendor_id: int, product_id: int, serial_number: str) -> bytes:
+    import usb.core
+    import usb.util
 
     dev = usb.core.find(idVendor=vendor_id, idProduct=product_id, serial_number=serial_number)
     if dev is None:
@@ -293,13 +612,6 @@ def _query_usb_core(
         except Exception:
             pass
 
-    # Remount on macOS if we unmounted it
-    if sys.platform == "darwin" and bsd_name:
-        try:
-            subprocess.run(["diskutil", "mountDisk", bsd_name], capture_output=True, check=False)
-        except Exception:
-            pass
-
     return data
 
 
@@ -311,36 +623,63 @@ def query_device_version(
     physical_drive_num: int | None = None,
     device_path: str | None = None,
     profile: dict[str, Any] | None = None,
+    read_result: tuple[bytes, str] | None = None,
 ) -> DeviceVersionInfo:
+    # read_result: (data, read_error) of a READ BUFFER the caller already issued.
     data = b""
     timings = profile if profile is not None else {}
-
-    # Try Windows SPTI first if index is provided
-    if sys.platform == "win32" and physical_drive_num is not None:
-        try:
+    tracer = get_tracer()
+
+    with tracer.span(
+        "query_device_version",
+        category="device-version",
+        vendor_id=f"{vendor_id:04x}",
+        product_id=f"{product_id:04x}",
+        serial=serial_number,
+    ) as span:
+        read_start = time.perf_counter()
+        if read_result is not None:
+            timings["transport"] = "sg_async"
+            data, read_error = read_result
+            if read_error:
+                timings["read_error"] = read_error
+        # Try Windows SPTI first if index is provided
+        elif sys.platform == "win32" and physical_drive_num is not None:
             timings["transport"] = "windows_spti"
-            data = _windows_read_buffer(physical_drive_num, profile=timings)
-        except Exception:
-            # Fallback or just empty
-            data = b""
-    elif sys.platform.startswith("linux") and device_path:
-        try:
-            data = _linux_read_buffer(device_path)
-        except Exception:
-            data = b""
-    else:
-        # Fallback to libusb (macOS/Linux)
-        try:
-            data = _query_usb_core(vendor_id, product_id, serial_number, bsd_name)
-        except Exception:
-            data = b""
-
-    parse_start = time.perf_counter()
-    info = _parse_payload_best_effort(data)
-    timings["parse_payload_ms"] = (time.perf_counter() - parse_start) * 1000.0
-    timings["payload_len"] = len(data)
-    timings["parsed_scb_part_number"] = info.scb_part_number
-    timings["parsed_bridge_fw"] = info.bridge_fw or "N/A"
+            try:
+                with tracer.span("read_buffer", category="device-version", transport="spti"):
+                    data = _windows_read_buffer(physical_drive_num, profile=timings)
+            except Exception as exc:
+                # Fallback or just empty
+                timings["read_error"] = type(exc).__name__
+                data = b""
+        elif sys.platform.startswith("linux") and device_path:
+            try:
+                with tracer.span("read_buffer", category="device-version", transport="sg_io"):
+                    data = _linux_read_buffer(device_path)
+            except Exception as exc:
+                timings["read_error"] = type(exc).__name__
+                data = b""
+        else:
+            # Fallback to libusb (macOS/Linux)
+            try:
+                with tracer.span("read_buffer", category="device-version", transport="libusb"):
+                    data = _query_usb_core(vendor_id, product_id, serial_number, bsd_name)
+            except Exception as exc:
+                timings["read_error"] = type(exc).__name__
+                data = b""
+        # SG_IO and SPTI report a timed-out command as an empty transfer, not an error.
+        if not data and "read_error" not in timings:
+            if time.perf_counter() - read_start >= _READ_BUFFER_TIMEOUT_SEC:
+                timings["read_error"] = "TimeoutError"
+
+        parse_start = time.perf_counter()
+        info = _parse_payload_best_effort(data)
+        timings["parse_payload_ms"] = (time.perf_counter() - parse_start) * 1000.0
+        timings["payload_len"] = len(data)
+        timings["parsed_scb_part_number"] = info.scb_part_number
+        timings["parsed_bridge_fw"] = info.bridge_fw or "N/A"
+        span.set(payload_len=len(data), scb_part_number=info.scb_part_number)
     info.raw_data = data
     return info
 
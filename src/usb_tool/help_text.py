@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import platform
+import sys
 
 from ._version import get_version as get_local_version
 
-_SYSTEM = platform.system().lower()
+# sys.platform instead of platform.system(): importing platform dominates `usb -h`.
+_SYSTEM = "windows" if sys.platform.startswith("win") else sys.platform
 _HEADER = "USB(1)                              User Commands                              USB(1)"
 
 
@@ -21,7 +22,10 @@ NAME
        usb - Cross-platform USB tool for Apricorn devices (Windows)
 
 SYNOPSIS
-       usb [-h] [-p TARGETS] [--json]
+       usb [-h] [-p TARGETS] [--json] [--ndjson]
+           [--poke-count N] [--poke-lba LBAS] [--poke-interval MS]
+           [--watch [--watch-interval SECONDS]] [--deadline SECONDS]
+           [--probe-workers N]
 
 DESCRIPTION
        The usb-tool utility scans the system for connected Apricorn USB devices
@@ -44,6 +48,45 @@ OPTIONS
               Devices detected in Out-Of-Box (OOB) mode (reporting size as N/A)
               are skipped automatically.
 
+       --poke-count N
+              Send N READ(10) commands to each poke target and report
+              min/p50/p95/p99/max command latency and an error count per
+              device instead of one line per command.
+
+       --poke-lba LBAS
+              Comma-separated logical block addresses to read, cycled across
+              the burst (decimal or 0x hex). Defaults to 0.
+
+       --poke-interval MS
+              Pause MS milliseconds between commands to the same device.
+
+       --ndjson
+              Stream newline-delimited JSON: one device object per line,
+              written as soon as that device's record is complete (before
+              slower devices finish probing). Lines arrive in completion
+              order, not list order; fields match --json.
+
+       --watch
+              Keep running and print one JSON object per line for every device
+              arrival, departure, or visible state change (for example OOB
+              Mode to Unlocked, readOnly, or bcdUSB). Existing devices are
+              reported as arrivals first. Fields match --json output. Stop
+              with Ctrl+C.
+
+       --watch-interval SECONDS
+              Rescan interval for --watch. Defaults to 1 second.
+
+       --deadline SECONDS
+              Stop scanning after SECONDS and report the devices found so
+              far. Fields the scan could not finish in time are listed in
+              unknownFields. Helper programs time out even without it.
+              With --watch it bounds each rescan.
+
+       --probe-workers N
+              Run version probes and pokes in up to N reusable worker
+              processes. A worker stuck on a hung drive is killed when it
+              misses the deadline instead of blocking the scan or exit.
+
        --json
               Emit JSON as {{"devices":[{{"<index>":{{...}}}}]}} for automation.
               Each object key matches the numbered list output. Mutually
@@ -69,17 +112,22 @@ NAME
        usb - Cross-platform USB tool for Apricorn devices (Linux)
 
 SYNOPSIS
-       usb [-h] [-p TARGETS] [--json]
+       usb [-h] [-p TARGETS] [--json] [--ndjson]
+           [--poke-count N] [--poke-lba LBAS] [--poke-interval MS]
+           [--serve | --via-daemon] [--socket PATH]
+           [--watch [--watch-interval SECONDS]] [--deadline SECONDS]
+           [--probe-workers N]
 
 DESCRIPTION
        The usb-tool utility scans the system for connected Apricorn USB devices
        (Vendor ID 0984) and prints normalized USB, storage, and transport
        details.
 
-       Linux enumeration can run as a standard user, but full detail often
-       depends on tools such as lsusb, lsblk, udevadm, and lspci. The poke
-       operation requires root privileges because it opens the underlying
-       block device.
+       Linux enumeration can run as a standard user and reads sysfs, the udev
+       database, and pci.ids directly. Tools such as lsusb, lsblk, udevadm,
+       and lspci are only used as fallbacks when those sources are missing.
+       The poke operation requires root privileges because it opens the
+       underlying block device.
 
 OPTIONS
        -h, --help
@@ -92,11 +140,70 @@ OPTIONS
               (for example '/dev/sdb' or '/dev/sdb,/dev/sdc'), or the keyword
               'all'.
 
+              Each result reports the kernel-measured command time and the
+              total time; failures include SCSI, host and driver status and
+              any sense data.
+
               Devices detected in Out-Of-Box (OOB) mode (reporting size as N/A)
               are skipped automatically.
 
               This operation requires root privileges (for example sudo).
 
+       --poke-count N
+              Send N READ(10) commands to each poke target and report
+              min/p50/p95/p99/max command latency and an error count per
+              device instead of one line per command.
+
+       --poke-lba LBAS
+              Comma-separated logical block addresses to read, cycled across
+              the burst (decimal or 0x hex). Defaults to 0.
+
+       --poke-interval MS
+              Pause MS milliseconds between commands to the same device.
+
+       --serve
+              Run as a long-lived daemon that owns the device backend, keeps
+              the inventory current from hotplug events (periodic rescans as
+              a fallback) and answers list, get and poke requests as JSON
+              lines over a Unix domain socket. Pokes are serialized.
+
+       --via-daemon
+              Ask a running 'usb --serve' daemon for the device list and
+              pokes instead of scanning locally. Falls back to a local scan
+              when no daemon answers.
+
+       --socket PATH
+              Unix domain socket used by --serve and --via-daemon. Defaults
+              to $USB_TOOL_DAEMON_SOCKET, then
+              $XDG_RUNTIME_DIR/apricorn-usb-tool.sock.
+
+       --ndjson
+              Stream newline-delimited JSON: one device object per line,
+              written as soon as that device's record is complete (before
+              slower devices finish probing). Lines arrive in completion
+              order, not list order; fields match --json.
+
+       --watch
+              Keep running and print one JSON object per line for every device
+              arrival, departure, or visible state change (for example OOB
+              Mode to Unlocked, readOnly, or bcdUSB). Existing devices are
+              reported as arrivals first. Fields match --json output. Stop
+              with Ctrl+C.
+
+       --watch-interval SECONDS
+              Rescan interval for --watch. Defaults to 1 second.
+
+       --deadline SECONDS
+              Stop scanning after SECONDS and report the devices found so
+              far. Fields the scan could not finish in time are listed in
+              unknownFields. Helper programs time out even without it.
+              With --watch it bounds each rescan.
+
+       --probe-workers N
+              Run version probes and pokes in up to N reusable worker
+              processes. A worker stuck on a hung drive is killed when it
+              misses the deadline instead of blocking the scan or exit.
+
        --json
               Emit JSON as {{"devices":[{{"<index>":{{...}}}}]}} for automation.
               Each object key matches the numbered list output. Mutually
@@ -116,6 +223,10 @@ EXAMPLES
 
        sudo usb -p all
               Poke all valid Apricorn devices.
+
+       sudo usb --serve
+              Keep a device inventory daemon running; other invocations can
+              then use 'usb --via-daemon --json' for an instant answer.
 """
 
 
@@ -126,7 +237,10 @@ NAME
        usb - Cross-platform USB tool for Apricorn devices (macOS)
 
 SYNOPSIS
-       usb [-h] [--json]
+       usb [-h] [--json] [--ndjson]
+           [--serve | --via-daemon] [--socket PATH]
+           [--watch [--watch-interval SECONDS]] [--deadline SECONDS]
+           [--probe-workers N]
 
 DESCRIPTION
        The usb-tool utility scans the system for connected Apricorn USB devices
@@ -136,6 +250,48 @@ OPTIONS
        -h, --help
               Show this help message and exit.
 
+       --serve
+              Run as a long-lived daemon that owns the device backend, keeps
+              the inventory current with periodic rescans and answers list
+              and get requests as JSON lines over a Unix domain socket.
+
+       --via-daemon
+              Ask a running 'usb --serve' daemon for the device list
+              instead of scanning locally. Falls back to a local scan
+              when no daemon answers.
+
+       --socket PATH
+              Unix domain socket used by --serve and --via-daemon. Defaults
+              to $USB_TOOL_DAEMON_SOCKET, then
+              $XDG_RUNTIME_DIR/apricorn-usb-tool.sock.
+
+       --ndjson
+              Stream newline-delimited JSON: one device object per line,
+              written as soon as that device's record is complete (before
+              slower devices finish probing). Lines arrive in completion
+              order, not list order; fields match --json.
+
+       --watch
+              Keep running and print one JSON object per line for every device
+              arrival, departure, or visible state change (for example OOB
+              Mode to Unlocked, readOnly, or bcdUSB). Existing devices are
+              reported as arrivals first. Fields match --json output. Stop
+              with Ctrl+C.
+
+       --watch-interval SECONDS
+              Rescan interval for --watch. Defaults to 1 second.
+
+       --deadline SECONDS
+              Stop scanning after SECONDS and report the devices found so
+              far. Fields the scan could not finish in time are listed in
+              unknownFields. Helper programs time out even without it.
+              With --watch it bounds each rescan.
+
+       --probe-workers N
+              Run version probes and pokes in up to N reusable worker
+              processes. A worker stuck on a hung drive is killed when it
+              misses the deadline instead of blocking the scan or exit.
+
        --json
               Emit JSON as {{"devices":[{{"<index>":{{...}}}}]}} for automation.
               Each object key matches the numbered list output.
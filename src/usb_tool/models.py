@@ -1,8 +1,10 @@
 # src/usb_tool/models.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
+from .utils import percentile
+
 
 @dataclass
 class UsbDeviceInfo:
@@ -37,8 +39,72 @@ class UsbDeviceInfo:
     modelID: str | None = None
     mcuFW: str | None = None
     bridgeFW: str | None = None
+    # Fields a scan deadline cut short; None when the scan finished them all.
+    unknownFields: list[str] | None = None
+    # Probe quarantine state (failures, lastError, retryAfter) while it lasts.
+    quarantine: dict[str, Any] | None = None
 
     def to_dict(self) -> dict[str, Any]:
         d = vars(self).copy()
         # We might want to remove None values or specifically bridgeFW here
         return {k: v for k, v in d.items() if v is not None}
+
+
+@dataclass
+class PokeResult:
+    success: bool
+    # Wall-clock time of the poke as seen by the caller; single pokes include open/close.
+    elapsed_ms: float = 0.0
+    # perf_counter time around the pass-through call itself, when measured separately.
+    command_ms: float | None = None
+    # Command time reported by the kernel (sg: whole milliseconds), when available.
+    kernel_ms: float | None = None
+    scsi_status: int | None = None
+    host_status: int | None = None
+    driver_status: int | None = None
+    sense: bytes = b""
+    error: str = ""
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    @property
+    def latency_ms(self) -> float:
+        return self.command_ms if self.command_ms is not None else self.elapsed_ms
+
+
+@dataclass
+class PokeBurstResult:
+    results: list[PokeResult] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.results)
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for result in self.results if not result.success)
+
+    def latency_summary(self) -> dict[str, float | None]:
+        """min/p50/p95/p99/max over successful commands, in milliseconds."""
+        latencies = [result.latency_ms for result in self.results if result.success]
+        return {
+            "min": min(latencies) if latencies else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else None,
+        }
+
+
+@dataclass
+class ScanDiff:
+    # Full sorted device list plus what changed since the previous incremental scan.
+    devices: list[UsbDeviceInfo] = field(default_factory=list)
+    added: list[UsbDeviceInfo] = field(default_factory=list)
+    removed: list[UsbDeviceInfo] = field(default_factory=list)
+    changed: list[UsbDeviceInfo] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
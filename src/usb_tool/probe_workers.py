@@ -0,0 +1,500 @@
+# src/usb_tool/probe_workers.py
+
+"""Version probes and pokes in reusable worker processes.
+
+An SG_IO or SPTI call against a wedged bridge can leave its thread in an
+uninterruptible kernel wait, and a thread cannot be killed. With the pool
+enabled (``usb --probe-workers N`` or ``USB_TOOL_PROBE_WORKERS=N``) those calls
+run in up to N child processes instead. The parent waits for each answer no
+longer than the active scan deadline allows. When a worker misses it, the
+parent kills the worker without waiting for it to exit and starts a new one for
+the next call. A process stuck in the kernel then cannot delay the scan or
+``usb`` exiting.
+
+Workers read requests on stdin and write results on stdout. Every frame starts
+with ``!IBI``: the request id, the op (requests) or status (results), and the
+body length. Request bodies are compact JSON. Result bodies are binary:
+
+    OP_VERSION -> u8 error length, error name, raw READ BUFFER payload
+    OP_POKE    -> one ``!?fffhhhBH`` record plus sense and error bytes
+    OP_BURST   -> one such record per command
+
+A poke record holds success, elapsed_ms, command_ms and kernel_ms (NaN when
+unknown), the SCSI, host and driver status (-1 when unknown), and the sense and
+error lengths.
+"""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import math
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO, Any
+
+from .deadline import get_deadline
+from .device_version import DeviceVersionInfo, _parse_payload_best_effort
+from .models import PokeBurstResult, PokeResult
+
+__all__ = [
+    "DEFAULT_WORKERS",
+    "ProbeWorkerError",
+    "ProbeWorkerPool",
+    "get_probe_pool",
+    "probe_workers",
+    "run_worker",
+]
+
+DEFAULT_WORKERS = 4
+OP_VERSION = 1
+OP_POKE = 2
+OP_BURST = 3
+STATUS_OK = 0
+STATUS_ERROR = 1
+# READ BUFFER gives up after 5 s in the kernel; the rest covers worker start-up.
+VERSION_TIMEOUT_S = 15.0
+POKE_TIMEOUT_S = 15.0
+_BURST_COMMAND_TIMEOUT_S = 0.5
+# A worker that ignores stdin closing at shutdown is killed after this long.
+_CLOSE_TIMEOUT_S = 1.0
+_WORKERS_ENV = "USB_TOOL_PROBE_WORKERS"
+_FRAME = struct.Struct("!IBI")
+_POKE_RECORD = struct.Struct("!?fffhhhBH")
+
+
+class ProbeWorkerError(RuntimeError):
+    """The worker ran the request and reported an exception."""
+
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes | None:
+    """Read ``size`` bytes, or return None at end of stream."""
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _optional_short(value: int | None) -> int:
+    return -1 if value is None else value
+
+
+def _pack_poke_results(results: list[PokeResult]) -> bytes:
+    parts = []
+    for result in results:
+        sense = bytes(result.sense[:255])
+        error = result.error.encode("utf-8", "replace")[:65535]
+        command_ms = math.nan if result.command_ms is None else result.command_ms
+        kernel_ms = math.nan if result.kernel_ms is None else result.kernel_ms
+        parts.append(
+            _POKE_RECORD.pack(
+                bool(result.success),
+                result.elapsed_ms,
+                command_ms,
+                kernel_ms,
+                _optional_short(result.scsi_status),
+                _optional_short(result.host_status),
+                _optional_short(result.driver_status),
+                len(sense),
+                len(error),
+            )
+        )
+        parts.append(sense)
+        parts.append(error)
+    return b"".join(parts)
+
+
+def _unpack_poke_results(payload: bytes) -> list[PokeResult]:
+    results = []
+    offset = 0
+    while offset < len(payload):
+        (
+            success,
+            elapsed_ms,
+            command_ms,
+            kernel_ms,
+            scsi,
+            host,
+            driver,
+            sense_len,
+            error_len,
+        ) = _POKE_RECORD.unpack_from(payload, offset)
+        offset += _POKE_RECORD.size
+        sense = payload[offset : offset + sense_len]
+        offset += sense_len
+        error = payload[offset : offset + error_len].decode("utf-8", "replace")
+        offset += error_len
+        results.append(
+            PokeResult(
+                success=success,
+                elapsed_ms=elapsed_ms,
+                command_ms=None if math.isnan(command_ms) else command_ms,
+                kernel_ms=None if math.isnan(kernel_ms) else kernel_ms,
+                scsi_status=None if scsi < 0 else scsi,
+                host_status=None if host < 0 else host,
+                driver_status=None if driver < 0 else driver,
+                sense=sense,
+                error=error,
+            )
+        )
+    return results
+
+
+def _worker_command() -> list[str]:
+    if getattr(sys, "frozen", False):
+        # PyInstaller builds have no interpreter to run -c; the CLI entry point
+        # recognizes this argument instead.
+        return [sys.executable, "--probe-worker"]
+    return [sys.executable, "-c", "from usb_tool.probe_workers import run_worker; run_worker()"]
+
+
+def _worker_env() -> dict[str, str]:
+    env = dict(os.environ)
+    # A worker probes in-process; it must not start a pool of its own.
+    env[_WORKERS_ENV] = "0"
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    python_path = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = (
+        package_parent if not python_path else os.pathsep.join((package_parent, python_path))
+    )
+    return env
+
+
+class _Worker:
+    def __init__(self, command: list[str]):
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=_worker_env(),
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        # None marks end of stream: the worker exited or was killed.
+        self.responses: queue.Queue[tuple[int, int, bytes] | None] = queue.Queue()
+        reader = threading.Thread(target=self._read_responses, name="probe-worker", daemon=True)
+        reader.start()
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def send(self, frame: bytes) -> None:
+        stdin = self.process.stdin
+        if stdin is None:
+            raise BrokenPipeError("probe worker has no stdin")
+        stdin.write(frame)
+        stdin.flush()
+
+    def kill(self) -> None:
+        # Never wait: a process in uninterruptible sleep only dies once the
+        # kernel call returns. The reader thread sees EOF when it does.
+        try:
+            self.process.kill()
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        try:
+            if self.process.stdin is not None:
+                self.process.stdin.close()
+            self.process.wait(_CLOSE_TIMEOUT_S)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def _read_responses(self) -> None:
+        stdout = self.process.stdout
+        while stdout is not None:
+            header = _read_exact(stdout, _FRAME.size)
+            if header is None:
+                break
+            request_id, status, length = _FRAME.unpack(header)
+            payload = _read_exact(stdout, length) if length else b""
+            if payload is None:
+                break
+            self.responses.put((request_id, status, payload))
+        self.responses.put(None)
+
+
+class ProbeWorkerPool:
+    """Up to ``size`` worker processes, started on demand and reused across calls."""
+
+    def __init__(self, size: int = DEFAULT_WORKERS, command: list[str] | None = None):
+        self.size = max(int(size), 1)
+        self.command = list(command) if command is not None else _worker_command()
+        self._cond = threading.Condition()
+        self._idle: list[_Worker] = []
+        self._busy = 0
+        self._request_ids = itertools.count(1)
+        self._closed = False
+        # Pids of workers killed after missing a deadline, for diagnostics.
+        self.abandoned: list[int] = []
+
+    def query_device_version(
+        self,
+        vendor_id: int,
+        product_id: int,
+        serial_number: str,
+        bsd_name: str | None = None,
+        physical_drive_num: int | None = None,
+        device_path: str | None = None,
+        profile: dict[str, Any] | None = None,
+    ) -> DeviceVersionInfo:
+        """Same contract as ``device_version.query_device_version``, run in a worker.
+
+        Raises TimeoutError when the worker misses the deadline.
+        """
+        timings = profile if profile is not None else {}
+        timings["probe_worker"] = True
+        request = {
+            "vendor_id": vendor_id,
+            "product_id": product_id,
+            "serial": serial_number,
+            "bsd_name": bsd_name,
+            "drive": physical_drive_num,
+            "path": device_path,
+        }
+        payload = self._call(OP_VERSION, request, get_deadline().timeout(VERSION_TIMEOUT_S))
+        error_len = payload[0]
+        error = payload[1 : 1 + error_len].decode("ascii", "replace")
+        data = payload[1 + error_len :]
+        if error:
+            timings["read_error"] = error
+        info = _parse_payload_best_effort(data)
+        timings["payload_len"] = len(data)
+        info.raw_data = data
+        return info
+
+    def poke(self, device_identifier: Any, lba: int = 0) -> PokeResult:
+        """Poke in a worker; a missed deadline or worker failure becomes a failed result."""
+        start = time.perf_counter()
+        try:
+            payload = self._call(
+                OP_POKE,
+                {"target": str(device_identifier), "lba": lba},
+                get_deadline().timeout(POKE_TIMEOUT_S),
+            )
+        except (OSError, ProbeWorkerError) as exc:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            return PokeResult(success=False, elapsed_ms=elapsed_ms, error=str(exc))
+        return _unpack_poke_results(payload)[0]
+
+    def poke_burst(
+        self,
+        device_identifier: Any,
+        count: int,
+        lbas: tuple[int, ...] = (0,),
+        interval_ms: float = 0.0,
+    ) -> PokeBurstResult:
+        burst = PokeBurstResult()
+        count = max(count, 0)
+        if not count:
+            return burst
+        cap = POKE_TIMEOUT_S + count * (_BURST_COMMAND_TIMEOUT_S + max(interval_ms, 0.0) / 1000.0)
+        request = {
+            "target": str(device_identifier),
+            "count": count,
+            "lbas": list(lbas),
+            "interval_ms": interval_ms,
+        }
+        try:
+            payload = self._call(OP_BURST, request, get_deadline().timeout(cap))
+        except (OSError, ProbeWorkerError) as exc:
+            burst.results = [PokeResult(success=False, error=str(exc)) for _ in range(count)]
+            return burst
+        burst.results = _unpack_poke_results(payload)
+        return burst
+
+    def close(self) -> None:
+        """Stop idle workers. Busy workers are stopped when their call returns."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.close()
+
+    def _call(self, op: int, request: dict[str, Any], timeout: float | None) -> bytes:
+        limit = VERSION_TIMEOUT_S if timeout is None else timeout
+        expires_at = time.monotonic() + limit
+        worker = self._acquire(expires_at)
+        request_id = next(self._request_ids)
+        body = json.dumps(request, separators=(",", ":")).encode("utf-8")
+        try:
+            worker.send(_FRAME.pack(request_id, op, len(body)) + body)
+            while True:
+                response = worker.responses.get(timeout=max(expires_at - time.monotonic(), 0.0))
+                if response is None:
+                    raise BrokenPipeError("probe worker exited")
+                if response[0] == request_id:
+                    break
+        except queue.Empty:
+            self._abandon(worker)
+            raise TimeoutError(f"probe worker did not answer within {limit:.2f}s") from None
+        except OSError:
+            self._abandon(worker)
+            raise
+        self._release(worker)
+        _, status, payload = response
+        if status != STATUS_OK:
+            raise ProbeWorkerError(payload.decode("utf-8", "replace"))
+        return payload
+
+    def _acquire(self, expires_at: float) -> _Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise BrokenPipeError("probe worker pool is closed")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        self._busy += 1
+                        return worker
+                if self._busy < self.size:
+                    worker = _Worker(self.command)
+                    self._busy += 1
+                    return worker
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("no probe worker became free before the deadline")
+                self._cond.wait(remaining)
+
+    def _release(self, worker: _Worker) -> None:
+        with self._cond:
+            self._busy -= 1
+            closed = self._closed
+            if not closed:
+                self._idle.append(worker)
+            self._cond.notify()
+        if closed:
+            worker.close()
+
+    def _abandon(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._cond:
+            self._busy -= 1
+            self.abandoned.append(worker.pid)
+            self._cond.notify()
+
+
+_pool: ProbeWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_probe_pool() -> ProbeWorkerPool | None:
+    """Return the active pool, or None when probes run in-process.
+
+    Outside ``probe_workers()`` a pool is started on first use when
+    USB_TOOL_PROBE_WORKERS is a positive worker count.
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+    try:
+        size = int(os.getenv(_WORKERS_ENV, "0"))
+    except ValueError:
+        return None
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProbeWorkerPool(size)
+            atexit.register(_pool.close)
+        return _pool
+
+
+@contextmanager
+def probe_workers(
+    size: int = DEFAULT_WORKERS, command: list[str] | None = None
+) -> Iterator[ProbeWorkerPool]:
+    """Route version probes and pokes through a new pool for the duration of the block."""
+    global _pool
+    previous = _pool
+    pool = ProbeWorkerPool(size, command)
+    _pool = pool
+    try:
+        yield pool
+    finally:
+        _pool = previous
+        pool.close()
+
+
+def _serve_version(request: dict[str, Any]) -> bytes:
+    from . import device_version
+
+    timings: dict[str, Any] = {}
+    info = device_version.query_device_version(
+        int(request["vendor_id"]),
+        int(request["product_id"]),
+        str(request["serial"]),
+        bsd_name=request.get("bsd_name"),
+        physical_drive_num=request.get("drive"),
+        device_path=request.get("path"),
+        profile=timings,
+    )
+    error = str(timings.get("read_error", "")).encode("ascii", "replace")[:255]
+    return bytes([len(error)]) + error + info.raw_data
+
+
+def _serve_poke(manager: Any, op: int, request: dict[str, Any]) -> bytes:
+    target = request["target"]
+    if op == OP_POKE:
+        return _pack_poke_results([manager.poke_with_result(target, int(request.get("lba", 0)))])
+    burst = manager.poke_burst(
+        target,
+        int(request["count"]),
+        tuple(int(lba) for lba in request.get("lbas") or (0,)),
+        float(request.get("interval_ms", 0.0)),
+    )
+    return _pack_poke_results(burst.results)
+
+
+def run_worker() -> None:
+    """Serve requests from stdin until it closes; the body of each worker process."""
+    os.environ[_WORKERS_ENV] = "0"
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    # Stray prints from probe code must not corrupt the result stream.
+    sys.stdout = sys.stderr
+    manager = None
+    while True:
+        header = _read_exact(stdin, _FRAME.size)
+        if header is None:
+            return
+        request_id, op, length = _FRAME.unpack(header)
+        body = _read_exact(stdin, length) if length else b""
+        if body is None:
+            return
+        try:
+            request = json.loads(body) if body else {}
+            if op == OP_VERSION:
+                payload = _serve_version(request)
+            elif op in (OP_POKE, OP_BURST):
+                if manager is None:
+                    from .services import DeviceManager
+
+                    manager = DeviceManager()
+                payload = _serve_poke(manager, op, request)
+            else:
+                raise ValueError(f"unknown probe worker op {op}")
+            status = STATUS_OK
+        except Exception as exc:
+            status = STATUS_ERROR
+            payload = f"{type(exc).__name__}: {exc}".encode("utf-8", "replace")
+        stdout.write(_FRAME.pack(request_id, status, len(payload)) + payload)
+        stdout.flush()
@@ -0,0 +1,227 @@
+# src/usb_tool/quarantine.py
+
+"""Negative cache for devices whose READ BUFFER probe times out or errors.
+
+Each consecutive failure quarantines the device for ``base × 2^(failures - 1)``
+seconds, capped at ``max_backoff_s``. While quarantined, version probes and pokes
+for the device are skipped. A successful probe clears the entry, and so does a
+new enumeration identity, which is how a hotplug (unplug and replug) shows up.
+The state is stored next to the version cache so separate CLI runs in a polling
+loop share it, and written the same way (temporary file plus ``os.replace``).
+Every lookup rereads the file, and every update holds an exclusive lock on a
+sibling ``.lock`` file across its read-modify-write, so concurrent processes do
+not drop each other's entries.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ._file_lock import exclusive_file_lock
+from .version_cache import default_cache_path
+
+__all__ = [
+    "DEFAULT_BASE_BACKOFF_S",
+    "DEFAULT_MAX_BACKOFF_S",
+    "ProbeQuarantine",
+    "QuarantineEntry",
+    "default_quarantine_path",
+    "get_probe_quarantine",
+    "is_device_fault",
+    "quarantine_key",
+]
+
+QUARANTINE_FORMAT_VERSION = 1
+QUARANTINE_FILE_NAME = "probe-quarantine.json"
+DEFAULT_BASE_BACKOFF_S = 30.0
+DEFAULT_MAX_BACKOFF_S = 900.0
+# Errors that say nothing about the device itself: missing privileges, or the
+# node disappearing because the device was unplugged.
+_NOT_DEVICE_FAULTS = frozenset({"PermissionError", "FileNotFoundError"})
+
+
+def default_quarantine_path() -> Path:
+    return default_cache_path().with_name(QUARANTINE_FILE_NAME)
+
+
+def quarantine_key(vendor_id: int, product_id: int, serial_number: str) -> str:
+    return f"{vendor_id:04x}:{product_id:04x}:{serial_number}"
+
+
+def is_device_fault(error: str) -> bool:
+    """True for probe errors that should count toward quarantine."""
+    return bool(error) and error not in _NOT_DEVICE_FAULTS
+
+
+@dataclass
+class QuarantineEntry:
+    failures: int
+    until: float
+    last_error: str
+    identity: str = ""
+
+    def active(self, now: float) -> bool:
+        return now < self.until
+
+    def to_dict(self) -> dict[str, Any]:
+        """The ``quarantine`` value shown on a device in ``--json`` output."""
+        retry_after = datetime.fromtimestamp(self.until, timezone.utc)
+        return {
+            "failures": self.failures,
+            "lastError": self.last_error,
+            "retryAfter": retry_after.isoformat(timespec="seconds"),
+        }
+
+
+class ProbeQuarantine:
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        base_backoff_s: float = DEFAULT_BASE_BACKOFF_S,
+        max_backoff_s: float = DEFAULT_MAX_BACKOFF_S,
+    ):
+        self.path = Path(path) if path is not None else default_quarantine_path()
+        self.base_backoff_s = max(float(base_backoff_s), 0.0)
+        self.max_backoff_s = max(float(max_backoff_s), self.base_backoff_s)
+        self._lock = threading.Lock()
+
+    def check(self, key: str, identity: str = "") -> QuarantineEntry | None:
+        """Return the entry if ``key`` is quarantined now.
+
+        A different non-empty ``identity`` means the device re-enumerated since
+        the failure was recorded, so the entry is dropped.
+        """
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+        if identity and entry.identity and identity != entry.identity:
+            with self._update() as entries:
+                current = entries.get(key)
+                if current is not None and current.identity not in ("", identity):
+                    del entries[key]
+                    self._write(entries)
+                    return None
+                entry = current
+            if entry is None:
+                return None
+        return entry if entry.active(time.time()) else None
+
+    def active_entry(self, key: str) -> QuarantineEntry | None:
+        entry = self._load().get(key)
+        return entry if entry is not None and entry.active(time.time()) else None
+
+    def record_failure(self, key: str, error: str, identity: str = "") -> QuarantineEntry:
+        with self._update() as entries:
+            previous = entries.get(key)
+            failures = 1
+            if previous is not None and (not identity or previous.identity in ("", identity)):
+                failures = previous.failures + 1
+            backoff = min(self.base_backoff_s * 2 ** (failures - 1), self.max_backoff_s)
+            entry = QuarantineEntry(failures, time.time() + backoff, error, identity)
+            entries[key] = entry
+            self._write(entries)
+            return entry
+
+    def record_success(self, key: str) -> None:
+        with self._update() as entries:
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def reset(self, key: str | None = None) -> None:
+        """Forget ``key``, or every entry when ``key`` is None."""
+        with self._update() as entries:
+            if key is None:
+                entries.clear()
+            elif entries.pop(key, None) is None:
+                return
+            self._write(entries)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    @contextmanager
+    def _update(self) -> Iterator[dict[str, QuarantineEntry]]:
+        """Yield the current entries with both the thread and the file lock held."""
+        with self._lock, exclusive_file_lock(self.path.with_name(f"{self.path.name}.lock")):
+            yield self._load()
+
+    def _load(self) -> dict[str, QuarantineEntry]:
+        # Reread on every call: other processes update the file between scans.
+        loaded: dict[str, QuarantineEntry] = {}
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return loaded
+        if not isinstance(data, dict) or data.get("version") != QUARANTINE_FORMAT_VERSION:
+            return loaded
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return loaded
+        for key, value in entries.items():
+            try:
+                loaded[key] = QuarantineEntry(
+                    failures=int(value["failures"]),
+                    until=float(value["until"]),
+                    last_error=str(value.get("lastError", "")),
+                    identity=str(value.get("identity", "")),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        return loaded
+
+    def _write(self, entries: dict[str, QuarantineEntry]) -> None:
+        payload = {
+            "version": QUARANTINE_FORMAT_VERSION,
+            "entries": {
+                key: {
+                    "failures": entry.failures,
+                    "until": entry.until,
+                    "lastError": entry.last_error,
+                    "identity": entry.identity,
+                }
+                for key, entry in entries.items()
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f".{QUARANTINE_FILE_NAME}.", suffix=".tmp", dir=str(self.path.parent)
+            )
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+
+_quarantine_instance: ProbeQuarantine | None = None
+_quarantine_instance_lock = threading.Lock()
+
+
+def get_probe_quarantine() -> ProbeQuarantine | None:
+    """Return the process-wide quarantine, or None when disabled via USB_TOOL_PROBE_QUARANTINE=0."""
+    global _quarantine_instance
+    if os.getenv("USB_TOOL_PROBE_QUARANTINE") == "0":
+        return None
+    path = default_quarantine_path()
+    with _quarantine_instance_lock:
+        if _quarantine_instance is None or _quarantine_instance.path != path:
+            _quarantine_instance = ProbeQuarantine(path)
+        return _quarantine_instance
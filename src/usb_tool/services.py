@@ -2,11 +2,19 @@
 
 import platform
 import string
+import time
+from collections.abc import Callable, Iterator
+from functools import partial
 from typing import Any
 
 from .backend.base import AbstractBackend
-from .device_version import query_device_version
-from .models import UsbDeviceInfo
+from .deadline import ScanDeadline, scan_deadline, use_deadline
+from .device_version import close_scsi_sessions, query_device_version, scsi_session_scope
+from .models import PokeBurstResult, PokeResult, ScanDiff, UsbDeviceInfo
+from .probe_workers import get_probe_pool
+from .quarantine import get_probe_quarantine, is_device_fault, quarantine_key
+from .tracing import get_tracer
+from .version_cache import get_version_cache
 
 VERSION_FIELD_NAMES = (
     "scbPartNumber",
@@ -62,6 +70,48 @@ def prune_hidden_version_fields(device: UsbDeviceInfo) -> None:
             pass
 
 
+def device_key(device: Any) -> str:
+    """Stable key for a device record: block device, PhysicalDrive number, or serial."""
+    block_device = getattr(device, "blockDevice", None)
+    if block_device:
+        return str(block_device)
+    drive_num = getattr(device, "physicalDriveNum", -1)
+    if isinstance(drive_num, int) and drive_num >= 0:
+        return f"PhysicalDrive{drive_num}"
+    return str(getattr(device, "iSerial", ""))
+
+
+def _device_quarantine_key(device: Any) -> str | None:
+    serial = str(getattr(device, "iSerial", "") or "")
+    if not serial:
+        return None
+    try:
+        vendor_id = int(str(getattr(device, "idVendor", "")), 16)
+        product_id = int(str(getattr(device, "idProduct", "")), 16)
+    except ValueError:
+        return None
+    return quarantine_key(vendor_id, product_id, serial)
+
+
+def needs_version_probe(
+    vendor_id: int,
+    product_id: int,
+    serial_number: str,
+    bcd_device: str | None = None,
+    identity: str = "",
+) -> bool:
+    """Whether ``populate_device_version`` would send READ BUFFER to this device."""
+    if not _should_probe_device_version():
+        return False
+    cache = get_version_cache() if bcd_device else None
+    if cache is not None and bcd_device:
+        if cache.get(vendor_id, product_id, serial_number, bcd_device, identity) is not None:
+            return False
+    quarantine = get_probe_quarantine() if serial_number else None
+    key = quarantine_key(vendor_id, product_id, serial_number)
+    return quarantine is None or quarantine.check(key, identity) is None
+
+
 def populate_device_version(
     vendor_id: int,
     product_id: int,
@@ -70,9 +120,17 @@ def populate_device_version(
     physical_drive_num: int | None = None,
     device_path: str | None = None,
     profile: dict[str, Any] | None = None,
+    bcd_device: str | None = None,
+    identity: str = "",
+    read_result: tuple[bytes, str] | None = None,
 ) -> dict:
     """
     Queries the device version and returns a dictionary of formatted strings.
+    When ``bcd_device`` is given, the on-disk version cache is consulted first and
+    refreshed after a successful probe; ``identity`` pins the entry to one enumeration.
+    Devices in probe quarantine are not queried; see ``usb_tool.quarantine``.
+    With a probe worker pool active the query runs there; see ``usb_tool.probe_workers``.
+    ``read_result`` is a READ BUFFER the caller already issued, as ``(data, read_error)``.
     """
     version_info = {
         "scbPartNumber": "N/A",
@@ -85,15 +143,42 @@ def populate_device_version(
     if not _should_probe_device_version():
         return version_info
 
+    cache = get_version_cache() if bcd_device else None
+    if cache is not None and bcd_device:
+        cached = cache.get(vendor_id, product_id, serial_number, bcd_device, identity)
+        if cached is not None:
+            if profile is not None:
+                profile["version_cache"] = "hit"
+            version_info.update(
+                {key: value for key, value in cached.items() if key in VERSION_FIELD_NAMES}
+            )
+            return version_info
+        if profile is not None:
+            profile["version_cache"] = "miss"
+
+    quarantine = get_probe_quarantine() if serial_number else None
+    key = quarantine_key(vendor_id, product_id, serial_number)
+    if quarantine is not None and quarantine.check(key, identity) is not None:
+        if profile is not None:
+            profile["quarantine"] = "skipped"
+        return version_info
+
+    timings = profile if profile is not None else {}
+    pool = get_probe_pool()
+    query: Callable[..., Any] = query_device_version
+    if read_result is not None:
+        query = partial(query_device_version, read_result=read_result)
+    elif pool is not None:
+        query = pool.query_device_version
     try:
-        _ver = query_device_version(
+        _ver = query(
             vendor_id,
             product_id,
             serial_number,
             bsd_name=bsd_name,
             physical_drive_num=physical_drive_num,
             device_path=device_path,
-            profile=profile,
+            profile=timings,
         )
 
         if getattr(_ver, "scb_part_number", "N/A") != "N/A":
@@ -109,18 +194,58 @@ def populate_device_version(
 
         version_info["bridgeFW"] = getattr(_ver, "bridge_fw", "N/A") or "N/A"
 
-    except Exception:
-        pass
+    except Exception as exc:
+        if quarantine is not None:
+            quarantine.record_failure(key, type(exc).__name__, identity)
+        return version_info
+
+    if quarantine is not None:
+        read_error = str(timings.get("read_error", ""))
+        if is_device_fault(read_error):
+            quarantine.record_failure(key, read_error, identity)
+        elif not read_error:
+            quarantine.record_success(key)
+
+    # An empty payload (device busy, no permission) must not be cached as the answer.
+    if cache is not None and bcd_device and any(value != "N/A" for value in version_info.values()):
+        cache.put(vendor_id, product_id, serial_number, bcd_device, version_info, identity)
 
     return version_info
 
 
+def _iter_under_deadline(
+    iterator: Iterator[UsbDeviceInfo], deadline: ScanDeadline | None
+) -> Iterator[UsbDeviceInfo]:
+    # The deadline is active only while the backend works, never across a yield,
+    # so whatever the consumer does between devices runs outside it.
+    try:
+        while True:
+            with use_deadline(deadline):
+                try:
+                    device = next(iterator)
+                except StopIteration:
+                    return
+            yield device
+    finally:
+        close = getattr(iterator, "close", None)
+        if callable(close):
+            with use_deadline(deadline):
+                close()
+
+
 class DeviceManager:
     def __init__(self, backend: AbstractBackend | None = None):
         if backend is None:
             self.backend = self._get_default_backend()
         else:
             self.backend = backend
+        self._hotplug_monitor: Any | None = None
+        # key -> (fingerprint, device or None) from the previous incremental scan.
+        self._incremental_state: dict[str, tuple[Any, UsbDeviceInfo | None]] | None = None
+        # key -> to_dict() of each device as last reported by an incremental scan.
+        self._incremental_reported: dict[str, dict[str, Any]] = {}
+        # poke identifier (block device or drive number) -> quarantine key, from scans.
+        self._quarantine_keys: dict[str, str] = {}
 
     def _get_default_backend(self) -> AbstractBackend:
         system = platform.system().lower()
@@ -143,9 +268,263 @@ class DeviceManager:
         self,
         expanded: bool = False,
         profile_scan: bool = False,
+        deadline_s: float | None = None,
     ) -> list[UsbDeviceInfo]:
-        devices = self.backend.scan_devices(expanded=expanded, profile_scan=profile_scan)
-        return self.backend.sort_devices(devices)
+        """
+        Scans and returns devices in list order. With ``deadline_s`` the scan stops
+        starting new work once the budget is spent and returns what it has; fields
+        it could not finish are named in each device's ``unknownFields``.
+        """
+        with (
+            get_tracer().span(
+                "list_devices", category="scan", expanded=expanded, deadline_s=deadline_s
+            ) as span,
+            scan_deadline(deadline_s),
+            scsi_session_scope(),
+        ):
+            devices = self.backend.scan_devices(expanded=expanded, profile_scan=profile_scan)
+            span.set(device_count=len(devices))
+            return self.backend.sort_devices([self._mark_quarantine(dev) for dev in devices])
+
+    def iter_devices(
+        self,
+        expanded: bool = False,
+        profile_scan: bool = False,
+        sort: bool = False,
+        deadline_s: float | None = None,
+    ) -> Iterator[UsbDeviceInfo]:
+        """
+        Yields devices in completion order as the backend finishes each record.
+        With ``sort=True`` the scan is drained first and yielded in list order.
+        ``deadline_s`` bounds the scan as in ``list_devices``.
+        """
+        deadline = None if deadline_s is None else ScanDeadline(deadline_s)
+        with (
+            get_tracer().span("iter_devices", category="scan", expanded=expanded, sort=sort),
+            scsi_session_scope(),
+        ):
+            devices = _iter_under_deadline(
+                self.backend.iter_devices(expanded=expanded, profile_scan=profile_scan), deadline
+            )
+            if sort:
+                yield from self.backend.sort_devices([self._mark_quarantine(d) for d in devices])
+                return
+            for device in devices:
+                yield self._mark_quarantine(device)
+
+    def list_devices_incremental(
+        self,
+        expanded: bool = False,
+        profile_scan: bool = False,
+        deadline_s: float | None = None,
+    ) -> ScanDiff:
+        """
+        Rescans, rebuilding only devices whose backend fingerprint changed, and
+        reports what was added, removed or changed since the previous call.
+        Backends without fingerprints, or without ``scan_block_device`` to rebuild
+        one device, fall back to a full scan every time. ``deadline_s`` bounds the
+        scan as in ``list_devices``; a device it cut short is rebuilt next call.
+        """
+        with (
+            get_tracer().span(
+                "list_devices_incremental",
+                category="scan",
+                expanded=expanded,
+                deadline_s=deadline_s,
+            ) as span,
+            scan_deadline(deadline_s),
+            scsi_session_scope(),
+        ):
+            diff = self._scan_incremental(expanded, profile_scan)
+            span.set(
+                device_count=len(diff.devices),
+                added=len(diff.added),
+                removed=len(diff.removed),
+                changed=len(diff.changed),
+            )
+            return diff
+
+    def _scan_incremental(self, expanded: bool, profile_scan: bool) -> ScanDiff:
+        scan_block_device: Callable[[str], UsbDeviceInfo | None] | None = getattr(
+            self.backend, "scan_block_device", None
+        )
+        fingerprints = None if scan_block_device is None else self.backend.device_fingerprints()
+        previous = self._incremental_state
+        state: dict[str, tuple[Any, UsbDeviceInfo | None]] = {}
+        if scan_block_device is None or fingerprints is None or previous is None:
+            devices = self.backend.scan_devices(expanded=expanded, profile_scan=profile_scan)
+            by_key = {device_key(device): device for device in devices}
+            for key, fingerprint in (fingerprints or {}).items():
+                state[key] = (fingerprint, by_key.pop(key, None))
+            # Devices the backend could not fingerprint are rebuilt on every call.
+            for key, device in by_key.items():
+                state[key] = (None, device)
+        else:
+            for key, fingerprint in fingerprints.items():
+                prior = previous.get(key)
+                if prior is not None and prior[0] is not None and prior[0] == fingerprint:
+                    state[key] = prior
+                else:
+                    state[key] = (fingerprint, scan_block_device(key))
+        # A record the deadline cut short is not reused: rebuild it on the next call.
+        self._incremental_state = {
+            key: (None if getattr(device, "unknownFields", None) else fingerprint, device)
+            for key, (fingerprint, device) in state.items()
+        }
+
+        old = {key: device for key, (_, device) in (previous or {}).items() if device is not None}
+        new = {
+            key: self._mark_quarantine(device)
+            for key, (_, device) in state.items()
+            if device is not None
+        }
+        # Reused records are marked in place, so compare against what was last reported.
+        reported = self._incremental_reported
+        self._incremental_reported = {key: device.to_dict() for key, device in new.items()}
+        return ScanDiff(
+            devices=self.backend.sort_devices(list(new.values())),
+            added=[device for key, device in new.items() if key not in old],
+            removed=[device for key, device in old.items() if key not in new],
+            changed=[
+                device
+                for key, device in new.items()
+                if key in old and reported.get(key) != self._incremental_reported[key]
+            ],
+        )
+
+    def poke(self, device_identifier: Any, lba: int = 0) -> bool:
+        if self._quarantine_error(device_identifier):
+            return False
+        pool = get_probe_pool()
+        if pool is not None:
+            return pool.poke(device_identifier, lba).success
+        return self.backend.poke_device(device_identifier, lba)
+
+    def poke_with_result(self, device_identifier: Any, lba: int = 0) -> PokeResult:
+        error = self._quarantine_error(device_identifier)
+        if error:
+            return PokeResult(success=False, error=error)
+        pool = get_probe_pool()
+        if pool is not None:
+            return pool.poke(device_identifier, lba)
+        return self.backend.poke_device_result(device_identifier, lba)
+
+    def poke_burst(
+        self,
+        device_identifier: Any,
+        count: int,
+        lbas: tuple[int, ...] = (0,),
+        interval_ms: float = 0.0,
+    ) -> PokeBurstResult:
+        """
+        Sends ``count`` READ(10) commands, cycling through ``lbas`` and pausing
+        ``interval_ms`` between commands. Errors are recorded, not raised.
+        """
+        burst = PokeBurstResult()
+        error = self._quarantine_error(device_identifier)
+        if error:
+            burst.results = [PokeResult(success=False, error=error) for _ in range(max(count, 0))]
+            return burst
+        pool = get_probe_pool()
+        if pool is not None:
+            return pool.poke_burst(device_identifier, count, lbas, interval_ms)
+        lba_cycle = lbas or (0,)
+        # One session for the whole burst, so the handle and buffers are reused.
+        with self.backend.open_poke_session(device_identifier) as session:
+            for index in range(max(count, 0)):
+                if index and interval_ms > 0:
+                    time.sleep(interval_ms / 1000.0)
+                try:
+                    result = session.poke(lba_cycle[index % len(lba_cycle)])
+                except Exception as exc:
+                    result = PokeResult(success=False, error=str(exc))
+                burst.results.append(result)
+        return burst
+
+    def subscribe(
+        self,
+        callback: Callable[[str, UsbDeviceInfo], None],
+        expanded: bool = False,
+        device_lock: Any = None,
+    ) -> Callable[[], None]:
+        """
+        Calls ``callback(action, device)`` on hotplug add/remove/change events.
+        Starts the platform hotplug monitor on first use and returns an unsubscribe function.
+        The monitor holds ``device_lock`` (a lock or other context manager) while it
+        scans, so callers sending their own SCSI commands can serialize with it.
+        """
+        monitor = self._ensure_hotplug_monitor(expanded, device_lock)
+        return monitor.subscribe(callback)  # type: ignore[no-any-return]
+
+    def inventory(self) -> list[UsbDeviceInfo]:
+        """
+        Returns the hotplug-maintained device list, or a fresh scan when no monitor is running.
+        """
+        if self._hotplug_monitor is not None:
+            return [self._mark_quarantine(dev) for dev in self._hotplug_monitor.devices()]
+        return self.list_devices()
+
+    def close(self) -> None:
+        if self._hotplug_monitor is not None:
+            self._hotplug_monitor.stop()
+            self._hotplug_monitor = None
+        close_scsi_sessions()
+
+    def _mark_quarantine(self, device: UsbDeviceInfo) -> UsbDeviceInfo:
+        """Set ``device.quarantine`` from the probe quarantine and remember its poke targets."""
+        quarantine = get_probe_quarantine()
+        key = _device_quarantine_key(device)
+        if quarantine is None or key is None:
+            return device
+        block_device = getattr(device, "blockDevice", None)
+        if block_device:
+            self._quarantine_keys[str(block_device)] = key
+        drive_num = getattr(device, "physicalDriveNum", -1)
+        if isinstance(drive_num, int) and drive_num >= 0:
+            self._quarantine_keys[str(drive_num)] = key
+        entry = quarantine.active_entry(key)
+        device.quarantine = entry.to_dict() if entry is not None else None
+        return device
+
+    def _reset_quarantine_on_unplug(self, action: str, device: UsbDeviceInfo) -> None:
+        # A replugged device re-enumerates, so its quarantine starts over. Resetting
+        # on removal rather than on the add keeps a failure the add's own scan
+        # just recorded.
+        if action != "remove":
+            return
+        quarantine = get_probe_quarantine()
+        key = _device_quarantine_key(device)
+        if quarantine is not None and key is not None:
+            quarantine.reset(key)
+
+    def _quarantine_error(self, device_identifier: Any) -> str:
+        # Only devices seen by a scan on this manager can be matched to an entry.
+        key = self._quarantine_keys.get(str(device_identifier))
+        quarantine = get_probe_quarantine()
+        if key is None or quarantine is None:
+            return ""
+        entry = quarantine.active_entry(key)
+        if entry is None:
+            return ""
+        return (
+            f"quarantined after {entry.failures} failed probe(s) "
+            f"({entry.last_error}); retry after {entry.to_dict()['retryAfter']}"
+        )
 
-    def poke(self, device_identifier: Any) -> bool:
-        return self.backend.poke_device(device_identifier)
+    def _ensure_hotplug_monitor(self, expanded: bool = False, device_lock: Any = None) -> Any:
+        if self._hotplug_monitor is None:
+            monitor = self.backend.create_hotplug_monitor(
+                expanded=expanded, device_lock=device_lock
+            )
+            if monitor is None:
+                raise NotImplementedError("Hotplug monitoring is not supported on this platform.")
+            monitor.start()
+            monitor.subscribe(self._reset_quarantine_on_unplug)
+            self._hotplug_monitor = monitor
+        else:
+            if device_lock is not None:
+                self._hotplug_monitor.device_lock = device_lock
+            if expanded and not self._hotplug_monitor.expanded:
+                self._hotplug_monitor.expanded = True
+                self._hotplug_monitor.resync()
+        return self._hotplug_monitor
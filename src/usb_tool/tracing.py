@@ -0,0 +1,308 @@
+# src/usb_tool/tracing.py
+
+"""Scan tracer: nested, thread-aware spans and instant events with exporters.
+
+Backends and ``query_device_version`` report into whichever tracer is active.
+The default tracer is disabled, and its ``span()``/``event()`` return before
+touching the clock, so an untraced scan pays one attribute check per call site.
+
+    tracer = Tracer()
+    with tracing(tracer):
+        DeviceManager().list_devices()
+    write_trace(tracer, "scan.json", "chrome")  # open in https://ui.perfetto.dev
+
+Exporters: ``export_chrome_trace`` (trace-event JSON), ``export_json`` (one flat
+record per span/event) and ``export_text`` (the ``prefix: key=value`` lines
+``--profile-scan`` prints).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+__all__ = [
+    "TRACE_FORMATS",
+    "Span",
+    "Tracer",
+    "export_chrome_trace",
+    "export_json",
+    "export_text",
+    "get_tracer",
+    "tracing",
+    "write_trace",
+]
+
+TRACE_FORMATS = ("chrome", "json", "text")
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def set(self, **_attrs: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed region. ``end`` stays None for instant events recorded via ``event()``."""
+
+    __slots__ = (
+        "tracer",
+        "span_id",
+        "parent_id",
+        "name",
+        "category",
+        "attrs",
+        "start",
+        "end",
+        "thread_id",
+        "thread_name",
+        "instant",
+    )
+
+    def __init__(
+        self,
+        tracer: Tracer,
+        name: str,
+        category: str,
+        attrs: dict[str, Any],
+        parent: Span | None = None,
+        instant: bool = False,
+    ):
+        self.tracer = tracer
+        self.span_id = tracer._next_id()
+        self.parent_id: int | None = parent.span_id if parent is not None else None
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.start = 0.0
+        self.end: float | None = None
+        self.thread_id = 0
+        self.thread_name = ""
+        self.instant = instant
+
+    @property
+    def duration_ms(self) -> float:
+        if self.end is None:
+            return 0.0
+        return (self.end - self.start) * 1000.0
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def _bind_thread(self) -> None:
+        thread = threading.current_thread()
+        self.thread_id = threading.get_native_id()
+        self.thread_name = thread.name
+
+    def __enter__(self) -> Span:
+        self._bind_thread()
+        stack = self.tracer._stack()
+        if self.parent_id is None and stack:
+            self.parent_id = stack[-1].span_id
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, _tb: Any) -> None:
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        stack = self.tracer._stack()
+        # Generators can close spans out of order; drop this one wherever it is.
+        if self in stack:
+            stack.remove(self)
+        self.tracer._finish(self)
+
+
+class Tracer:
+    """Collects spans from every thread. Construct with ``enabled=False`` for a no-op tracer."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._ids = 0
+        self._local = threading.local()
+
+    def span(
+        self, name: str, category: str = "usb_tool", parent: Span | None = None, **attrs: Any
+    ) -> Any:
+        """Return a context manager timing ``name``; nests under the thread's open span."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, attrs, parent)
+
+    def event(self, name: str, category: str = "usb_tool", **attrs: Any) -> None:
+        """Record an instant event under the thread's open span."""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        event = Span(self, name, category, attrs, stack[-1] if stack else None, instant=True)
+        event._bind_thread()
+        event.start = time.perf_counter()
+        self._finish(event)
+
+    def add_span(
+        self, name: str, start: float, end: float, category: str = "usb_tool", **attrs: Any
+    ) -> None:
+        """Record a span already timed with ``time.perf_counter()`` on this thread."""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        span = Span(self, name, category, attrs, stack[-1] if stack else None)
+        span._bind_thread()
+        span.start = start
+        span.end = end
+        self._finish(span)
+
+    def current(self) -> Span | None:
+        """The innermost open span on this thread, for handing to worker threads as ``parent``."""
+        if not self.enabled:
+            return None
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.start)
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _next_id(self) -> int:
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+
+_DISABLED = Tracer(enabled=False)
+_active = _DISABLED
+
+
+def get_tracer() -> Tracer:
+    """Return the active tracer; a disabled one unless inside ``tracing()``."""
+    return _active
+
+
+@contextmanager
+def tracing(tracer: Tracer | None = None) -> Iterator[Tracer]:
+    """Make ``tracer`` (a new one by default) active process-wide, including worker threads."""
+    global _active
+    previous = _active
+    _active = tracer if tracer is not None else Tracer()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def _json_safe(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def export_chrome_trace(tracer: Tracer) -> dict[str, Any]:
+    """Trace-event JSON ("X" complete events, "i" instants) for Perfetto or chrome://tracing."""
+    events: list[dict[str, Any]] = []
+    threads: dict[int, str] = {}
+    for span in tracer.spans():
+        threads.setdefault(span.thread_id, span.thread_name)
+        event: dict[str, Any] = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "i" if span.instant else "X",
+            "ts": round((span.start - tracer.origin) * 1_000_000.0, 3),
+            "pid": tracer.pid,
+            "tid": span.thread_id,
+            "args": {key: _json_safe(value) for key, value in span.attrs.items()},
+        }
+        if span.instant:
+            event["s"] = "t"
+        else:
+            event["dur"] = round(span.duration_ms * 1000.0, 3)
+        events.append(event)
+    metadata = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": tracer.pid,
+            "tid": thread_id,
+            "args": {"name": thread_name},
+        }
+        for thread_id, thread_name in threads.items()
+    ]
+    return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+
+def export_json(tracer: Tracer) -> list[dict[str, Any]]:
+    """One flat record per span or event, with parent IDs instead of nesting."""
+    return [
+        {
+            "id": span.span_id,
+            "parent": span.parent_id,
+            "name": span.name,
+            "category": span.category,
+            "kind": "event" if span.instant else "span",
+            "start_ms": round((span.start - tracer.origin) * 1000.0, 3),
+            "duration_ms": None if span.instant else round(span.duration_ms, 3),
+            "thread_id": span.thread_id,
+            "thread_name": span.thread_name,
+            "attrs": {key: _json_safe(value) for key, value in span.attrs.items()},
+        }
+        for span in tracer.spans()
+    ]
+
+
+def export_text(tracer: Tracer) -> str:
+    """``prefix: key=value`` lines, one per event or span, in start order."""
+    lines = []
+    for span in tracer.spans():
+        fields = dict(span.attrs)
+        if not span.instant:
+            fields = {
+                "duration_ms": f"{span.duration_ms:.2f}",
+                "thread": span.thread_name,
+                **fields,
+            }
+        suffix = " ".join(f"{key}={value}" for key, value in fields.items())
+        label = span.name if span.instant else f"{span.category} {span.name}"
+        lines.append(f"{label}: {suffix}" if suffix else f"{label}:")
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def write_trace(tracer: Tracer, path: str, trace_format: str = "chrome") -> None:
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"Unknown trace format: {trace_format!r}")
+    if trace_format == "text":
+        payload = export_text(tracer)
+    elif trace_format == "json":
+        payload = json.dumps(export_json(tracer), indent=2) + "\n"
+    else:
+        payload = json.dumps(export_chrome_trace(tracer)) + "\n"
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(payload)
@@ -26,3 +26,14 @@ def parse_usb_version(bcd: int) -> str:
     minor = (bcd & 0x00F0) >> 4
     subminor = bcd & 0x000F
     return f"{major}.{minor}{subminor}" if subminor else f"{major}.{minor}"
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Linearly interpolated percentile (0-100) of ``values``; None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * min(max(pct, 0.0), 100.0) / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
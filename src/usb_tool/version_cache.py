@@ -0,0 +1,181 @@
+# src/usb_tool/version_cache.py
+
+"""Persistent cache of READ BUFFER version info keyed by device identity.
+
+The payload parsed by ``query_device_version`` only changes with firmware, so
+it is stored on disk and reused until the device's bcdDevice or enumeration
+identity changes. Writes go through a temporary file and ``os.replace`` so a
+crashed or concurrent writer never leaves a torn cache behind. Lookups reread
+the file, and updates hold an exclusive lock on a sibling ``.lock`` file across
+their read-modify-write, so the daemon and CLI runs do not drop each other's
+entries.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from ._file_lock import exclusive_file_lock
+
+__all__ = [
+    "DEFAULT_MAX_ENTRIES",
+    "VersionCache",
+    "default_cache_path",
+    "get_version_cache",
+]
+
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_NAME = "version-info.json"
+CACHE_DIR_NAME = "apricorn-usb-toolkit"
+DEFAULT_MAX_ENTRIES = 256
+
+
+def _user_cache_dir() -> Path:
+    if sys.platform == "win32":
+        base = os.getenv("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / CACHE_DIR_NAME / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / CACHE_DIR_NAME
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / CACHE_DIR_NAME
+
+
+def default_cache_path() -> Path:
+    override = os.getenv("USB_TOOL_CACHE_DIR")
+    cache_dir = Path(override) if override else _user_cache_dir()
+    return cache_dir / CACHE_FILE_NAME
+
+
+def _cache_key(vendor_id: int, product_id: int, serial_number: str) -> str:
+    return f"{vendor_id:04x}:{product_id:04x}:{serial_number}"
+
+
+class VersionCache:
+    def __init__(self, path: Path | str | None = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_entries = max(int(max_entries), 1)
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        vendor_id: int,
+        product_id: int,
+        serial_number: str,
+        bcd_device: str,
+        identity: str = "",
+    ) -> dict[str, str] | None:
+        """Return cached version fields, or None when missing or stale."""
+        if not serial_number or not bcd_device:
+            return None
+        entry = self._load().get(_cache_key(vendor_id, product_id, serial_number))
+        if entry is None:
+            return None
+        if entry.get("bcdDevice") != bcd_device or entry.get("identity") != identity:
+            return None
+        version_info = entry.get("versionInfo")
+        if not isinstance(version_info, dict):
+            return None
+        return {str(key): str(value) for key, value in version_info.items()}
+
+    def put(
+        self,
+        vendor_id: int,
+        product_id: int,
+        serial_number: str,
+        bcd_device: str,
+        version_info: dict[str, Any],
+        identity: str = "",
+    ) -> None:
+        if not serial_number or not bcd_device:
+            return
+        with self._update() as entries:
+            entries[_cache_key(vendor_id, product_id, serial_number)] = {
+                "bcdDevice": bcd_device,
+                "identity": identity,
+                "versionInfo": dict(version_info),
+                "updated": time.time(),
+            }
+            self._evict(entries)
+            self._write(entries)
+
+    def clear(self) -> None:
+        with self._update():
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    @contextmanager
+    def _update(self) -> Iterator[dict[str, dict[str, Any]]]:
+        """Yield the current entries with both the thread and the file lock held."""
+        with self._lock, exclusive_file_lock(self.path.with_name(f"{self.path.name}.lock")):
+            yield self._load()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        # Reread on every call: other processes update the file between scans.
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_FORMAT_VERSION:
+            return {}
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        return {key: value for key, value in entries.items() if isinstance(value, dict)}
+
+    def _evict(self, entries: dict[str, dict[str, Any]]) -> None:
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = sorted(entries, key=lambda key: float(entries[key].get("updated", 0.0)))
+        for key in oldest[:overflow]:
+            del entries[key]
+
+    def _write(self, entries: dict[str, dict[str, Any]]) -> None:
+        payload = {"version": CACHE_FORMAT_VERSION, "entries": entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f".{CACHE_FILE_NAME}.", suffix=".tmp", dir=str(self.path.parent)
+            )
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+
+_cache_instance: VersionCache | None = None
+_cache_instance_lock = threading.Lock()
+
+
+def get_version_cache() -> VersionCache | None:
+    """Return the process-wide cache, or None when disabled via USB_TOOL_VERSION_CACHE=0."""
+    global _cache_instance
+    if os.getenv("USB_TOOL_VERSION_CACHE") == "0":
+        return None
+    path = default_cache_path()
+    with _cache_instance_lock:
+        if _cache_instance is None or _cache_instance.path != path:
+            _cache_instance = VersionCache(path)
+        return _cache_instance
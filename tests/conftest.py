@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_version_cache(monkeypatch, tmp_path):
+    # Keep the persistent version-info cache out of the user's real cache directory.
+    monkeypatch.setenv("USB_TOOL_CACHE_DIR", str(tmp_path / "usb-tool-cache"))
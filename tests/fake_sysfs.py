@@ -0,0 +1,331 @@
+"""Builds a synthetic Linux sysfs, /dev and udev database tree for scale tests.
+
+The layout follows a real xHCI host: PCI controller -> root hub (usbN) -> external
+hub -> device -> mass-storage interface -> SCSI host/target/LUN -> block disk, with
+``class/block`` and ``bus/usb/devices`` symlinks, ``subsystem``/``driver`` links,
+one partition per USB disk and a ``b<major>:<minor>`` udev record per disk. A SATA
+disk, an NVMe disk, a loop device and non-Apricorn USB sticks are mixed in so the
+vendor filter has something to discard. Point ``LinuxBackend(sysfs_root=...,
+dev_root=..., udev_data_root=...)`` at the result.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# (PCI address, path below devices/, vendor, device). The add-in ASMedia card sits
+# behind a root port, as it would on a real board.
+_CONTROLLERS = (
+    ("0000:00:14.0", "pci0000:00/0000:00:14.0", "0x8086", "0x7ae0"),
+    ("0000:00:0d.0", "pci0000:00/0000:00:0d.0", "0x8086", "0x461e"),
+    ("0000:05:00.0", "pci0000:00/0000:00:1c.4/0000:05:00.0", "0x1b21", "0x2142"),
+)
+_PCI_IDS = """\
+8086  Intel Corporation
+\t461e  Alder Lake-P Thunderbolt 4 USB Controller
+\t7ae0  Alder Lake-S PCH USB 3.2 Gen 2x2 XHCI Controller
+144d  Samsung Electronics Co Ltd
+	a80a  NVMe SSD Controller PM9A1/PM9A3/980PRO
+1b21  ASMedia Technology Inc.
+\t2142  ASM2142/ASM3142 USB 3.1 Host Controller
+"""
+# (idProduct, bcdDevice, product name, capacity in GB)
+_APRICORN_MODELS = (
+    ("1407", "0463", "Secure Key 3.0", 16),
+    ("1410", "0502", "Secure Key 3Z", 16),
+    ("1400", "0458", "Fortress", 1000),
+    ("1408", "0466", "Fortress L3", 2000),
+)
+_HUB_PORTS = 7
+# sd disks use these majors, 16 minors per disk (sd(4)).
+_SD_MAJORS = (8, *range(65, 72), *range(128, 136))
+_SECTOR_BYTES = 512
+
+
+@dataclass
+class FakeUsbDisk:
+    block_device: str
+    serial: str
+    vendor_id: str
+    product_id: str
+    bus_number: int
+    device_address: int
+    port_path: str
+    pci_addr: str
+    dev: str
+
+
+@dataclass
+class FakeLinuxTree:
+    root: Path
+    sysfs_root: str
+    dev_root: str
+    udev_data_root: str
+    pci_ids_path: str
+    apricorn_disks: list[FakeUsbDisk] = field(default_factory=list)
+    other_disks: list[str] = field(default_factory=list)
+
+
+def _disk_name(index: int) -> str:
+    # sda..sdz, sdaa..sdzz, ... (bijective base 26, as sd_format_disk_name does).
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("a") + remainder) + letters
+    return f"sd{letters}"
+
+
+def _sd_dev_number(index: int) -> tuple[int, int]:
+    major = _SD_MAJORS[(index // 16) % len(_SD_MAJORS)]
+    minor = (index % 16) * 16 + (index // 256) * 256
+    return major, minor
+
+
+def _write(path: Path, **attributes: object) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    for name, value in attributes.items():
+        (path / name).write_text(f"{value}\n", encoding="utf-8")
+
+
+def _link(link: Path, target: Path) -> None:
+    link.parent.mkdir(parents=True, exist_ok=True)
+    link.symlink_to(os.path.relpath(target, link.parent))
+
+
+class _TreeBuilder:
+    def __init__(self, root: Path):
+        self.root = root
+        self.sys = root / "sys"
+        self.dev = root / "dev"
+        self.udev = root / "run" / "udev" / "data"
+        self.next_disk = 0
+        self.next_scsi_host = 0
+        for directory in (self.sys / "class" / "block", self.dev, self.udev):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _bus_path(self, subsystem: str) -> Path:
+        bus = self.sys / "bus" / subsystem
+        bus.mkdir(parents=True, exist_ok=True)
+        return bus
+
+    def _set_subsystem(self, node: Path, subsystem: str, driver: str | None = None) -> None:
+        bus = self._bus_path(subsystem)
+        _link(node / "subsystem", bus)
+        if driver:
+            driver_dir = bus / "drivers" / driver
+            driver_dir.mkdir(parents=True, exist_ok=True)
+            _link(node / "driver", driver_dir)
+
+    def add_usb_device(self, node: Path, name: str, **attributes: object) -> None:
+        _write(node, **attributes)
+        self._set_subsystem(node, "usb", "usb")
+        _link(self._bus_path("usb") / "devices" / name, node)
+
+    def add_disk(
+        self,
+        parent: Path,
+        udev_properties: dict[str, str],
+        size_gb: int,
+        removable: bool,
+    ) -> tuple[str, str]:
+        index = self.next_disk
+        self.next_disk += 1
+        name = _disk_name(index)
+        major, minor = _sd_dev_number(index)
+        host = self.next_scsi_host
+        self.next_scsi_host += 1
+        lun = parent / f"host{host}" / f"target{host}:0:0" / f"{host}:0:0:0"
+        _write(lun, type=0)
+        self._set_subsystem(lun, "scsi", "sd")
+        block = lun / "block" / name
+        self.add_block(block, name, f"{major}:{minor}", size_gb * 1024**3 // _SECTOR_BYTES)
+        _write(block, removable=int(removable))
+        # One partition, as a formatted drive would have.
+        partition = block / f"{name}1"
+        _write(partition, partition=1, dev=f"{major}:{minor + 1}", size=2048)
+        _link(self.sys / "class" / "block" / f"{name}1", partition)
+        self.add_udev_record(f"{major}:{minor}", udev_properties)
+        return name, f"{major}:{minor}"
+
+    def add_block(self, block: Path, name: str, dev: str, sectors: int) -> None:
+        _write(block, dev=dev, size=sectors, removable=0, ro=0)
+        _write(block / "queue", logical_block_size=_SECTOR_BYTES)
+        _link(self.sys / "class" / "block" / name, block)
+        (self.dev / name).touch()
+
+    def add_udev_record(self, dev: str, properties: dict[str, str]) -> None:
+        lines = [f"E:{key}={value}" for key, value in properties.items()]
+        (self.udev / f"b{dev}").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def build_fake_linux_tree(
+    root: Path,
+    apricorn_devices: int,
+    other_usb_devices: int = 2,
+    controllers: int = 3,
+) -> FakeLinuxTree:
+    """
+    Create ``apricorn_devices`` Apricorn USB disks spread round-robin across up to
+    three xHCI controllers and behind 7-port hubs, plus ``other_usb_devices``
+    non-Apricorn USB sticks, a SATA disk, an NVMe disk and a loop device.
+    """
+    builder = _TreeBuilder(root)
+    devices_root = builder.sys / "devices"
+    tree = FakeLinuxTree(
+        root=root,
+        sysfs_root=str(builder.sys),
+        dev_root=str(builder.dev),
+        udev_data_root=str(builder.udev),
+        pci_ids_path=str(root / "pci.ids"),
+    )
+    (root / "pci.ids").write_text(_PCI_IDS, encoding="utf-8")
+
+    # Bridges and internal storage controllers, with the IDs a real board reports.
+    for pci_path, vendor, device in (
+        ("pci0000:00/0000:00:17.0", "0x8086", "0x7ae2"),
+        ("pci0000:00/0000:00:1c.4", "0x8086", "0x7abc"),
+        ("pci0000:00/0000:00:1d.0", "0x8086", "0x7ab0"),
+        ("pci0000:00/0000:00:1d.0/0000:04:00.0", "0x144d", "0xa80a"),
+    ):
+        pci_node = devices_root / pci_path
+        _write(pci_node, vendor=vendor, device=device)
+        _link(builder._bus_path("pci") / "devices" / pci_node.name, pci_node)
+
+    # Internal disks come first, so they take sda and nvme0n1.
+    sata = devices_root / "pci0000:00" / "0000:00:17.0" / "ata1"
+    name, _ = builder.add_disk(
+        sata, {"ID_SERIAL_SHORT": "S4EVNX0R123456", "ID_BUS": "ata"}, 500, False
+    )
+    tree.other_disks.append(os.path.join(tree.dev_root, name))
+    nvme = devices_root / "pci0000:00" / "0000:00:1d.0" / "0000:04:00.0" / "nvme" / "nvme0"
+    builder.add_block(nvme / "nvme0n1", "nvme0n1", "259:0", 1000 * 1024**3 // _SECTOR_BYTES)
+    builder.add_udev_record("259:0", {"ID_SERIAL_SHORT": "PHBT0000000001", "ID_BUS": "nvme"})
+    tree.other_disks.append(os.path.join(tree.dev_root, "nvme0n1"))
+    builder.add_block(devices_root / "virtual" / "block" / "loop0", "loop0", "7:0", 2048)
+
+    controller_nodes = []
+    for bus_number, (pci_addr, pci_path, vendor, device) in enumerate(
+        _CONTROLLERS[: max(controllers, 1)], start=1
+    ):
+        pci_node = devices_root / pci_path
+        _write(pci_node, vendor=vendor, device=device, **{"class": "0x0c0330"})
+        _link(builder._bus_path("pci") / "devices" / pci_addr, pci_node)
+        root_hub = pci_node / f"usb{bus_number}"
+        builder.add_usb_device(
+            root_hub,
+            f"usb{bus_number}",
+            idVendor="1d6b",
+            idProduct="0003",
+            bDeviceClass="09",
+            busnum=bus_number,
+            devnum=1,
+            version=" 3.20",
+        )
+        controller_nodes.append((bus_number, pci_addr, root_hub))
+
+    hubs: dict[tuple[int, int], Path] = {}
+    next_devnum = dict.fromkeys((bus for bus, _, _ in controller_nodes), 2)
+
+    def _next_port(slot: int) -> tuple[int, str, Path, str]:
+        # Slot n goes to controller n % C, hub (n // C) // 7 + 1, port (n // C) % 7 + 1.
+        bus_number, pci_addr, root_hub = controller_nodes[slot % len(controller_nodes)]
+        per_bus = slot // len(controller_nodes)
+        hub_port, port = divmod(per_bus, _HUB_PORTS)
+        hub_port += 1
+        hub_name = f"{bus_number}-{hub_port}"
+        hub = hubs.get((bus_number, hub_port))
+        if hub is None:
+            hub = root_hub / hub_name
+            builder.add_usb_device(
+                hub,
+                hub_name,
+                idVendor="2109",
+                idProduct="0817",
+                bDeviceClass="09",
+                busnum=bus_number,
+                devnum=next_devnum[bus_number],
+                version=" 3.10",
+            )
+            next_devnum[bus_number] += 1
+            hubs[(bus_number, hub_port)] = hub
+        return bus_number, pci_addr, hub, f"{hub_port}.{port + 1}"
+
+    def _add_usb_disk(
+        slot: int, vendor_id: str, product_id: str, bcd: str, product: str, serial: str, size: int
+    ) -> FakeUsbDisk:
+        bus_number, pci_addr, hub, port_path = _next_port(slot)
+        name = f"{bus_number}-{port_path}"
+        devnum = next_devnum[bus_number]
+        next_devnum[bus_number] += 1
+        usb_node = hub / name
+        builder.add_usb_device(
+            usb_node,
+            name,
+            idVendor=vendor_id,
+            idProduct=product_id,
+            bcdDevice=bcd,
+            version=" 3.20",
+            manufacturer="Apricorn" if vendor_id == "0984" else "SanDisk",
+            product=product,
+            serial=serial,
+            busnum=bus_number,
+            devnum=devnum,
+        )
+        driver = "uas" if slot % 2 == 0 else "usb-storage"
+        interface = usb_node / f"{name}:1.0"
+        _write(
+            interface, bInterfaceClass="08", bInterfaceProtocol="62" if driver == "uas" else "50"
+        )
+        builder._set_subsystem(interface, "usb", driver)
+        _link(builder._bus_path("usb") / "devices" / f"{name}:1.0", interface)
+        disk_name, dev = builder.add_disk(
+            interface,
+            {
+                "ID_VENDOR_ID": vendor_id,
+                "ID_MODEL_ID": product_id,
+                "ID_SERIAL_SHORT": serial,
+                "ID_USB_DRIVER": driver,
+                "ID_PATH": f"pci-{pci_addr}-usb-0:{port_path}:1.0-scsi-0:0:0:0",
+            },
+            size,
+            True,
+        )
+        return FakeUsbDisk(
+            block_device=os.path.join(tree.dev_root, disk_name),
+            serial=serial,
+            vendor_id=vendor_id,
+            product_id=product_id,
+            bus_number=bus_number,
+            device_address=devnum,
+            port_path=port_path,
+            pci_addr=pci_addr,
+            dev=dev,
+        )
+
+    # Interleave the other sticks with the Apricorn drives, as a lab rack would be.
+    total = apricorn_devices + other_usb_devices
+    other_every = total // other_usb_devices if other_usb_devices else 0
+    apricorn_index = 0
+    other_index = 0
+    for slot in range(total):
+        is_other = apricorn_index >= apricorn_devices or (
+            other_index < other_usb_devices and (slot + 1) % other_every == 0
+        )
+        if is_other:
+            disk = _add_usb_disk(
+                slot, "0781", "5583", "0100", "Ultra Fit", f"4C53000{other_index:05d}", 64
+            )
+            tree.other_disks.append(disk.block_device)
+            other_index += 1
+            continue
+        product_id, bcd, product, size = _APRICORN_MODELS[apricorn_index % len(_APRICORN_MODELS)]
+        tree.apricorn_disks.append(
+            _add_usb_disk(
+                slot, "0984", product_id, bcd, product, f"{product_id}2{apricorn_index:07d}", size
+            )
+        )
+        apricorn_index += 1
+    return tree
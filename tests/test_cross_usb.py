@@ -432,3 +432,480 @@ def test_main_rejects_windows_poke_before_scan_when_not_admin(monkeypatch):
 
     assert exc_info.value.code == 2
     assert calls["device_manager"] == 0
+
+
+def test_main_linux_poke_reports_latency_and_failure_details(capfd, monkeypatch):
+    from usb_tool.models import PokeResult
+
+    devices = [
+        SimpleNamespace(blockDevice="/dev/sdb", driveSizeGB="16"),
+        SimpleNamespace(blockDevice="/dev/sdc", driveSizeGB="32"),
+    ]
+    results = {
+        "/dev/sdb": PokeResult(success=True, elapsed_ms=2.5, command_ms=1.0, scsi_status=0),
+        "/dev/sdc": PokeResult(
+            success=False,
+            elapsed_ms=9.0,
+            command_ms=8.0,
+            scsi_status=0x02,
+            host_status=0,
+            driver_status=0x08,
+            sense=bytes([0x70, 0x00, 0x02]),
+        ),
+    }
+
+    class _Manager:
+        def list_devices(self, expanded=False, profile_scan=False):
+            return devices
+
+        def poke_with_result(self, identifier):
+            return results[identifier]
+
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--poke", "all"])
+    monkeypatch.setattr(cross_usb, "_load_device_manager_class", lambda: _Manager)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cross_usb.main()
+
+    captured = capfd.readouterr()
+    assert exc_info.value.code == 1
+    assert "Device #1: SUCCESS (command 1.00 ms, total 2.50 ms)" in captured.out
+    assert (
+        "Device #2: FAILED (status=0x02, host=0x0000, driver=0x0008, sense=70 00 02, "
+        "command 8.00 ms, total 9.00 ms)"
+    ) in captured.out
+
+
+def test_device_manager_poke_burst_cycles_lbas_and_counts_errors():
+    from usb_tool.backend.base import AbstractBackend
+    from usb_tool.services import DeviceManager
+
+    class _Backend(AbstractBackend):
+        def __init__(self):
+            self.lbas = []
+
+        def scan_devices(self, expanded=False, profile_scan=False):
+            return []
+
+        def poke_device(self, device_identifier, lba=0):
+            self.lbas.append(lba)
+            if lba == 8:
+                raise OSError("I/O error")
+            return True
+
+        def sort_devices(self, devices):
+            return devices
+
+    backend = _Backend()
+    burst = DeviceManager(backend=backend).poke_burst("/dev/sdb", 5, lbas=(0, 8, 16))
+
+    assert backend.lbas == [0, 8, 16, 0, 8]
+    assert burst.count == 5
+    assert burst.error_count == 2
+    summary = burst.latency_summary()
+    assert summary["min"] is not None
+    assert summary["min"] <= summary["p50"] <= summary["p99"] <= summary["max"]
+
+
+def test_poke_burst_percentiles_ignore_whole_millisecond_kernel_durations():
+    from usb_tool.models import PokeBurstResult, PokeResult
+
+    burst = PokeBurstResult(
+        [
+            PokeResult(success=True, elapsed_ms=ms + 0.05, command_ms=ms, kernel_ms=0.0)
+            for ms in (0.20, 0.30, 0.40, 0.90)
+        ]
+    )
+
+    summary = burst.latency_summary()
+    assert summary["min"] == pytest.approx(0.20)
+    assert summary["p50"] == pytest.approx(0.35)
+    assert summary["max"] == pytest.approx(0.90)
+
+
+def test_device_manager_incremental_scan_rebuilds_only_changed_devices():
+    from usb_tool.backend.base import AbstractBackend
+    from usb_tool.services import DeviceManager
+
+    def _device(name, read_only=False):
+        return SimpleNamespace(
+            blockDevice=name,
+            readOnly=read_only,
+            to_dict=lambda: {"blockDevice": name, "readOnly": read_only},
+        )
+
+    class _Backend(AbstractBackend):
+        def __init__(self):
+            self.fingerprints = {"/dev/sdb": 1, "/dev/sdc": 1, "/dev/sdz": 1}
+            self.full_scans = 0
+            self.rebuilt = []
+            self.read_only = set()
+
+        def scan_devices(self, expanded=False, profile_scan=False):
+            self.full_scans += 1
+            return [_device("/dev/sdb"), _device("/dev/sdc")]
+
+        def device_fingerprints(self):
+            return dict(self.fingerprints)
+
+        def scan_block_device(self, block_device):
+            self.rebuilt.append(block_device)
+            if block_device == "/dev/sdz":
+                return None
+            return _device(block_device, block_device in self.read_only)
+
+        def poke_device(self, device_identifier, lba=0):
+            return True
+
+        def sort_devices(self, devices):
+            return sorted(devices, key=lambda device: device.blockDevice)
+
+    backend = _Backend()
+    manager = DeviceManager(backend=backend)
+
+    first = manager.list_devices_incremental()
+    idle = manager.list_devices_incremental()
+    backend.fingerprints["/dev/sdc"] = 2
+    backend.read_only.add("/dev/sdc")
+    del backend.fingerprints["/dev/sdb"]
+    backend.fingerprints["/dev/sdd"] = 1
+    changed = manager.list_devices_incremental()
+
+    assert [device.blockDevice for device in first.added] == ["/dev/sdb", "/dev/sdc"]
+    assert not idle.has_changes
+    assert [device.blockDevice for device in idle.devices] == ["/dev/sdb", "/dev/sdc"]
+    assert backend.full_scans == 1
+    assert backend.rebuilt == ["/dev/sdc", "/dev/sdd"]
+    assert [device.blockDevice for device in changed.added] == ["/dev/sdd"]
+    assert [device.blockDevice for device in changed.removed] == ["/dev/sdb"]
+    assert [device.blockDevice for device in changed.changed] == ["/dev/sdc"]
+    assert [device.blockDevice for device in changed.devices] == ["/dev/sdc", "/dev/sdd"]
+
+
+def test_device_manager_incremental_scan_reports_quarantine_changes_and_partial_records(
+    monkeypatch,
+):
+    from usb_tool.backend.base import AbstractBackend
+    from usb_tool.models import UsbDeviceInfo
+    from usb_tool.services import DeviceManager
+
+    class _Backend(AbstractBackend):
+        def __init__(self):
+            self.rebuilt = []
+            self.unknown = True
+
+        def scan_devices(self, expanded=False, profile_scan=False):
+            return [self.scan_block_device("/dev/sdb")]
+
+        def device_fingerprints(self):
+            return {"/dev/sdb": 1}
+
+        def scan_block_device(self, block_device):
+            self.rebuilt.append(block_device)
+            device = UsbDeviceInfo(
+                bcdUSB=3.0,
+                idVendor="0984",
+                idProduct="1407",
+                bcdDevice="0502",
+                iManufacturer="Apricorn",
+                iProduct="Secure Key 3.0",
+                iSerial="SER1",
+                driveSizeGB="16",
+                mediaType="Removable Media",
+            )
+            device.blockDevice = block_device
+            if self.unknown:
+                device.unknownFields = ["scbPartNumber"]
+            return device
+
+        def poke_device(self, device_identifier, lba=0):
+            return True
+
+        def sort_devices(self, devices):
+            return devices
+
+    quarantined = []
+
+    def _mark(self, device):
+        device.quarantine = {"failures": 1} if quarantined else None
+        return device
+
+    monkeypatch.setattr(DeviceManager, "_mark_quarantine", _mark)
+    backend = _Backend()
+    manager = DeviceManager(backend=backend)
+
+    manager.list_devices_incremental(deadline_s=5.0)
+    # The first record was cut short by the deadline, so it is rebuilt.
+    backend.unknown = False
+    rebuilt = manager.list_devices_incremental()
+    quarantined.append(True)
+    marked = manager.list_devices_incremental()
+
+    assert backend.rebuilt == ["/dev/sdb", "/dev/sdb"]
+    assert [device.blockDevice for device in rebuilt.changed] == ["/dev/sdb"]
+    assert [device.quarantine for device in marked.changed] == [{"failures": 1}]
+
+
+def test_device_manager_incremental_scan_needs_scan_block_device_for_fingerprints():
+    from usb_tool.backend.base import AbstractBackend
+    from usb_tool.services import DeviceManager
+
+    class _Backend(AbstractBackend):
+        full_scans = 0
+
+        def scan_devices(self, expanded=False, profile_scan=False):
+            self.full_scans += 1
+            return [SimpleNamespace(blockDevice="/dev/sdb", to_dict=lambda: {})]
+
+        def device_fingerprints(self):
+            return {"/dev/sdb": 1}
+
+        def poke_device(self, device_identifier, lba=0):
+            return True
+
+        def sort_devices(self, devices):
+            return devices
+
+    backend = _Backend()
+    manager = DeviceManager(backend=backend)
+    manager.list_devices_incremental()
+    manager.list_devices_incremental()
+
+    assert backend.full_scans == 2
+
+
+def test_main_poke_burst_prints_latency_percentiles(capfd, monkeypatch):
+    from usb_tool.models import PokeBurstResult, PokeResult
+
+    calls = []
+
+    class _Manager:
+        def list_devices(self, expanded=False, profile_scan=False):
+            return [SimpleNamespace(blockDevice="/dev/sdb", driveSizeGB="16")]
+
+        def poke_burst(self, identifier, count, lbas, interval_ms):
+            calls.append((identifier, count, lbas, interval_ms))
+            return PokeBurstResult(
+                [PokeResult(success=True, command_ms=float(ms)) for ms in range(1, count + 1)]
+            )
+
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+    monkeypatch.setattr(
+        cross_usb.sys,
+        "argv",
+        ["usb", "-p", "1", "--poke-count", "100", "--poke-lba", "0,0x800", "--poke-interval", "2"],
+    )
+    monkeypatch.setattr(cross_usb, "_load_device_manager_class", lambda: _Manager)
+
+    cross_usb.main()
+
+    captured = capfd.readouterr()
+    assert calls == [("/dev/sdb", 100, (0, 0x800), 2.0)]
+    assert (
+        "Device #1: 100 commands, 0 errors; latency ms "
+        "min 1.00 / p50 50.50 / p95 95.05 / p99 99.01 / max 100.00"
+    ) in captured.out
+
+
+def test_main_poke_burst_reports_errors_like_single_pokes(capfd, monkeypatch):
+    class _Manager:
+        def list_devices(self, expanded=False, profile_scan=False):
+            return [SimpleNamespace(blockDevice="/dev/sdb", driveSizeGB="16")]
+
+        def poke_burst(self, identifier, count, lbas, interval_ms):
+            raise PermissionError("Permission denied")
+
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+    # An explicit default value still selects burst mode.
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "-p", "1", "--poke-lba", "0"])
+    monkeypatch.setattr(cross_usb, "_load_device_manager_class", lambda: _Manager)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cross_usb.main()
+
+    assert exc_info.value.code == 1
+    assert "Device #1: ERROR (Permission denied)" in capfd.readouterr().out
+
+
+def test_main_rejects_poke_burst_options_without_poke(monkeypatch):
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--poke-count", "5"])
+
+    with pytest.raises(SystemExit) as exc_info:
+        cross_usb.main()
+
+    assert exc_info.value.code == 2
+
+
+def test_watch_devices_streams_arrival_change_and_departure_events(capfd, monkeypatch):
+    from usb_tool.models import ScanDiff
+
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+
+    def _device(size, bcd_usb=3.2):
+        return SimpleNamespace(
+            blockDevice="/dev/sdb",
+            to_dict=lambda: {
+                "bcdUSB": bcd_usb,
+                "iSerial": "AAA",
+                "blockDevice": "/dev/sdb",
+                "driveSizeGB": size,
+                "readOnly": False,
+                "bridgeFW": "0502",
+            },
+        )
+
+    locked, unlocked, slow = _device("N/A (OOB Mode)"), _device("16"), _device("16", 2.0)
+    diffs = iter(
+        [
+            ScanDiff(devices=[locked], added=[locked]),
+            ScanDiff(devices=[locked]),
+            ScanDiff(devices=[unlocked], changed=[unlocked]),
+            ScanDiff(devices=[slow], changed=[slow]),
+            ScanDiff(removed=[slow]),
+        ]
+    )
+    manager = SimpleNamespace(
+        list_devices_incremental=lambda expanded=False, deadline_s=None: next(diffs)
+    )
+    monkeypatch.setattr("time.sleep", lambda _seconds: None)
+
+    cross_usb._watch_devices(manager, interval=1.0, max_polls=5)
+
+    events = [json.loads(line) for line in capfd.readouterr().out.splitlines()]
+    assert [event["event"] for event in events] == ["arrival", "change", "change", "departure"]
+    assert events[0]["device"]["deviceMode"] == "OOB Mode"
+    assert "bridgeFW" not in events[0]["device"]
+    assert events[1]["changes"]["deviceMode"] == {"old": "OOB Mode", "new": "Unlocked"}
+    assert events[1]["changes"]["readOnly"] == {"old": None, "new": False}
+    assert events[2]["changes"] == {"bcdUSB": {"old": 3.2, "new": 2.0}}
+    assert events[3]["key"] == "/dev/sdb"
+
+
+def test_main_rejects_watch_with_json(monkeypatch):
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--watch", "--json"])
+
+    with pytest.raises(SystemExit):
+        cross_usb.main()
+
+
+@pytest.mark.parametrize(
+    "flags", [["--ndjson"], ["--profile-scan"], ["--poke-count", "5"], ["--poke-lba", "0"]]
+)
+def test_main_rejects_watch_with_output_flags_it_would_ignore(capfd, monkeypatch, flags):
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--watch", *flags])
+
+    with pytest.raises(SystemExit) as exc_info:
+        cross_usb.main()
+
+    assert exc_info.value.code == 2
+    assert f"--watch cannot be combined with {flags[0]}" in capfd.readouterr().err
+
+
+@pytest.mark.parametrize("interval", ["1", "2.5"])
+def test_main_rejects_watch_interval_without_watch(capfd, monkeypatch, interval):
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--watch-interval", interval])
+
+    with pytest.raises(SystemExit) as exc_info:
+        cross_usb.main()
+
+    assert exc_info.value.code == 2
+    assert "--watch-interval requires --watch" in capfd.readouterr().err
+
+
+def test_main_watch_bounds_each_rescan_with_the_deadline(monkeypatch):
+    watched = []
+
+    class _Manager:
+        def close(self):
+            pass
+
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+    monkeypatch.setattr(cross_usb, "_load_device_manager_class", lambda: _Manager)
+    monkeypatch.setattr(
+        cross_usb,
+        "_watch_devices",
+        lambda manager, interval, deadline_s=None: watched.append((interval, deadline_s)),
+    )
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--watch", "--deadline", "2.5"])
+
+    cross_usb.main()
+
+    assert watched == [(1.0, 2.5)]
+
+
+def test_main_trace_write_failure_keeps_the_scan_error(capfd, monkeypatch, tmp_path):
+    class _Manager:
+        def list_devices(self, expanded=False, profile_scan=False):
+            raise RuntimeError("scan exploded")
+
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+    monkeypatch.setattr(cross_usb, "_load_device_manager_class", lambda: _Manager)
+    trace_path = tmp_path / "missing-dir" / "trace.json"
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--trace", str(trace_path)])
+
+    with pytest.raises(SystemExit) as exc_info:
+        cross_usb.main()
+
+    assert exc_info.value.code == 1
+    captured = capfd.readouterr()
+    assert "Device scan failed." in captured.err
+    assert f"Failed to write scan trace to {trace_path}" in captured.err
+
+
+def test_main_ndjson_writes_one_flushed_line_per_device(capfd, monkeypatch):
+    monkeypatch.setattr(cross_usb, "_SYSTEM", "linux")
+    written = []
+
+    def _device(name):
+        return SimpleNamespace(
+            to_dict=lambda: {"blockDevice": name, "driveSizeGB": "16", "bridgeFW": "0502"}
+        )
+
+    class _Manager:
+        def iter_devices(self, expanded=False, profile_scan=False):
+            assert expanded is True
+            yield _device("/dev/sdc")
+            # The first record is already on stdout while later probes run.
+            written.append(capfd.readouterr().out)
+            yield _device("/dev/sdb")
+
+    monkeypatch.setattr(cross_usb, "_load_device_manager_class", lambda: _Manager)
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--ndjson"])
+
+    cross_usb.main()
+
+    assert json.loads(written[0]) == {
+        "blockDevice": "/dev/sdc",
+        "driveSizeGB": "16",
+        "deviceMode": "Unlocked",
+    }
+    assert json.loads(capfd.readouterr().out)["blockDevice"] == "/dev/sdb"
+
+
+def test_device_manager_iter_devices_sorts_only_on_request():
+    from usb_tool.backend.base import AbstractBackend
+    from usb_tool.services import DeviceManager
+
+    class _Backend(AbstractBackend):
+        def iter_devices(self, expanded=False, profile_scan=False):
+            yield SimpleNamespace(blockDevice="/dev/sdc")
+            yield SimpleNamespace(blockDevice="/dev/sdb")
+
+        def scan_devices(self, expanded=False, profile_scan=False):
+            return list(self.iter_devices())
+
+        def poke_device(self, device_identifier, lba=0):
+            return True
+
+        def sort_devices(self, devices):
+            return sorted(devices, key=lambda device: device.blockDevice)
+
+    manager = DeviceManager(backend=_Backend())
+
+    assert [device.blockDevice for device in manager.iter_devices()] == ["/dev/sdc", "/dev/sdb"]
+    assert [device.blockDevice for device in manager.iter_devices(sort=True)] == [
+        "/dev/sdb",
+        "/dev/sdc",
+    ]
@@ -0,0 +1,191 @@
+"""Unit tests for the inventory daemon and its client."""
+
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+if not hasattr(socket, "AF_UNIX"):
+    pytest.skip("Unix domain sockets are not available", allow_module_level=True)
+
+from usb_tool import cli as cross_usb
+from usb_tool.daemon import DaemonClient, InventoryDaemon, device_from_dict
+from usb_tool.models import PokeBurstResult, PokeResult, UsbDeviceInfo
+
+
+def _device(block_device: str, serial: str) -> UsbDeviceInfo:
+    device = UsbDeviceInfo(
+        bcdUSB=3.2,
+        idVendor="0984",
+        idProduct="1407",
+        bcdDevice="0502",
+        iManufacturer="Apricorn",
+        iProduct="Secure Key 3.0",
+        iSerial=serial,
+        driveSizeGB="16",
+        mediaType="Removable Media",
+        blockDevice=block_device,
+    )
+    device.mcuFW = "1.2.3"
+    return device
+
+
+class _FakeManager:
+    def __init__(self, devices):
+        self.devices = devices
+        self.scans = 0
+        self.pokes = []
+        self.active_pokes = 0
+        self.max_active_pokes = 0
+
+    def subscribe(self, callback, expanded=False, device_lock=None):
+        raise NotImplementedError
+
+    def list_devices(self, expanded=False, profile_scan=False):
+        self.scans += 1
+        return list(self.devices)
+
+    def poke_with_result(self, device_identifier, lba=0):
+        self.active_pokes += 1
+        self.max_active_pokes = max(self.max_active_pokes, self.active_pokes)
+        time.sleep(0.01)
+        self.active_pokes -= 1
+        self.pokes.append((device_identifier, lba))
+        return PokeResult(success=True, elapsed_ms=2.0, command_ms=1.5, scsi_status=0)
+
+    def poke_burst(self, device_identifier, count, lbas=(0,), interval_ms=0.0):
+        return PokeBurstResult(
+            [
+                PokeResult(success=False, elapsed_ms=3.0, sense=b"\x70\x00\x02", error="x")
+                for _ in range(count)
+            ]
+        )
+
+
+@pytest.fixture
+def socket_path():
+    # AF_UNIX paths are limited to ~100 bytes, so avoid pytest's long tmp_path.
+    directory = tempfile.mkdtemp(prefix="usbd-")
+    yield f"{directory}/d.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running_daemon(socket_path):
+    manager = _FakeManager([_device("/dev/sdb", "AAA"), _device("/dev/sdc", "BBB")])
+    daemon = InventoryDaemon(manager, socket_path=socket_path, refresh_interval=60)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    client = DaemonClient(socket_path, timeout=5)
+    deadline = time.monotonic() + 5
+    while not client.ping():
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield daemon, manager
+    daemon.shutdown()
+    thread.join(timeout=5)
+
+
+def test_handle_request_answers_list_get_and_unknown_ops():
+    daemon = InventoryDaemon(_FakeManager([_device("/dev/sdb", "AAA")]), socket_path="unused")
+    daemon.refresh()
+
+    listed = daemon.handle_request({"op": "list"})
+    assert listed["ok"] is True
+    assert listed["devices"][0]["blockDevice"] == "/dev/sdb"
+    assert daemon.handle_request({"op": "get", "serial": "AAA"})["device"]["iSerial"] == "AAA"
+    assert daemon.handle_request({"op": "get", "index": 2}) == {
+        "ok": False,
+        "error": "device not found",
+    }
+    assert daemon.handle_request({"op": "reboot"})["ok"] is False
+
+
+def test_client_round_trip_serves_inventory_without_rescanning(running_daemon, socket_path):
+    _daemon, manager = running_daemon
+    client = DaemonClient(socket_path, timeout=5)
+
+    first = client.list_devices()
+    second = client.list_devices()
+
+    assert [device.blockDevice for device in first] == ["/dev/sdb", "/dev/sdc"]
+    assert second[1].mcuFW == "1.2.3"
+    assert manager.scans == 1
+    assert client.get_device(blockDevice="/dev/sdc").iSerial == "BBB"
+
+
+def test_daemon_serializes_concurrent_pokes(running_daemon, socket_path):
+    _daemon, manager = running_daemon
+    results = []
+
+    def _poke():
+        results.append(DaemonClient(socket_path, timeout=5).poke_with_result("/dev/sdb", 7))
+
+    threads = [threading.Thread(target=_poke) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(results) == 6
+    assert all(result.success and result.command_ms == 1.5 for result in results)
+    assert manager.pokes == [("/dev/sdb", 7)] * 6
+    assert manager.max_active_pokes == 1
+
+    burst = DaemonClient(socket_path, timeout=5).poke_burst("/dev/sdb", 3, (0, 8))
+    assert burst.count == 3
+    assert burst.error_count == 3
+    assert burst.results[0].sense == b"\x70\x00\x02"
+
+
+def test_device_from_dict_keeps_platform_specific_fields():
+    device = device_from_dict({"iSerial": "AAA", "bcdUSB": 3.2, "SCSIDevice": False})
+
+    assert device.iSerial == "AAA"
+    assert device.SCSIDevice is False
+    assert device.driverTransport == "Unknown"
+
+
+def test_main_via_daemon_lists_from_daemon(capfd, monkeypatch, running_daemon, socket_path):
+    monkeypatch.setattr(cross_usb, "_SYSTEM", sys.platform)
+    monkeypatch.setattr(
+        cross_usb,
+        "_load_device_manager_class",
+        lambda: pytest.fail("local scan should not run when the daemon answers"),
+    )
+    monkeypatch.setattr(
+        cross_usb.sys, "argv", ["usb", "--via-daemon", "--socket", socket_path, "--json"]
+    )
+
+    cross_usb.main()
+
+    out = capfd.readouterr().out
+    assert '"iSerial": "AAA"' in out
+    assert '"iSerial": "BBB"' in out
+
+
+def test_main_via_daemon_falls_back_to_local_scan(capfd, monkeypatch, socket_path):
+    manager = _FakeManager([_device("/dev/sdd", "CCC")])
+    monkeypatch.setattr(cross_usb, "_SYSTEM", sys.platform)
+    monkeypatch.setattr(cross_usb, "_load_device_manager_class", lambda: lambda: manager)
+    monkeypatch.setattr(
+        cross_usb.sys, "argv", ["usb", "--via-daemon", "--socket", socket_path, "--json"]
+    )
+
+    cross_usb.main()
+
+    captured = capfd.readouterr()
+    assert "not reachable" in captured.err
+    assert '"iSerial": "CCC"' in captured.out
+    assert manager.scans == 1
+
+
+def test_main_rejects_serve_with_json(monkeypatch):
+    monkeypatch.setattr(cross_usb.sys, "argv", ["usb", "--serve", "--json"])
+
+    with pytest.raises(SystemExit):
+        cross_usb.main()
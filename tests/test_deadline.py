@@ -0,0 +1,161 @@
+"""Tests for the scan deadline budget."""
+
+import threading
+import time
+
+import pytest
+
+from usb_tool import deadline
+from usb_tool.backend.base import AbstractBackend
+from usb_tool.deadline import (
+    HELPER_TIMEOUT_S,
+    ScanDeadline,
+    call_before_deadline,
+    get_deadline,
+    scan_deadline,
+    with_current_deadline,
+)
+from usb_tool.models import UsbDeviceInfo
+from usb_tool.services import DeviceManager
+
+
+def test_default_deadline_is_unbounded_but_caps_helpers():
+    active = get_deadline()
+    assert not active.bounded
+    assert active.remaining() is None
+    assert not active.expired()
+    assert active.timeout() == HELPER_TIMEOUT_S
+    assert active.timeout(None) is None
+
+
+def test_bounded_deadline_shrinks_stage_timeouts_and_expires(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(deadline.time, "monotonic", lambda: clock[0])
+    budget = ScanDeadline(5.0)
+    assert budget.timeout() == 5.0
+    assert budget.timeout(2.0) == 2.0
+    clock[0] += 4.5
+    assert budget.remaining() == pytest.approx(0.5)
+    clock[0] += 1.0
+    assert budget.expired()
+    assert budget.remaining() == 0.0
+    # An expired budget still hands out a short positive timeout, never 0.
+    assert 0 < budget.timeout() < 0.1
+
+
+def test_scan_deadline_context_restores_previous_deadline():
+    before = get_deadline()
+    with scan_deadline(3.0) as active:
+        assert get_deadline() is active
+        assert active.bounded
+        with scan_deadline(None) as inner:
+            assert inner is active
+    assert get_deadline() is before
+
+
+def test_call_before_deadline_abandons_a_stuck_call():
+    release = threading.Event()
+    with scan_deadline(0.05):
+        start = time.monotonic()
+        finished, result = call_before_deadline(release.wait, 5)
+        elapsed = time.monotonic() - start
+        assert (finished, result) == (False, None)
+        assert call_before_deadline(lambda: "late") == (False, None)
+    release.set()
+    assert elapsed < 1.0
+    with scan_deadline(5.0):
+        assert call_before_deadline(lambda value: value * 2, 21) == (True, 42)
+        with pytest.raises(OSError):
+            call_before_deadline(_raise_os_error)
+
+
+def _raise_os_error() -> None:
+    raise OSError("device went away")
+
+
+class _DeadlineRecordingBackend(AbstractBackend):
+    def __init__(self) -> None:
+        self.seen: list[ScanDeadline] = []
+
+    def scan_devices(self, expanded: bool = False, profile_scan: bool = False):
+        self.seen.append(get_deadline())
+        return [_device("B"), _device("A")]
+
+    def iter_devices(self, expanded: bool = False, profile_scan: bool = False):
+        self.seen.append(get_deadline())
+        yield _device("A")
+
+    def poke_device(self, device_identifier, lba=0):
+        return True
+
+    def sort_devices(self, devices):
+        return sorted(devices, key=lambda device: device.iSerial)
+
+
+def _device(serial: str) -> UsbDeviceInfo:
+    return UsbDeviceInfo(
+        bcdUSB=3.0,
+        idVendor="0984",
+        idProduct="1407",
+        bcdDevice="0502",
+        iManufacturer="Apricorn",
+        iProduct="Secure Key 3.0",
+        iSerial=serial,
+        driveSizeGB="16",
+        mediaType="Removable Media",
+    )
+
+
+def test_device_manager_scans_under_the_requested_deadline():
+    backend = _DeadlineRecordingBackend()
+    manager = DeviceManager(backend=backend)
+
+    devices = manager.list_devices(deadline_s=2.5)
+    list(manager.iter_devices(deadline_s=2.5))
+    manager.list_devices()
+
+    assert [device.iSerial for device in devices] == ["A", "B"]
+    assert [active.budget_s for active in backend.seen] == [2.5, 2.5, None]
+    assert not get_deadline().bounded
+
+
+def test_iter_devices_never_holds_the_deadline_across_a_yield():
+    class _TwoDeviceBackend(_DeadlineRecordingBackend):
+        def iter_devices(self, expanded: bool = False, profile_scan: bool = False):
+            self.seen.append(get_deadline())
+            yield _device("A")
+            self.seen.append(get_deadline())
+            yield _device("B")
+
+    backend = _TwoDeviceBackend()
+    consumer_saw = []
+
+    for _device_info in DeviceManager(backend=backend).iter_devices(deadline_s=2.5):
+        consumer_saw.append(get_deadline().bounded)
+
+    assert consumer_saw == [False, False]
+    assert backend.seen[0] is backend.seen[1]
+    assert backend.seen[0].budget_s == 2.5
+
+
+def test_deadline_is_per_thread_unless_carried_over():
+    seen = {}
+
+    def _record(name):
+        seen[name] = get_deadline().budget_s
+
+    with scan_deadline(1.5):
+        plain = threading.Thread(target=_record, args=("plain",))
+        carried = threading.Thread(target=with_current_deadline(_record), args=("carried",))
+        for thread in (plain, carried):
+            thread.start()
+            thread.join()
+
+    assert seen == {"plain": None, "carried": 1.5}
+
+
+def test_unknown_fields_are_omitted_until_a_deadline_cuts_a_scan_short():
+    device = _device("A")
+    assert "unknownFields" not in device.to_dict()
+    device.unknownFields = ["mcuFW", "scbPartNumber"]
+    assert device.to_dict()["unknownFields"] == ["mcuFW", "scbPartNumber"]
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from usb_tool import device_version
+from usb_tool.services import populate_device_version
+from usb_tool.version_cache import VersionCache, default_cache_path
+
+_VERSION_INFO = {
+    "scbPartNumber": "21-0010",
+    "hardwareVersion": "00",
+    "modelID": "00",
+    "mcuFW": "1.0.0",
+    "bridgeFW": "0463",
+}
+
+
+@pytest.fixture
+def query_calls(monkeypatch):
+    calls = []
+
+    def _fake_query(*args, **kwargs):
+        calls.append(args)
+        return device_version.DeviceVersionInfo(
+            scb_part_number="21-0010",
+            hardware_version="00",
+            model_id="00",
+            mcu_fw=(1, 0, 0),
+            bridge_fw="0463",
+        )
+
+    monkeypatch.setattr("usb_tool.services.platform.system", lambda: "Linux")
+    monkeypatch.setattr("usb_tool.services.query_device_version", _fake_query)
+    return calls
+
+
+def test_populate_device_version_reuses_cached_payload(query_calls):
+    first = populate_device_version(
+        0x0984, 0x1400, "SER1", device_path="/dev/sda", bcd_device="0463"
+    )
+    profile: dict = {}
+    second = populate_device_version(
+        0x0984, 0x1400, "SER1", device_path="/dev/sda", bcd_device="0463", profile=profile
+    )
+
+    assert first == second == _VERSION_INFO
+    assert len(query_calls) == 1
+    assert profile["version_cache"] == "hit"
+    assert default_cache_path().is_file()
+
+
+def test_populate_device_version_reprobes_when_bcd_device_or_identity_changes(query_calls):
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0463", identity="usb:1-4")
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0502", identity="usb:1-4")
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0502", identity="usb:1-9")
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0502", identity="usb:1-9")
+
+    assert len(query_calls) == 3
+
+
+def test_populate_device_version_skips_cache_without_bcd_device(query_calls):
+    populate_device_version(0x0984, 0x1400, "SER1")
+    populate_device_version(0x0984, 0x1400, "SER1")
+
+    assert len(query_calls) == 2
+    assert not default_cache_path().exists()
+
+
+def test_populate_device_version_does_not_cache_empty_payload(monkeypatch):
+    calls = []
+
+    def _empty_query(*args, **kwargs):
+        calls.append(args)
+        return device_version.DeviceVersionInfo(scb_part_number="N/A", mcu_fw=(None, None, None))
+
+    monkeypatch.setattr("usb_tool.services.platform.system", lambda: "Linux")
+    monkeypatch.setattr("usb_tool.services.query_device_version", _empty_query)
+
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0463")
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0463")
+
+    assert len(calls) == 2
+
+
+def test_version_cache_can_be_disabled(monkeypatch, query_calls):
+    monkeypatch.setenv("USB_TOOL_VERSION_CACHE", "0")
+
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0463")
+    populate_device_version(0x0984, 0x1400, "SER1", bcd_device="0463")
+
+    assert len(query_calls) == 2
+
+
+def test_version_cache_evicts_least_recently_updated(tmp_path):
+    cache = VersionCache(tmp_path / "cache.json", max_entries=2)
+    for serial in ("A", "B", "C"):
+        cache.put(0x0984, 0x1400, serial, "0463", _VERSION_INFO)
+
+    reloaded = VersionCache(tmp_path / "cache.json", max_entries=2)
+    assert len(reloaded) == 2
+    assert reloaded.get(0x0984, 0x1400, "A", "0463") is None
+    assert reloaded.get(0x0984, 0x1400, "C", "0463") == _VERSION_INFO
+
+
+def test_version_cache_writes_atomically_and_tolerates_corruption(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json", encoding="utf-8")
+    cache = VersionCache(path)
+
+    assert cache.get(0x0984, 0x1400, "A", "0463") is None
+    cache.put(0x0984, 0x1400, "A", "0463", _VERSION_INFO)
+
+    assert json.loads(path.read_text(encoding="utf-8"))["version"] == 1
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["cache.json", "cache.json.lock"]
+
+
+def test_version_cache_keeps_entries_written_by_other_processes(tmp_path):
+    path = tmp_path / "cache.json"
+    daemon = VersionCache(path)
+    cli = VersionCache(path)
+    assert daemon.get(0x0984, 0x1400, "A", "0463") is None
+
+    # Each instance stands in for a separate process sharing the cache file.
+    cli.put(0x0984, 0x1400, "A", "0463", _VERSION_INFO)
+    daemon.put(0x0984, 0x1400, "B", "0463", _VERSION_INFO)
+
+    assert daemon.get(0x0984, 0x1400, "A", "0463") == _VERSION_INFO
+    assert cli.get(0x0984, 0x1400, "B", "0463") == _VERSION_INFO
+    assert len(VersionCache(path)) == 2
@@ -0,0 +1,99 @@
+"""Cold-start budget for the `usb` entry point (see benchmarks/import_time_budget.json)."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_BUDGET = json.loads(
+    (_REPO_ROOT / "benchmarks" / "import_time_budget.json").read_text(encoding="utf-8")
+)
+_RUNS = 5
+# Wall-clock budgets are noisy on shared runners; the module checks always run.
+_TIMING_ENABLED = os.getenv("USB_TOOL_IMPORT_BUDGET") == "1"
+
+
+def _scenario_code(argv: list[str] | None) -> str:
+    lines = ["import sys", "_before = set(sys.modules)", "import usb_tool.cli as cli"]
+    if argv is not None:
+        lines += [
+            f"sys.argv = ['usb', *{argv!r}]",
+            "try:",
+            "    cli.main()",
+            "except SystemExit:",
+            "    pass",
+        ]
+    lines.append("sys.stderr.write('loaded:' + ','.join(sorted(set(sys.modules) - _before)))")
+    return "\n".join(lines)
+
+
+def _run_importtime(code: str) -> tuple[dict[str, float], set[str]]:
+    env = dict(os.environ)
+    existing_pythonpath = env.get("PYTHONPATH", "")
+    repo_src = str(_REPO_ROOT / "src")
+    env["PYTHONPATH"] = (
+        f"{repo_src}{os.pathsep}{existing_pythonpath}" if existing_pythonpath else repo_src
+    )
+    # Installed entry points run with cached bytecode, so measure that way too.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    top_level: dict[str, float] = {}
+    loaded: set[str] = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("loaded:"):
+            loaded = set(filter(None, line.removeprefix("loaded:").split(",")))
+            continue
+        parts = line.removeprefix("import time:").split("|")
+        if not line.startswith("import time:") or len(parts) != 3:
+            continue
+        cumulative, name = parts[1].strip(), parts[2]
+        # Nested imports are indented and already counted in their parent's cumulative time.
+        if cumulative.isdigit() and not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative) / 1000.0
+    return top_level, loaded
+
+
+def _startup_cost_ms(code: str) -> tuple[float, set[str]]:
+    baseline, _ = _run_importtime("pass")
+    best = float("inf")
+    loaded: set[str] = set()
+    for _ in range(_RUNS):
+        top_level, loaded = _run_importtime(code)
+        cost = sum(ms for name, ms in top_level.items() if name not in baseline)
+        best = min(best, cost)
+    return best, loaded
+
+
+@pytest.mark.parametrize("scenario_name", sorted(_BUDGET["scenarios"]))
+def test_usb_entry_point_imports_only_what_it_needs(scenario_name):
+    scenario = _BUDGET["scenarios"][scenario_name]
+    _, loaded = _run_importtime(_scenario_code(scenario["argv"]))
+
+    eager = sorted(
+        module
+        for module in scenario["forbidden_modules"]
+        if any(name == module or name.startswith(module + ".") for name in loaded)
+    )
+    assert not eager, f"{scenario_name} imports modules it does not need: {eager}"
+
+
+@pytest.mark.skipif(not _TIMING_ENABLED, reason="set USB_TOOL_IMPORT_BUDGET=1 to time imports")
+@pytest.mark.parametrize("scenario_name", sorted(_BUDGET["scenarios"]))
+def test_usb_entry_point_stays_within_import_budget(scenario_name):
+    scenario = _BUDGET["scenarios"][scenario_name]
+    cost_ms, _ = _startup_cost_ms(_scenario_code(scenario["argv"]))
+
+    limit_ms = scenario["budget_ms"] * _BUDGET["threshold_multiplier"]
+    assert cost_ms <= limit_ms, (
+        f"{scenario_name} import cost {cost_ms:.2f}ms exceeds budget {limit_ms:.2f}ms"
+    )
@@ -0,0 +1,291 @@
+"""Unit tests for the Linux uevent hotplug monitor."""
+
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+import pytest
+
+# Skip this entire module if not on Linux
+if sys.platform != "linux":
+    pytest.skip("Linux only tests", allow_module_level=True)
+
+from usb_tool.backend import linux_hotplug
+from usb_tool.backend.linux_hotplug import (
+    UEVENT_KERNEL_GROUP,
+    UEVENT_UDEV_GROUP,
+    LinuxHotplugMonitor,
+    UEvent,
+    parse_uevent,
+)
+from usb_tool.daemon import InventoryDaemon
+from usb_tool.models import PokeResult, UsbDeviceInfo
+from usb_tool.services import DeviceManager
+
+
+def _device(block_device: str, serial: str, read_only: bool = False) -> UsbDeviceInfo:
+    device = UsbDeviceInfo(
+        bcdUSB=3.2,
+        idVendor="0984",
+        idProduct="1407",
+        bcdDevice="0502",
+        iManufacturer="Apricorn",
+        iProduct="Secure Key 3.0",
+        iSerial=serial,
+        driveSizeGB="16",
+        mediaType="Removable Media",
+    )
+    device.blockDevice = block_device
+    device.readOnly = read_only
+    return device
+
+
+class _FakeBackend:
+    def __init__(self, devices):
+        self.devices = {device.blockDevice: device for device in devices}
+        self.usb_paths = {}
+        self.rebuilt = []
+        self.scans = []
+
+    def scan_devices(self, expanded=False, profile_scan=False):
+        self.scans.append(expanded)
+        return list(self.devices.values())
+
+    def scan_block_device(self, block_device):
+        self.rebuilt.append(block_device)
+        return self.devices.get(block_device)
+
+    def get_usb_device_path(self, block_device):
+        return self.usb_paths.get(block_device, "")
+
+    def sort_devices(self, devices):
+        return sorted(devices, key=lambda device: device.blockDevice)
+
+    def create_hotplug_monitor(self, expanded=False, device_lock=None):
+        return None
+
+
+def _block_event(action: str, name: str) -> UEvent:
+    return UEvent(
+        action=action,
+        devpath=f"/devices/pci0000:00/usb2/2-1/2-1:1.0/host0/target0:0:0/0:0:0:0/block/{name}",
+        subsystem="block",
+        devtype="disk",
+        devname=name,
+    )
+
+
+def test_parse_uevent_reads_kernel_datagram():
+    payload = (
+        b"add@/devices/pci0000:00/usb2/2-1/block/sdb\0ACTION=add\0"
+        b"DEVPATH=/devices/pci0000:00/usb2/2-1/block/sdb\0SUBSYSTEM=block\0"
+        b"DEVNAME=sdb\0DEVTYPE=disk\0SEQNUM=4242\0"
+    )
+
+    event = parse_uevent(payload)
+
+    assert event is not None
+    assert event.action == "add"
+    assert event.subsystem == "block"
+    assert event.devtype == "disk"
+    assert event.block_device() == "/dev/sdb"
+    assert event.sysfs_path() == "/sys/devices/pci0000:00/usb2/2-1/block/sdb"
+    assert event.properties["SEQNUM"] == "4242"
+
+
+def _udev_datagram(properties: bytes) -> bytes:
+    header_size = 40
+    return (
+        b"libudev\0"
+        + (0xFEEDCAFE).to_bytes(4, "big")
+        + struct.pack("=III", header_size, header_size, len(properties))
+        + bytes(header_size - 24)
+        + properties
+    )
+
+
+def test_parse_uevent_reads_udev_rebroadcast():
+    payload = _udev_datagram(
+        b"ACTION=add\0DEVPATH=/devices/pci0000:00/usb2/2-1/block/sdb\0"
+        b"SUBSYSTEM=block\0DEVNAME=/dev/sdb\0DEVTYPE=disk\0ID_SERIAL_SHORT=SERIAL123\0"
+    )
+
+    event = parse_uevent(payload)
+
+    assert event is not None
+    assert event.action == "add"
+    assert event.block_device() == "/dev/sdb"
+    assert event.block_device("/tmp/dev") == "/tmp/dev/sdb"
+    assert event.properties["ID_SERIAL_SHORT"] == "SERIAL123"
+
+
+def test_parse_uevent_rejects_truncated_udev_header():
+    assert parse_uevent(b"libudev\0\xfe\xed\xca\xfe") is None
+    assert parse_uevent(_udev_datagram(b"")[:-1] + b"\xff") is None
+
+
+@pytest.mark.parametrize(
+    ("udev_running", "group"), [(True, UEVENT_UDEV_GROUP), (False, UEVENT_KERNEL_GROUP)]
+)
+def test_monitor_listens_to_udev_when_it_is_running(tmp_path, monkeypatch, udev_running, group):
+    (tmp_path / "data").mkdir()
+    if udev_running:
+        (tmp_path / "control").touch()
+    backend = _FakeBackend([])
+    backend._udev_data_root = str(tmp_path / "data")
+    bound = []
+
+    def _open(group):
+        bound.append(group)
+        raise OSError("no netlink in tests")
+
+    monkeypatch.setattr("usb_tool.backend.linux_hotplug.open_uevent_socket", _open)
+    with pytest.raises(OSError):
+        LinuxHotplugMonitor(backend).start()
+
+    assert bound == [group]
+
+
+def test_resync_keeps_the_expanded_flag():
+    backend = _FakeBackend([_device("/dev/sda", "AAA")])
+    monitor = LinuxHotplugMonitor(backend, expanded=True)
+
+    monitor.resync()
+    monitor._safe_resync()
+
+    assert backend.scans == [True, True]
+
+
+def test_monitor_updates_only_the_device_an_event_touches():
+    first = _device("/dev/sda", "AAA")
+    backend = _FakeBackend([first])
+    monitor = LinuxHotplugMonitor(backend)
+    events = []
+    monitor.subscribe(lambda action, device: events.append((action, device.iSerial)))
+
+    monitor.resync()
+    second = _device("/dev/sdb", "BBB")
+    backend.devices["/dev/sdb"] = second
+    monitor.handle_event(_block_event("add", "sdb"))
+    backend.devices["/dev/sdb"] = _device("/dev/sdb", "BBB", read_only=True)
+    monitor.handle_event(_block_event("change", "sdb"))
+    monitor.handle_event(_block_event("change", "sdb"))
+    monitor.handle_event(_block_event("remove", "sda"))
+
+    assert backend.rebuilt == ["/dev/sdb", "/dev/sdb", "/dev/sdb"]
+    assert events == [("add", "AAA"), ("add", "BBB"), ("change", "BBB"), ("remove", "AAA")]
+    assert [device.blockDevice for device in monitor.devices()] == ["/dev/sdb"]
+    assert monitor.devices()[0].readOnly is True
+
+
+def test_monitor_drops_devices_when_usb_parent_is_removed():
+    backend = _FakeBackend([_device("/dev/sdc", "CCC")])
+    backend.usb_paths["/dev/sdc"] = "/sys/devices/pci0000:00/usb2/2-3"
+    monitor = LinuxHotplugMonitor(backend)
+    monitor.resync()
+    removed = []
+    unsubscribe = monitor.subscribe(lambda action, device: removed.append(action))
+
+    monitor.handle_event(
+        UEvent(
+            action="remove",
+            devpath="/devices/pci0000:00/usb2/2-3",
+            subsystem="usb",
+            devtype="usb_device",
+        )
+    )
+    unsubscribe()
+    monitor.handle_event(_block_event("remove", "sdc"))
+
+    assert removed == ["remove"]
+    assert monitor.devices() == []
+
+
+def test_monitor_resolves_event_paths_under_the_backend_roots(tmp_path):
+    dev_root = tmp_path / "dev"
+    sysfs_root = tmp_path / "sys"
+    usb_path = sysfs_root / "devices" / "pci0000:00" / "usb2" / "2-1"
+    usb_path.mkdir(parents=True)
+    block_device = str(dev_root / "sdb")
+    backend = _FakeBackend([])
+    backend.dev_root = str(dev_root)
+    backend.sysfs_root = str(sysfs_root)
+    backend.usb_paths[block_device] = os.path.realpath(usb_path)
+    monitor = LinuxHotplugMonitor(backend)
+    monitor.resync()
+
+    backend.devices[block_device] = _device(block_device, "AAA")
+    monitor.handle_event(_block_event("add", "sdb"))
+    assert backend.rebuilt == [block_device]
+    assert [device.blockDevice for device in monitor.devices()] == [block_device]
+
+    monitor.handle_event(
+        UEvent(
+            action="remove",
+            devpath="/devices/pci0000:00/usb2/2-1",
+            subsystem="usb",
+            devtype="usb_device",
+        )
+    )
+    assert monitor.devices() == []
+
+
+def test_device_manager_subscribe_requires_hotplug_support():
+    manager = DeviceManager(backend=_FakeBackend([]))
+
+    with pytest.raises(NotImplementedError):
+        manager.subscribe(lambda action, device: None)
+    assert manager.inventory() == []
+
+
+def test_daemon_pokes_never_overlap_hotplug_refreshes(monkeypatch):
+    class _ProbingBackend(_FakeBackend):
+        def __init__(self, devices):
+            super().__init__(devices)
+            self.active = 0
+            self.overlaps = 0
+            self.refresh_started = threading.Event()
+
+        def _pass_through(self):
+            # Stands in for SG_IO: READ BUFFER during a refresh, READ(10) for a poke.
+            self.active += 1
+            self.overlaps += self.active > 1
+            time.sleep(0.05)
+            self.active -= 1
+
+        def scan_block_device(self, block_device):
+            self.refresh_started.set()
+            self._pass_through()
+            return super().scan_block_device(block_device)
+
+        def poke_device_result(self, device_identifier, lba=0):
+            self._pass_through()
+            return PokeResult(success=True)
+
+        def create_hotplug_monitor(self, expanded=False, device_lock=None):
+            return LinuxHotplugMonitor(self, expanded=expanded, device_lock=device_lock)
+
+    uevent_ends = socket.socketpair()
+    monkeypatch.setattr(linux_hotplug, "open_uevent_socket", lambda group: uevent_ends[0])
+    backend = _ProbingBackend([_device("/dev/sdb", "AAA")])
+    manager = DeviceManager(backend=backend)
+    daemon = InventoryDaemon(manager, socket_path="unused")
+    daemon.start_inventory()
+    try:
+        refresh = threading.Thread(
+            target=manager._hotplug_monitor.handle_event, args=(_block_event("change", "sdb"),)
+        )
+        refresh.start()
+        assert backend.refresh_started.wait(5)
+        response = daemon.handle_request({"op": "poke", "target": "/dev/sdb"})
+        refresh.join(timeout=5)
+    finally:
+        manager.close()
+        uevent_ends[1].close()
+
+    assert daemon._uses_hotplug is True
+    assert response["ok"] is True
+    assert backend.overlaps == 0
@@ -0,0 +1,157 @@
+"""Scan the generated sysfs/udev tree from fake_sysfs at increasing device counts.
+
+USB_TOOL_SCALING_SIZES (default "20,80") sets the Apricorn device counts; raise it
+(e.g. "50,200,800") to find where the pipeline stops scaling on a given host. The
+wall-clock growth check runs only with USB_TOOL_IMPORT_BUDGET=1, like the import
+budgets; the correctness checks always run.
+"""
+
+import os
+import sys
+import threading
+import time
+from itertools import pairwise
+from unittest.mock import patch
+
+import pytest
+
+if sys.platform != "linux":
+    pytest.skip("Linux only tests", allow_module_level=True)
+
+from fake_sysfs import build_fake_linux_tree
+from usb_tool.backend import linux
+from usb_tool.backend.pci_ids import load_pci_ids_index
+from usb_tool.services import DeviceManager
+
+_SIZES = tuple(int(size) for size in os.getenv("USB_TOOL_SCALING_SIZES", "20,80").split(","))
+_RUNS = 3
+# Per-device cost may grow this much between consecutive sizes; quadratic growth
+# over a 4x step would be 4x.
+_MAX_PER_DEVICE_GROWTH = 1.6
+# Timer resolution and scheduler jitter; not a budget.
+_NOISE_FLOOR_MS = 5.0
+# Wall-clock ratios are noisy on shared runners, so timing checks are opt-in.
+_TIMING_ENABLED = os.getenv("USB_TOOL_IMPORT_BUDGET") == "1"
+
+
+def _backend(tree):
+    return linux.LinuxBackend(
+        sysfs_root=tree.sysfs_root,
+        dev_root=tree.dev_root,
+        udev_data_root=tree.udev_data_root,
+    )
+
+
+@pytest.fixture
+def offline_scan(monkeypatch):
+    # Version probes are SG_IO against real hardware; everything else comes from the tree.
+    monkeypatch.setattr(
+        linux,
+        "populate_device_version",
+        lambda *args, **kwargs: dict.fromkeys(linux.VERSION_FIELD_NAMES, "N/A"),
+    )
+
+    def _install(tree):
+        monkeypatch.setattr(
+            linux, "load_pci_ids_index", lambda: load_pci_ids_index((tree.pci_ids_path,))
+        )
+        return _backend(tree)
+
+    return _install
+
+
+def test_generated_tree_scans_without_helpers(tmp_path, offline_scan):
+    tree = build_fake_linux_tree(tmp_path, apricorn_devices=12, other_usb_devices=3)
+    backend = offline_scan(tree)
+
+    with patch.object(linux.subprocess, "run", side_effect=AssertionError) as run_mock:
+        devices = backend.scan_devices()
+        fingerprints = backend.device_fingerprints()
+
+    run_mock.assert_not_called()
+    expected = sorted(tree.apricorn_disks, key=lambda disk: disk.block_device)
+    assert [device.blockDevice for device in devices] == [disk.block_device for disk in expected]
+    for device, disk in zip(devices, expected, strict=True):
+        assert device.iSerial == disk.serial
+        assert device.idProduct == disk.product_id
+        assert device.busNumber == disk.bus_number
+        assert device.deviceAddress == disk.device_address
+        assert device.driverTransport in {"UAS", "BOT"}
+    # Fingerprints cover every USB disk, Apricorn or not, and nothing internal.
+    usb_disks = {disk.block_device for disk in tree.apricorn_disks} | set(tree.other_disks[2:])
+    assert fingerprints is not None
+    assert set(fingerprints) == usb_disks
+
+
+def test_scan_block_device_reads_one_generated_disk(tmp_path, offline_scan):
+    tree = build_fake_linux_tree(tmp_path, apricorn_devices=4)
+    backend = offline_scan(tree)
+    disk = tree.apricorn_disks[2]
+
+    device = backend.scan_block_device(disk.block_device)
+
+    assert device is not None
+    assert device.iSerial == disk.serial
+    assert backend.scan_block_device(tree.other_disks[0]) is None
+
+
+@pytest.mark.skipif(not _TIMING_ENABLED, reason="set USB_TOOL_IMPORT_BUDGET=1 to time scans")
+def test_scan_time_grows_close_to_linearly_with_device_count(tmp_path, offline_scan):
+    per_device_ms = []
+    for size in _SIZES:
+        tree = build_fake_linux_tree(tmp_path / str(size), apricorn_devices=size)
+        backend = offline_scan(tree)
+        best_ms = float("inf")
+        for _ in range(_RUNS):
+            start = time.perf_counter()
+            devices = backend.scan_devices()
+            best_ms = min(best_ms, (time.perf_counter() - start) * 1000.0)
+        assert len(devices) == size
+        per_device_ms.append((size, best_ms, best_ms / size))
+
+    for (small, small_ms, small_per), (large, large_ms, _) in pairwise(per_device_ms):
+        allowed_ms = small_per * large * _MAX_PER_DEVICE_GROWTH + _NOISE_FLOOR_MS
+        assert large_ms <= allowed_ms, (
+            f"{large} devices took {large_ms:.1f}ms; {small} took {small_ms:.1f}ms, "
+            f"so linear growth allows {allowed_ms:.1f}ms"
+        )
+
+
+@pytest.mark.parametrize("workers", ["1", "16"])
+def test_deadline_returns_partial_results_when_one_probe_hangs(
+    tmp_path, offline_scan, monkeypatch, workers
+):
+    tree = build_fake_linux_tree(tmp_path, apricorn_devices=4)
+    backend = offline_scan(tree)
+    wedged = tree.apricorn_disks[1]
+    release = threading.Event()
+    wedged_threads = []
+
+    def _populate(vendor_id, product_id, serial_number, **_kwargs):
+        if serial_number == wedged.serial:
+            wedged_threads.append(threading.current_thread())
+            # Stands in for a READ BUFFER stuck in SG_IO.
+            release.wait(10)
+        return dict.fromkeys(linux.VERSION_FIELD_NAMES, "N/A")
+
+    monkeypatch.setattr(linux, "populate_device_version", _populate)
+    monkeypatch.setenv("USB_TOOL_LINUX_VERSION_PROBE_WORKERS", workers)
+    try:
+        start = time.monotonic()
+        devices = DeviceManager(backend=backend).list_devices(deadline_s=0.5)
+        elapsed = time.monotonic() - start
+        # Abandoned probes must not be joined at interpreter exit.
+        assert [thread.daemon for thread in wedged_threads] == [True]
+    finally:
+        release.set()
+
+    assert elapsed < 2.0
+    assert len(devices) == len(tree.apricorn_disks)
+    by_block = {device.blockDevice: device for device in devices}
+    stuck = by_block[wedged.block_device]
+    assert stuck.unknownFields == sorted(linux.VERSION_FIELD_NAMES)
+    # Identity and transport come from sysfs, so the deadline leaves them intact.
+    assert stuck.iSerial == wedged.serial
+    assert stuck.driverTransport in {"UAS", "BOT"}
+    if workers != "1":
+        assert [device.unknownFields for device in devices if device is not stuck] == [None] * 3
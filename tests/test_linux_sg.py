@@ -0,0 +1,237 @@
+"""Unit tests for the asynchronous sg engine."""
+
+import sys
+
+import pytest
+
+# Skip this entire module if not on Linux
+if sys.platform != "linux":
+    pytest.skip("Linux only tests", allow_module_level=True)
+
+import asyncio
+import ctypes
+import errno
+import os
+import socket
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+from fake_sysfs import build_fake_linux_tree
+from usb_tool.backend import linux, linux_sg
+from usb_tool.backend.linux import LinuxBackend
+from usb_tool.backend.linux_sg import ScsiCommand, SgEngine, read_buffer_command
+
+
+class _FakeSgEngine(SgEngine):
+    """Stands in for /dev/sg* with socket pairs; the test plays the kernel side."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.kernel_ends = {}
+        self.submitted = {}
+
+    def _open_device(self, device_path):
+        engine_end, kernel_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        engine_end.setblocking(False)
+        self.kernel_ends[device_path] = (engine_end, kernel_end)
+        self.submitted[device_path] = []
+        return os.dup(engine_end.fileno())
+
+    def _write_request(self, fd, header):
+        path = self._paths_by_fd[fd]
+        self.submitted[path].append(header)
+
+    def complete(self, device_path, data=b"", status=0, duration=7):
+        header = self.submitted[device_path].pop(0)
+        if data:
+            ctypes.memmove(header.dxferp, data, len(data))
+        reply = linux_sg.SG_IO_HDR.from_buffer_copy(bytes(header))
+        reply.status = status
+        reply.duration = duration
+        reply.resid = header.dxfer_len - len(data)
+        self.kernel_ends[device_path][1].send(bytes(reply))
+
+    def close(self):
+        super().close()
+        for engine_end, kernel_end in self.kernel_ends.values():
+            engine_end.close()
+            kernel_end.close()
+
+
+class _AutoCompleteSgEngine(_FakeSgEngine):
+    """Completes every command as soon as it is written, echoing the sg node path."""
+
+    def _write_request(self, fd, header):
+        super()._write_request(fd, header)
+        path = self._paths_by_fd[fd]
+        self.complete(path, data=f"21-00000000000 {os.path.basename(path)}".encode())
+
+
+def _tree_with_sg_nodes(tmp_path):
+    tree = build_fake_linux_tree(tmp_path, apricorn_devices=3)
+    for index, disk in enumerate(tree.apricorn_disks):
+        name = os.path.basename(disk.block_device)
+        generic = Path(tree.sysfs_root, "class", "block", name, "device", "scsi_generic")
+        (generic / f"sg{index}").mkdir(parents=True)
+    backend = LinuxBackend(
+        sysfs_root=tree.sysfs_root, dev_root=tree.dev_root, udev_data_root=tree.udev_data_root
+    )
+    return tree, backend
+
+
+def test_engine_keeps_commands_in_flight_on_many_devices():
+    engine = _FakeSgEngine()
+    paths = [f"/dev/sg{index}" for index in range(12)]
+    request_ids = {engine.submit(path, read_buffer_command()): path for path in paths}
+
+    assert engine.pending_count() == 12
+    for index, path in enumerate(reversed(paths)):
+        engine.complete(path, data=f"payload-{index}".encode())
+
+    completed = {}
+    while len(completed) < len(paths):
+        completed.update(engine.poll(1.0))
+    engine.close()
+
+    assert set(completed) == set(request_ids)
+    first = completed[next(iter(request_ids))]
+    assert first.ok
+    assert first.data == b"payload-11"
+    assert first.duration_ms == 7
+
+
+def test_engine_backlogs_commands_beyond_queue_depth():
+    engine = _FakeSgEngine(max_queue_per_device=2)
+    command = ScsiCommand(cdb=b"\x00" * 6)
+    request_ids = [engine.submit("/dev/sg0", command) for _ in range(3)]
+
+    assert len(engine.submitted["/dev/sg0"]) == 2
+    engine.complete("/dev/sg0", status=0x02)
+    first = engine.poll(1.0)
+
+    assert list(first) == [request_ids[0]]
+    assert not first[request_ids[0]].ok
+    assert len(engine.submitted["/dev/sg0"]) == 2
+    engine.close()
+
+
+def test_engine_execute_integrates_with_asyncio():
+    engine = _FakeSgEngine()
+
+    async def _scenario():
+        pending = asyncio.ensure_future(
+            engine.execute_many(
+                [("/dev/sg0", read_buffer_command()), ("/dev/sg1", read_buffer_command())]
+            )
+        )
+        while sum(len(headers) for headers in engine.submitted.values()) < 2:
+            await asyncio.sleep(0)
+        engine.complete("/dev/sg1", b"B")
+        engine.complete("/dev/sg0", b"A")
+        return await asyncio.wait_for(pending, timeout=5)
+
+    completions = asyncio.run(_scenario())
+    engine.close()
+
+    assert [completion.data for completion in completions] == [b"A", b"B"]
+    assert [completion.device_path for completion in completions] == ["/dev/sg0", "/dev/sg1"]
+
+
+def test_resolve_sg_device_reads_scsi_generic_link(tmp_path):
+    generic = tmp_path / "sdb" / "device" / "scsi_generic" / "sg3"
+    generic.mkdir(parents=True)
+    root = str(tmp_path)
+
+    assert linux_sg.resolve_sg_device("/dev/sdb", root) == "/dev/sg3"
+    assert linux_sg.resolve_sg_device("/dev/sdb", root, "/fake/dev") == "/fake/dev/sg3"
+    assert linux_sg.resolve_sg_device("/dev/sdc", root) == ""
+    assert linux_sg.resolve_sg_device("/dev/sg5", root) == "/dev/sg5"
+
+
+def test_run_returns_when_completions_are_taken_elsewhere():
+    class _StolenEngine(_AutoCompleteSgEngine):
+        def poll(self, timeout=None):
+            # Another consumer (an asyncio waiter, a second poll()) took everything.
+            super().poll(timeout)
+            return {}
+
+    engine = _StolenEngine()
+    results = []
+    runner = threading.Thread(
+        target=lambda: results.extend(engine.run([("/dev/sg0", read_buffer_command())])),
+        daemon=True,
+    )
+    runner.start()
+    runner.join(timeout=5)
+    engine.close()
+
+    assert not runner.is_alive()
+    assert results[0].error == os.strerror(errno.ETIMEDOUT)
+
+
+def test_version_probes_go_through_the_engine(tmp_path, monkeypatch):
+    tree, backend = _tree_with_sg_nodes(tmp_path)
+    engines = []
+
+    def _engine(**kwargs):
+        engines.append(_AutoCompleteSgEngine(**kwargs))
+        return engines[-1]
+
+    read_results = {}
+
+    def _populate(*_args, device_path=None, read_result=None, **_kwargs):
+        read_results[device_path] = read_result
+        return dict.fromkeys(linux.VERSION_FIELD_NAMES, "N/A")
+
+    monkeypatch.setattr(linux_sg, "SgEngine", _engine)
+    monkeypatch.setattr(linux, "populate_device_version", _populate)
+    monkeypatch.setattr(linux, "needs_version_probe", lambda *args, **kwargs: True)
+    candidates = [
+        SimpleNamespace(
+            block_device=disk.block_device,
+            vid=disk.vendor_id,
+            pid=disk.product_id,
+            serial=disk.serial,
+            bcd_device="0100",
+            identity="",
+            size_gb="16",
+        )
+        for disk in tree.apricorn_disks
+    ]
+
+    results = list(backend._iter_device_versions(candidates))
+
+    assert len(engines) == 1
+    assert sorted(engines[0].submitted) == [
+        os.path.join(tree.dev_root, f"sg{index}") for index in range(3)
+    ]
+    assert len(results) == 3
+    for index, disk in enumerate(tree.apricorn_disks):
+        assert read_results[disk.block_device] == (f"21-00000000000 sg{index}".encode(), "")
+
+
+def test_version_probes_fall_back_to_sg_io_when_engine_disabled(tmp_path, monkeypatch):
+    tree, backend = _tree_with_sg_nodes(tmp_path)
+    monkeypatch.setenv("USB_TOOL_LINUX_SG_ENGINE", "0")
+    monkeypatch.setattr(linux, "needs_version_probe", lambda *args, **kwargs: True)
+
+    assert backend._sg_engine_targets(list(tree.apricorn_disks)) == {}
+
+
+def test_poke_uses_the_engine_on_the_sg_node(tmp_path, monkeypatch):
+    tree, backend = _tree_with_sg_nodes(tmp_path)
+    engines = []
+
+    def _engine(**kwargs):
+        engines.append(_AutoCompleteSgEngine(**kwargs))
+        return engines[-1]
+
+    monkeypatch.setattr(linux_sg, "SgEngine", _engine)
+
+    with backend.open_poke_session(tree.apricorn_disks[0].block_device) as session:
+        result = session.poke(lba=7)
+        (path,) = engines[0].submitted
+
+    assert result.success is True
+    assert path == os.path.join(tree.dev_root, "sg0")
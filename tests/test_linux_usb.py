@@ -11,7 +11,15 @@ if sys.platform != "linux":
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
-from usb_tool.backend.linux import LinuxBackend, _LinuxBlockDeviceProbe
+from usb_tool.backend.linux import (
+    LinuxBackend,
+    _LinuxBlockDeviceProbe,
+    _LinuxUsbBlockDevice,
+    _LinuxUsbDevice,
+    _LinuxUsbInterface,
+)
+from usb_tool.backend.pci_ids import load_pci_ids_index
+from usb_tool.deadline import HELPER_TIMEOUT_S, scan_deadline
 
 
 def test_parse_lsblk_size_parses_various_units():
@@ -30,7 +38,10 @@ def test_list_usb_drives_parses_lsblk_output():
     lsblk_output = "/dev/sda SERIAL123 465G 1 0\n/dev/sdb - 14T 0 1\n"
     mock_result = SimpleNamespace(returncode=0, stdout=lsblk_output, stderr="")
 
-    with patch("subprocess.run", return_value=mock_result):
+    with (
+        patch.object(LinuxBackend, "_list_sysfs_block_devices", return_value=None),
+        patch("subprocess.run", return_value=mock_result),
+    ):
         backend = LinuxBackend()
         drives = backend.list_usb_drives()
 
@@ -44,49 +55,93 @@ def test_list_usb_drives_parses_lsblk_output():
     assert drives[1]["readOnly"] is True
 
 
-def test_probe_block_device_context_prefers_sysfs_when_available():
+def _write_sysfs_block_device(root, name, dev, size, removable="0", ro="0", block_size="512"):
+    block_dir = root / name
+    (block_dir / "queue").mkdir(parents=True)
+    (block_dir / "dev").write_text(f"{dev}\n", encoding="utf-8")
+    (block_dir / "size").write_text(f"{size}\n", encoding="utf-8")
+    (block_dir / "removable").write_text(f"{removable}\n", encoding="utf-8")
+    (block_dir / "ro").write_text(f"{ro}\n", encoding="utf-8")
+    (block_dir / "queue" / "logical_block_size").write_text(f"{block_size}\n", encoding="utf-8")
+    return block_dir
+
+
+def test_list_sysfs_block_devices_reads_exact_sizes_and_flags(tmp_path, monkeypatch):
+    _write_sysfs_block_device(tmp_path, "sdb", "8:16", 31277232, removable="1")
+    _write_sysfs_block_device(tmp_path, "sdc", "8:32", 0, ro="1", block_size="4096")
+    partition_dir = _write_sysfs_block_device(tmp_path, "sdb1", "8:17", 31275008)
+    (partition_dir / "partition").write_text("1\n", encoding="utf-8")
+    _write_sysfs_block_device(tmp_path, "loop0", "7:0", 2048)
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_CLASS_BLOCK_ROOT", str(tmp_path))
+
+    with patch("subprocess.run") as run_mock:
+        drives = LinuxBackend().list_usb_drives()
+
+    run_mock.assert_not_called()
+    assert [drive["name"] for drive in drives] == ["/dev/sdb", "/dev/sdc"]
+    assert drives[0]["size_bytes"] == 31277232 * 512
+    assert drives[0]["size_gb"] == (31277232 * 512) / (1024**3)
+    assert drives[0]["mediaType"] == "Removable Media"
+    assert drives[0]["readOnly"] is False
+    assert drives[0]["dev"] == "8:16"
+    assert drives[1]["size_bytes"] == 0
+    assert drives[1]["logical_block_size"] == 4096
+    assert drives[1]["readOnly"] is True
+
+
+def test_list_usb_drives_falls_back_to_lsblk_without_sysfs(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_CLASS_BLOCK_ROOT", str(tmp_path / "none"))
+    mock_result = SimpleNamespace(returncode=0, stdout="/dev/sdb SERIAL123 64G 0 0\n", stderr="")
+
+    with patch("usb_tool.backend.linux.subprocess.run", return_value=mock_result) as run_mock:
+        drives = LinuxBackend().list_usb_drives()
+
+    assert run_mock.call_args.args[0][0] == "lsblk"
+    assert drives[0]["size_gb"] == 64.0
+
+
+def test_probe_block_device_context_prefers_usb_topology_when_available():
     backend = LinuxBackend()
     udev_mock = Mock(return_value={})
+    device_path = "/sys/devices/pci0000:00/0000:00:14.0/usb1/1-1"
+    device = _LinuxUsbDevice(
+        name="1-1",
+        path=device_path,
+        controller_pci_addr="0000:00:14.0",
+        descriptor={"idVendor": "0984", "idProduct": "1407", "iSerial": "SERIAL123"},
+    )
+    interface = _LinuxUsbInterface(name="1-1:1.0", path=f"{device_path}/1-1:1.0", driver_name="uas")
+    usb_block = _LinuxUsbBlockDevice(
+        block_device="/dev/sdb",
+        sysfs_path=f"{device_path}/1-1:1.0/host0/target0:0:0/0:0:0:0/block/sdb",
+        device=device,
+        interface=interface,
+    )
 
-    with (
-        patch.object(
-            LinuxBackend,
-            "_get_block_device_sysfs_path",
-            return_value="/sys/devices/pci0000:00/0000:00:14.0/usb1/1-1/1-1:1.0/host0/target0:0:0/0:0:0:0/block/sdb",
-        ),
-        patch.object(LinuxBackend, "_find_usb_driver_name_in_sysfs", return_value="uas"),
-        patch.object(LinuxBackend, "_find_usb_serial_in_sysfs", return_value="SERIAL123"),
-        patch.object(LinuxBackend, "_get_udev_info", udev_mock),
-    ):
-        probe = backend._probe_block_device_context("/dev/sdb", {"serial": ""})
+    with patch.object(LinuxBackend, "_get_udev_info", udev_mock):
+        probe = backend._probe_block_device_context(
+            "/dev/sdb", {"serial": "", "usb_block": usb_block}
+        )
 
     assert probe.serial == "SERIAL123"
     assert probe.driver_name == "uas"
     assert probe.driver_transport == "UAS"
     assert probe.pci_addr == "0000:00:14.0"
+    assert probe.usb_device is device
     udev_mock.assert_not_called()
 
 
 def test_probe_block_device_context_uses_udev_fallbacks():
     backend = LinuxBackend()
 
-    with (
-        patch.object(
-            LinuxBackend,
-            "_get_block_device_sysfs_path",
-            return_value="/sys/devices/virtual/block/sdb",
-        ),
-        patch.object(LinuxBackend, "_find_usb_driver_name_in_sysfs", return_value=""),
-        patch.object(LinuxBackend, "_find_usb_serial_in_sysfs", return_value=""),
-        patch.object(
-            LinuxBackend,
-            "_get_udev_info",
-            return_value={
-                "ID_USB_DRIVER": "usb-storage",
-                "ID_PATH": "pci-0000:00:1d.0-usb-0:4:1.0-scsi-0:0:0:0",
-                "ID_SERIAL_SHORT": "SERIAL456",
-            },
-        ),
+    with patch.object(
+        LinuxBackend,
+        "_get_udev_info",
+        return_value={
+            "ID_USB_DRIVER": "usb-storage",
+            "ID_PATH": "pci-0000:00:1d.0-usb-0:4:1.0-scsi-0:0:0:0",
+            "ID_SERIAL_SHORT": "SERIAL456",
+        },
     ):
         probe = backend._probe_block_device_context("/dev/sdb", {"serial": ""})
 
@@ -94,6 +149,7 @@ def test_probe_block_device_context_uses_udev_fallbacks():
     assert probe.driver_name == "usb-storage"
     assert probe.driver_transport == "BOT"
     assert probe.pci_addr == "0000:00:1d.0"
+    assert probe.usb_device is None
 
 
 def test_scan_devices_populates_driver_transport_from_probe_result():
@@ -131,7 +187,7 @@ def test_scan_devices_populates_driver_transport_from_probe_result():
         ),
         patch.object(
             LinuxBackend,
-            "_get_lsusb_details",
+            "_get_usb_descriptor_details",
             return_value={
                 "SERIAL123": {
                     "idVendor": "0984",
@@ -189,7 +245,7 @@ def test_scan_devices_uses_probe_serial_when_lsblk_serial_missing():
         ),
         patch.object(
             LinuxBackend,
-            "_get_lsusb_details",
+            "_get_usb_descriptor_details",
             return_value={
                 "SERIAL123": {
                     "idVendor": "0984",
@@ -256,7 +312,7 @@ def test_scan_devices_preserves_lsblk_order_after_parallel_probe_join():
         ),
         patch.object(
             LinuxBackend,
-            "_get_lsusb_details",
+            "_get_usb_descriptor_details",
             return_value={
                 "SERIAL_A": {
                     "idVendor": "0984",
@@ -292,7 +348,7 @@ def test_scan_devices_emits_profile_output_when_enabled(capsys):
         patch.object(LinuxBackend, "_list_usb_drives", return_value=[]),
         patch.object(LinuxBackend, "_probe_block_devices", return_value={}),
         patch.object(LinuxBackend, "_resolve_probe_controllers", return_value={}),
-        patch.object(LinuxBackend, "_get_lsusb_details", return_value={}),
+        patch.object(LinuxBackend, "_get_usb_descriptor_details", return_value={}),
     ):
         backend = LinuxBackend()
         devices = backend.scan_devices(profile_scan=True)
@@ -352,7 +408,7 @@ def test_scan_devices_profile_details_precede_summary(capsys):
         ),
         patch.object(
             LinuxBackend,
-            "_get_lsusb_details",
+            "_get_usb_descriptor_details",
             return_value={
                 "SERIAL123": {
                     "idVendor": "0984",
@@ -381,7 +437,7 @@ def test_scan_devices_profile_details_precede_summary(capsys):
     assert "populate_device_version_total=12.34ms" in lines[0]
     assert "device_count=1" in lines[0]
     assert lines[1].startswith("linux-scan-profile expanded=false")
-    assert "lsblk_drives=1" in lines[1]
+    assert "block_devices=1" in lines[1]
     assert "probed_devices=1" in lines[1]
     assert "unique_pci_addrs=1" in lines[1]
     assert "lsusb_devices=1" in lines[1]
@@ -391,7 +447,8 @@ def test_scan_devices_profile_details_precede_summary(capsys):
     assert "descriptor_lookup=" in lines[1]
 
 
-def test_get_udev_info_parses_usb_storage_driver():
+def test_get_udev_info_parses_usb_storage_driver(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._UDEV_DATA_ROOT", str(tmp_path / "missing"))
     mock_result = SimpleNamespace(
         returncode=0,
         stdout=(
@@ -487,7 +544,8 @@ def test_resolve_probe_controllers_deduplicates_pci_lookups():
     }
 
 
-def test_get_pci_controller_name_returns_manufacturer_only():
+def test_get_pci_controller_name_returns_manufacturer_only(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_PCI_DEVICES_ROOT", str(tmp_path))
     mock_result = SimpleNamespace(
         returncode=0,
         stdout=(
@@ -543,3 +601,718 @@ I:  If#= 0 Alt= 0 #EPs= 2 Cls=08(stor.) Sub=06 Prot=50 Driver=usb-storage
         "000000000001": "UAS",
         "101300032245": "BOT",
     }
+
+
+def _write_sysfs_usb_device(root, name, **attributes):
+    device_dir = root / name
+    device_dir.mkdir(parents=True)
+    for attribute, value in attributes.items():
+        (device_dir / attribute).write_text(f"{value}\n", encoding="utf-8")
+    return device_dir
+
+
+def test_get_sysfs_usb_details_reads_descriptor_attributes(tmp_path, monkeypatch):
+    _write_sysfs_usb_device(
+        tmp_path,
+        "2-1",
+        idVendor="0984",
+        idProduct="1407",
+        bcdDevice="0502",
+        version=" 3.20",
+        manufacturer="Apricorn",
+        product="Secure Key 3.0",
+        serial="SERIAL123",
+        busnum="2",
+        devnum="5",
+    )
+    _write_sysfs_usb_device(tmp_path, "2-1:1.0", bInterfaceClass="08")
+    _write_sysfs_usb_device(tmp_path, "1-4", idVendor="046d", idProduct="c52b", serial="OTHER")
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_USB_DEVICES_ROOT", str(tmp_path))
+
+    details = LinuxBackend()._get_sysfs_usb_details()
+
+    assert details == {
+        "SERIAL123": {
+            "idVendor": "0984",
+            "idProduct": "1407",
+            "bcdDevice": "0502",
+            "bcdUSB": "3.20",
+            "iManufacturer": "Apricorn",
+            "iProduct": "Secure Key 3.0",
+            "iSerial": "SERIAL123",
+            "busNumber": 2,
+            "deviceAddress": 5,
+        }
+    }
+
+
+def test_get_usb_descriptor_details_falls_back_to_lsusb_without_sysfs(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_USB_DEVICES_ROOT", str(tmp_path / "missing"))
+    lsusb_mock = Mock(return_value={"SERIAL123": {"idVendor": "0984"}})
+
+    with patch.object(LinuxBackend, "_get_lsusb_details", lsusb_mock):
+        details = LinuxBackend()._get_usb_descriptor_details()
+
+    assert details == {"SERIAL123": {"idVendor": "0984"}}
+    lsusb_mock.assert_called_once_with()
+
+
+def test_get_usb_descriptor_details_skips_lsusb_when_sysfs_available(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_USB_DEVICES_ROOT", str(tmp_path))
+    lsusb_mock = Mock(return_value={})
+
+    with patch.object(LinuxBackend, "_get_lsusb_details", lsusb_mock):
+        details = LinuxBackend()._get_usb_descriptor_details()
+
+    assert details == {}
+    lsusb_mock.assert_not_called()
+
+
+def test_scan_devices_populates_bus_number_and_device_address_from_sysfs():
+    with (
+        patch.object(
+            LinuxBackend,
+            "_list_usb_drives",
+            return_value=[
+                {
+                    "name": "/dev/sdb",
+                    "serial": "SERIAL123",
+                    "size_gb": 14.9,
+                    "mediaType": "Basic Disk",
+                    "readOnly": False,
+                }
+            ],
+        ),
+        patch.object(
+            LinuxBackend,
+            "_probe_block_devices",
+            return_value={
+                "/dev/sdb": _LinuxBlockDeviceProbe(block_device="/dev/sdb", serial="SERIAL123")
+            },
+        ),
+        patch.object(LinuxBackend, "_resolve_probe_controllers", return_value={}),
+        patch.object(
+            LinuxBackend,
+            "_get_usb_descriptor_details",
+            return_value={
+                "SERIAL123": {
+                    "idVendor": "0984",
+                    "idProduct": "1407",
+                    "bcdUSB": "3.20",
+                    "bcdDevice": "0502",
+                    "busNumber": 2,
+                    "deviceAddress": 5,
+                }
+            },
+        ),
+        patch("usb_tool.backend.linux.populate_device_version", return_value={}),
+    ):
+        devices = LinuxBackend().scan_devices()
+
+    serialized = devices[0].to_dict()
+    assert serialized["busNumber"] == 2
+    assert serialized["deviceAddress"] == 5
+    assert serialized["bcdUSB"] == 3.2
+    assert serialized["bcdDevice"] == "0502"
+    assert serialized["driveSizeGB"] == "16"
+
+
+def _link_sysfs_block_device(class_root, device_dir, name):
+    class_root.mkdir(parents=True, exist_ok=True)
+    block_dir = device_dir / "block" / name
+    block_dir.mkdir(parents=True)
+    (class_root / name).symlink_to(block_dir)
+    return block_dir
+
+
+def test_probe_block_devices_drops_non_apricorn_disks_before_probing(tmp_path, monkeypatch):
+    class_root = tmp_path / "class" / "block"
+    usb_root = tmp_path / "devices" / "pci0000:00" / "0000:00:14.0" / "usb2"
+    apricorn = _write_sysfs_usb_device(usb_root, "2-1", idVendor="0984", idProduct="1407")
+    excluded = _write_sysfs_usb_device(usb_root, "2-2", idVendor="0984", idProduct="0221")
+    other = _write_sysfs_usb_device(usb_root, "2-3", idVendor="0781", idProduct="5581")
+    _link_sysfs_block_device(class_root, apricorn / "2-1:1.0" / "host0", "sdb")
+    _link_sysfs_block_device(class_root, excluded / "2-2:1.0" / "host1", "sdc")
+    _link_sysfs_block_device(class_root, other / "2-3:1.0" / "host2", "sdd")
+    nvme = tmp_path / "devices" / "pci0000:00" / "0000:00:1d.0" / "nvme" / "nvme0"
+    _link_sysfs_block_device(class_root, nvme, "nvme0n1")
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_CLASS_BLOCK_ROOT", str(class_root))
+    udev_mock = Mock(return_value={})
+
+    with patch.object(LinuxBackend, "_get_udev_info", udev_mock):
+        probe_map = LinuxBackend()._probe_block_devices(
+            [
+                {"name": "/dev/nvme0n1", "serial": ""},
+                {"name": "/dev/sdb", "serial": ""},
+                {"name": "/dev/sdc", "serial": ""},
+                {"name": "/dev/sdd", "serial": ""},
+            ]
+        )
+
+    assert list(probe_map) == ["/dev/sdb"]
+    assert probe_map["/dev/sdb"].usb_device_path == str(apricorn.resolve())
+    assert probe_map["/dev/sdb"].pci_addr == "0000:00:14.0"
+    assert [call.args[0] for call in udev_mock.call_args_list] == ["/dev/sdb"]
+
+
+def test_scan_devices_skips_block_devices_filtered_before_probe():
+    with (
+        patch.object(
+            LinuxBackend,
+            "_list_usb_drives",
+            return_value=[{"name": "/dev/nvme0n1", "serial": "NVME123", "size_gb": 512.0}],
+        ),
+        patch.object(LinuxBackend, "_probe_block_devices", return_value={}),
+        patch.object(LinuxBackend, "_resolve_probe_controllers", return_value={}),
+        patch.object(
+            LinuxBackend,
+            "_get_usb_descriptor_details",
+            return_value={"NVME123": {"idVendor": "0984", "idProduct": "1407"}},
+        ),
+        patch("usb_tool.backend.linux.populate_device_version") as version_mock,
+    ):
+        devices = LinuxBackend().scan_devices()
+
+    assert devices == []
+    version_mock.assert_not_called()
+
+
+def test_get_udev_info_reads_udev_database_without_spawning_udevadm(tmp_path, monkeypatch):
+    (tmp_path / "b8:16").write_text(
+        "S:disk/by-id/usb-Apricorn_Secure_Key_3.0_SERIAL123-0:0\n"
+        "I:1234567\n"
+        "E:ID_USB_DRIVER=uas\n"
+        "E:ID_SERIAL_SHORT=SERIAL123\n"
+        "G:systemd\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr("usb_tool.backend.linux._UDEV_DATA_ROOT", str(tmp_path))
+
+    with (
+        patch.object(LinuxBackend, "_get_block_device_number", return_value="8:16"),
+        patch("usb_tool.backend.linux.subprocess.run") as run_mock,
+    ):
+        info = LinuxBackend()._get_udev_info("/dev/sdb")
+
+    run_mock.assert_not_called()
+    assert info == {"ID_USB_DRIVER": "uas", "ID_SERIAL_SHORT": "SERIAL123"}
+
+
+def test_probe_block_devices_loads_udev_records_once_per_scan(tmp_path, monkeypatch):
+    (tmp_path / "b8:16").write_text("E:ID_SERIAL_SHORT=SERIAL_B\n", encoding="utf-8")
+    (tmp_path / "b8:32").write_text("E:ID_SERIAL_SHORT=SERIAL_C\n", encoding="utf-8")
+    monkeypatch.setattr("usb_tool.backend.linux._UDEV_DATA_ROOT", str(tmp_path))
+    backend = LinuxBackend()
+    read_mock = Mock(wraps=backend._read_udev_database_record)
+
+    with (
+        patch.object(LinuxBackend, "_get_block_device_sysfs_path", return_value=""),
+        patch.object(LinuxBackend, "_read_udev_database_record", read_mock),
+        patch("usb_tool.backend.linux.subprocess.run") as run_mock,
+    ):
+        probe_map = backend._probe_block_devices(
+            [
+                {"name": "/dev/sdb", "serial": "", "dev": "8:16"},
+                {"name": "/dev/sdc", "serial": "", "dev": "8:32"},
+            ]
+        )
+
+    run_mock.assert_not_called()
+    assert sorted(call.args[0] for call in read_mock.call_args_list) == ["8:16", "8:32"]
+    assert probe_map["/dev/sdb"].serial == "SERIAL_B"
+    assert probe_map["/dev/sdc"].serial == "SERIAL_C"
+    # The records belong to that scan; a concurrent hotplug scan must not see them.
+    assert not hasattr(backend, "_udev_records")
+
+
+def test_get_udev_info_falls_back_to_udevadm_without_database(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._UDEV_DATA_ROOT", str(tmp_path / "missing"))
+    mock_result = SimpleNamespace(returncode=0, stdout="E: ID_USB_DRIVER=uas\n", stderr="")
+
+    with patch("usb_tool.backend.linux.subprocess.run", return_value=mock_result) as run_mock:
+        info = LinuxBackend()._get_udev_info("/dev/sdb")
+
+    assert run_mock.call_args.args[0][:2] == ["udevadm", "info"]
+    assert info == {"ID_USB_DRIVER": "uas"}
+
+
+def test_helper_timeouts_follow_the_scan_deadline(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._UDEV_DATA_ROOT", str(tmp_path / "missing"))
+    mock_result = SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    with patch("usb_tool.backend.linux.subprocess.run", return_value=mock_result) as run_mock:
+        LinuxBackend()._get_udev_info("/dev/sdb")
+        assert run_mock.call_args.kwargs["timeout"] == HELPER_TIMEOUT_S
+        with scan_deadline(2.0):
+            LinuxBackend()._get_udev_info("/dev/sdb")
+        assert 0 < run_mock.call_args.kwargs["timeout"] <= 2.0
+
+
+def test_get_pci_controller_name_resolves_sysfs_ids_without_lspci(tmp_path, monkeypatch):
+    device_dir = tmp_path / "0000:00:14.0"
+    device_dir.mkdir()
+    (device_dir / "vendor").write_text("0x8086\n", encoding="utf-8")
+    (device_dir / "device").write_text("0x7ae0\n", encoding="utf-8")
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_PCI_DEVICES_ROOT", str(tmp_path))
+    index = Mock()
+    index.vendor_name.return_value = "Intel Corporation"
+    index.device_name.return_value = "Alder Lake PCH USB 3.2 xHCI Host Controller"
+
+    with (
+        patch("usb_tool.backend.linux.load_pci_ids_index", return_value=index),
+        patch("usb_tool.backend.linux.subprocess.run") as run_mock,
+    ):
+        controller_name = LinuxBackend()._get_pci_controller_name("0000:00:14.0")
+
+    run_mock.assert_not_called()
+    index.vendor_name.assert_called_once_with(0x8086)
+    index.device_name.assert_called_once_with(0x8086, 0x7AE0)
+    assert controller_name == "Intel"
+
+
+def test_pci_ids_controller_matches_lspci_description(tmp_path, monkeypatch, capsys):
+    pci_root = tmp_path / "bus" / "pci" / "devices"
+    for pci_addr, device_id in (("0000:03:00.0", "0x2142"), ("0000:04:00.0", "0x9999")):
+        (pci_root / pci_addr).mkdir(parents=True)
+        (pci_root / pci_addr / "vendor").write_text("0x1b21\n", encoding="utf-8")
+        (pci_root / pci_addr / "device").write_text(f"{device_id}\n", encoding="utf-8")
+    pci_ids = tmp_path / "pci.ids"
+    pci_ids.write_text(
+        "1b21  ASMedia Technology Inc.\n\t2142  ASM2142/ASM3142 USB 3.1 Host Controller\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(
+        "usb_tool.backend.linux.load_pci_ids_index", lambda: load_pci_ids_index((str(pci_ids),))
+    )
+    backend = LinuxBackend(sysfs_root=str(tmp_path))
+    backend._profile_helper_events_enabled = True
+
+    # Listed device: lspci's "<vendor> <device>"; unlisted: the vendor name alone.
+    assert backend._get_pci_controller_name_from_ids("0000:03:00.0") == "ASMedia"
+    assert backend._get_pci_controller_name_from_ids("0000:04:00.0") == "ASMedia"
+
+    events = capsys.readouterr().err.splitlines()
+    assert (
+        'description="ASMedia Technology Inc. ASM2142/ASM3142 USB 3.1 Host Controller"'
+        in (events[0])
+    )
+    assert 'description="ASMedia Technology Inc."' in events[1]
+
+
+def test_get_pci_controller_name_falls_back_to_lspci_without_pci_ids(tmp_path, monkeypatch):
+    device_dir = tmp_path / "0000:00:14.0"
+    device_dir.mkdir()
+    (device_dir / "vendor").write_text("0x1b21\n", encoding="utf-8")
+    (device_dir / "device").write_text("0x2142\n", encoding="utf-8")
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_PCI_DEVICES_ROOT", str(tmp_path))
+    mock_result = SimpleNamespace(
+        returncode=0,
+        stdout="00:14.0 USB controller: ASMedia Technology Inc. ASM2142 USB 3.1 Host\n",
+        stderr="",
+    )
+
+    with (
+        patch("usb_tool.backend.linux.load_pci_ids_index", return_value=None),
+        patch("usb_tool.backend.linux.subprocess.run", return_value=mock_result),
+    ):
+        controller_name = LinuxBackend()._get_pci_controller_name("0000:00:14.0")
+
+    assert controller_name == "ASMedia"
+
+
+def _version_probe_candidates(count):
+    drives = []
+    probes = {}
+    descriptors = {}
+    for index in range(count):
+        block_device = f"/dev/sd{chr(ord('b') + index)}"
+        serial = f"SERIAL{index}"
+        drives.append(
+            {
+                "name": block_device,
+                "serial": serial,
+                "size_gb": 64.0,
+                "mediaType": "Basic Disk",
+                "readOnly": False,
+            }
+        )
+        probes[block_device] = _LinuxBlockDeviceProbe(block_device=block_device, serial=serial)
+        descriptors[serial] = {"idVendor": "0984", "idProduct": "1407", "bcdDevice": "0502"}
+    return drives, probes, descriptors
+
+
+def test_scan_devices_runs_version_probes_concurrently(capsys, monkeypatch):
+    import threading
+
+    drives, probes, descriptors = _version_probe_candidates(3)
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _populate(*_args, **_kwargs):
+        # Only passes if all three probes are in flight at the same time.
+        barrier.wait()
+        return {"scbPartNumber": "21-0001", "bridgeFW": "0502"}
+
+    monkeypatch.delenv("USB_TOOL_LINUX_VERSION_PROBE_WORKERS", raising=False)
+    with (
+        patch.object(LinuxBackend, "_list_usb_drives", return_value=drives),
+        patch.object(LinuxBackend, "_probe_block_devices", return_value=probes),
+        patch.object(LinuxBackend, "_resolve_probe_controllers", return_value={}),
+        patch.object(LinuxBackend, "_get_usb_descriptor_details", return_value=descriptors),
+        patch("usb_tool.backend.linux.populate_device_version", side_effect=_populate),
+    ):
+        devices = LinuxBackend().scan_devices(profile_scan=True)
+
+    captured = capsys.readouterr()
+    assert [device.scbPartNumber for device in devices] == ["21-0001"] * 3
+    assert "version_probe_workers=3" in captured.err
+    assert "version_probe_timings=/dev/sdb:" in captured.err
+    assert "version_probe=" in captured.err
+
+
+def test_scan_devices_version_probe_workers_env_serializes(monkeypatch):
+    drives, probes, descriptors = _version_probe_candidates(3)
+    active = []
+    overlap = []
+
+    def _populate(*_args, **_kwargs):
+        active.append(1)
+        overlap.append(len(active))
+        active.pop()
+        return {}
+
+    monkeypatch.setenv("USB_TOOL_LINUX_VERSION_PROBE_WORKERS", "1")
+    with (
+        patch.object(LinuxBackend, "_list_usb_drives", return_value=drives),
+        patch.object(LinuxBackend, "_probe_block_devices", return_value=probes),
+        patch.object(LinuxBackend, "_resolve_probe_controllers", return_value={}),
+        patch.object(LinuxBackend, "_get_usb_descriptor_details", return_value=descriptors),
+        patch("usb_tool.backend.linux.populate_device_version", side_effect=_populate),
+    ):
+        devices = LinuxBackend().scan_devices()
+
+    assert len(devices) == 3
+    assert overlap == [1, 1, 1]
+
+
+def test_iter_devices_yields_each_device_before_slower_probes_finish(monkeypatch):
+    import threading
+
+    drives, probes, descriptors = _version_probe_candidates(2)
+    slow_probe_may_finish = threading.Event()
+
+    def _populate(*_args, device_path=None, **_kwargs):
+        if device_path == "/dev/sdb":
+            assert slow_probe_may_finish.wait(timeout=5)
+        return {}
+
+    monkeypatch.delenv("USB_TOOL_LINUX_VERSION_PROBE_WORKERS", raising=False)
+    with (
+        patch.object(LinuxBackend, "_list_usb_drives", return_value=drives),
+        patch.object(LinuxBackend, "_probe_block_devices", return_value=probes),
+        patch.object(LinuxBackend, "_resolve_probe_controllers", return_value={}),
+        patch.object(LinuxBackend, "_get_usb_descriptor_details", return_value=descriptors),
+        patch("usb_tool.backend.linux.populate_device_version", side_effect=_populate),
+    ):
+        backend = LinuxBackend()
+        streamed = []
+        for device in backend.iter_devices():
+            streamed.append(device.blockDevice)
+            slow_probe_may_finish.set()
+        slow_probe_may_finish.clear()
+        threading.Timer(0.05, slow_probe_may_finish.set).start()
+        listed = [device.blockDevice for device in backend.scan_devices()]
+
+    assert streamed == ["/dev/sdc", "/dev/sdb"]
+    assert listed == ["/dev/sdb", "/dev/sdc"]
+
+
+def test_poke_device_result_issues_read10_over_sg_io(tmp_path, monkeypatch):
+    import fcntl
+
+    from usb_tool.backend import linux as linux_backend
+    from usb_tool.device_version import SG_IO
+
+    queue_dir = tmp_path / "sdb" / "queue"
+    queue_dir.mkdir(parents=True)
+    (queue_dir / "logical_block_size").write_text("4096\n", encoding="utf-8")
+    monkeypatch.setattr(linux_backend, "_SYSFS_CLASS_BLOCK_ROOT", str(tmp_path))
+    captured = {}
+
+    def _fake_ioctl(fd, request, header):
+        import ctypes
+
+        captured["request"] = request
+        captured["cdb"] = ctypes.string_at(header.cmdp, header.cmd_len)
+        captured["dxfer_len"] = header.dxfer_len
+        header.duration = 3
+        return 0
+
+    monkeypatch.setattr(fcntl, "ioctl", _fake_ioctl)
+    with (
+        patch("usb_tool.backend.linux.os.open", return_value=99),
+        patch("usb_tool.backend.linux.os.close"),
+    ):
+        result = LinuxBackend().poke_device_result("/dev/sdb")
+
+    assert result.success is True
+    assert result.kernel_ms == 3.0
+    assert result.command_ms is not None
+    assert 0.0 <= result.command_ms <= result.elapsed_ms
+    assert result.scsi_status == 0
+    assert captured["request"] == SG_IO
+    assert captured["cdb"] == bytes([0x28, 0, 0, 0, 0, 0, 0, 0, 1, 0])
+    assert captured["dxfer_len"] == 4096
+
+
+def test_poke_device_reports_check_condition_as_failure(monkeypatch):
+    import ctypes
+    import fcntl
+
+    def _fake_ioctl(fd, request, header):
+        header.status = 0x02
+        header.driver_status = 0x08
+        header.sb_len_wr = 3
+        ctypes.memmove(header.sbp, bytes([0x70, 0x00, 0x02]), 3)
+        return 0
+
+    monkeypatch.setattr(fcntl, "ioctl", _fake_ioctl)
+    with (
+        patch("usb_tool.backend.linux.os.open", return_value=99),
+        patch("usb_tool.backend.linux.os.close"),
+    ):
+        backend = LinuxBackend()
+        result = backend.poke_device_result("/dev/sdz")
+        success = backend.poke_device("/dev/sdz")
+
+    assert result.success is False
+    assert success is False
+    assert result.sense == bytes([0x70, 0x00, 0x02])
+
+
+def test_poke_device_result_reports_open_errors():
+    with patch(
+        "usb_tool.backend.linux.os.open", side_effect=PermissionError(13, "Permission denied")
+    ):
+        result = LinuxBackend().poke_device_result("/dev/sdb")
+
+    assert result.success is False
+    assert result.error == "Permission denied"
+
+
+def test_poke_burst_reuses_one_open_session_and_buffers(monkeypatch):
+    import fcntl
+
+    from usb_tool.services import DeviceManager
+
+    addresses = []
+
+    def _fake_ioctl(fd, request, header):
+        addresses.append((header.dxferp, header.cmdp, header.sbp))
+        header.duration = 1
+        return 0
+
+    monkeypatch.setattr(fcntl, "ioctl", _fake_ioctl)
+    with (
+        patch("usb_tool.backend.linux.os.open", return_value=99) as open_mock,
+        patch("usb_tool.backend.linux.os.close") as close_mock,
+    ):
+        burst = DeviceManager(backend=LinuxBackend()).poke_burst("/dev/sdb", 4, lbas=(0, 64))
+
+    assert burst.count == 4
+    assert burst.error_count == 0
+    assert open_mock.call_count == 1
+    assert close_mock.call_count == 1
+    assert len(set(addresses)) == 1
+
+
+def test_linux_scsi_session_exposes_data_without_copying(monkeypatch):
+    import ctypes
+    import fcntl
+
+    from usb_tool.device_version import LinuxScsiSession
+
+    def _fake_ioctl(fd, request, header):
+        ctypes.memmove(header.dxferp, b"APRICORN", 8)
+        header.resid = header.dxfer_len - 8
+        return 0
+
+    monkeypatch.setattr(fcntl, "ioctl", _fake_ioctl)
+    with (
+        patch("usb_tool.backend.linux.os.open", return_value=99),
+        patch("usb_tool.backend.linux.os.close"),
+    ):
+        with LinuxScsiSession("/dev/sdb") as session:
+            view = session.data
+            result = session.read10(lba=0x10, block_size=512)
+            assert bytes(view[: result.transferred]) == b"APRICORN"
+            assert session.read_buffer() == b"APRICORN"
+        assert session.closed
+
+    with pytest.raises(ValueError):
+        session.read10()
+
+
+def test_linux_read_buffer_reuses_session_and_clears_short_transfers(monkeypatch):
+    import ctypes
+    import errno
+    import fcntl
+
+    from usb_tool import device_version
+
+    replies = [b"X" * 64, b"APRICORN", OSError(errno.ENODEV, "No such device"), b"AGAIN"]
+
+    def _fake_ioctl(fd, request, header):
+        reply = replies.pop(0)
+        if isinstance(reply, OSError):
+            raise reply
+        ctypes.memmove(header.dxferp, reply, len(reply))
+        header.resid = header.dxfer_len - len(reply)
+        return 0
+
+    monkeypatch.setattr(device_version, "_SCSI_SESSIONS", device_version._SessionCache())
+    monkeypatch.setattr(fcntl, "ioctl", _fake_ioctl)
+    with (
+        patch("usb_tool.device_version.os.open", return_value=99) as open_mock,
+        patch("usb_tool.device_version.os.close") as close_mock,
+    ):
+        with device_version.scsi_session_scope():
+            first = device_version._linux_read_buffer("/dev/sdb")
+            second = device_version._linux_read_buffer("/dev/sdb")
+            assert open_mock.call_count == 1
+            # A stale handle (device replugged under the same name) is reopened once.
+            third = device_version._linux_read_buffer("/dev/sdb")
+            assert close_mock.call_count == 1
+        # The handle does not outlive the scan that opened it.
+        assert close_mock.call_count == 2
+
+    assert first == b"X" * 64
+    assert second == b"APRICORN"
+    assert third == b"AGAIN"
+    assert open_mock.call_count == 2
+
+
+def test_linux_read_buffer_outside_a_scan_closes_its_handle(monkeypatch):
+    import ctypes
+    import fcntl
+
+    from usb_tool import device_version
+
+    def _fake_ioctl(fd, request, header):
+        ctypes.memmove(header.dxferp, b"APRICORN", 8)
+        return 0
+
+    monkeypatch.setattr(device_version, "_SCSI_SESSIONS", device_version._SessionCache())
+    monkeypatch.setattr(fcntl, "ioctl", _fake_ioctl)
+    with (
+        patch("usb_tool.device_version.os.open", return_value=99),
+        patch("usb_tool.device_version.os.close") as close_mock,
+    ):
+        assert device_version._linux_read_buffer("/dev/sdb").startswith(b"APRICORN")
+        assert close_mock.call_count == 1
+
+
+def test_device_fingerprints_cover_usb_disks_and_track_state_flips(tmp_path, monkeypatch):
+    class_root = tmp_path / "class" / "block"
+    usb_root = tmp_path / "devices" / "pci0000:00" / "0000:00:14.0" / "usb2"
+    apricorn = _write_sysfs_usb_device(
+        usb_root, "2-1", idVendor="0984", idProduct="1407", busnum="2", devnum="5"
+    )
+    usb_block = _link_sysfs_block_device(class_root, apricorn / "2-1:1.0" / "host0", "sdb")
+    for name, value in (("dev", "8:16"), ("size", "0"), ("ro", "0"), ("removable", "1")):
+        (usb_block / name).write_text(f"{value}\n", encoding="utf-8")
+    nvme = tmp_path / "devices" / "pci0000:00" / "0000:00:1d.0" / "nvme" / "nvme0"
+    nvme_block = _link_sysfs_block_device(class_root, nvme, "nvme0n1")
+    (nvme_block / "dev").write_text("259:0\n", encoding="utf-8")
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_CLASS_BLOCK_ROOT", str(class_root))
+    backend = LinuxBackend()
+
+    locked = backend.device_fingerprints()
+    (usb_block / "size").write_text("31277232\n", encoding="utf-8")
+    unlocked = backend.device_fingerprints()
+
+    assert locked == {"/dev/sdb": ("8:16", "2", "5", "0", "0", "1")}
+    assert unlocked is not None
+    assert unlocked["/dev/sdb"] != locked["/dev/sdb"]
+
+
+def test_device_fingerprints_need_sysfs(tmp_path, monkeypatch):
+    monkeypatch.setattr("usb_tool.backend.linux._SYSFS_CLASS_BLOCK_ROOT", str(tmp_path / "missing"))
+
+    assert LinuxBackend().device_fingerprints() is None
+
+
+def _offline_fake_tree(tmp_path, monkeypatch, **kwargs):
+    from fake_sysfs import build_fake_linux_tree
+    from usb_tool.backend import linux
+    from usb_tool.backend.pci_ids import load_pci_ids_index
+
+    tree = build_fake_linux_tree(tmp_path, **kwargs)
+    monkeypatch.setattr(
+        linux, "load_pci_ids_index", lambda: load_pci_ids_index((tree.pci_ids_path,))
+    )
+    monkeypatch.setattr(
+        linux,
+        "populate_device_version",
+        lambda *args, **kwargs: dict.fromkeys(linux.VERSION_FIELD_NAMES, "N/A"),
+    )
+    backend = LinuxBackend(
+        sysfs_root=tree.sysfs_root, dev_root=tree.dev_root, udev_data_root=tree.udev_data_root
+    )
+    return tree, backend
+
+
+def test_usb_topology_resolves_each_block_device_to_its_usb_device(tmp_path, monkeypatch):
+    tree, backend = _offline_fake_tree(tmp_path, monkeypatch, apricorn_devices=9)
+
+    topology = backend._build_usb_topology()
+
+    assert set(topology.by_block_device) == {
+        disk.block_device for disk in tree.apricorn_disks
+    } | set(tree.other_disks[2:])
+    for disk in tree.apricorn_disks:
+        usb_block = topology.block_device(disk.block_device)
+        assert usb_block is not None
+        device = usb_block.device
+        assert device.serial == disk.serial
+        assert device.name == f"{disk.bus_number}-{disk.port_path}"
+        assert device.controller_pci_addr == disk.pci_addr
+        assert (device.bus_number, device.device_address) == (
+            disk.bus_number,
+            disk.device_address,
+        )
+        assert usb_block.interface.driver_name in {"uas", "usb-storage"}
+
+
+def test_scan_resolves_controller_behind_pci_bridge(tmp_path, monkeypatch):
+    tree, backend = _offline_fake_tree(tmp_path, monkeypatch, apricorn_devices=3)
+
+    devices = {device.blockDevice: device for device in backend.scan_devices()}
+
+    for disk in tree.apricorn_disks:
+        expected = "ASMedia" if disk.pci_addr == "0000:05:00.0" else "Intel"
+        assert devices[disk.block_device].usbController == expected
+
+
+def test_scan_keeps_devices_with_blank_or_duplicate_serials(tmp_path, monkeypatch):
+    tree, backend = _offline_fake_tree(tmp_path, monkeypatch, apricorn_devices=3)
+    usb_devices = tmp_path / "sys" / "bus" / "usb" / "devices"
+    first, second, third = tree.apricorn_disks
+    (usb_devices / f"{second.bus_number}-{second.port_path}" / "serial").write_text(
+        f"{first.serial}\n", encoding="utf-8"
+    )
+    (usb_devices / f"{third.bus_number}-{third.port_path}" / "serial").unlink()
+
+    with patch("usb_tool.backend.linux.subprocess.run", side_effect=AssertionError):
+        devices = backend.scan_devices()
+
+    assert [device.blockDevice for device in devices] == [
+        first.block_device,
+        second.block_device,
+        third.block_device,
+    ]
+    assert [device.iSerial for device in devices] == [first.serial, first.serial, third.serial]
+    assert [device.deviceAddress for device in devices] == [
+        first.device_address,
+        second.device_address,
+        third.device_address,
+    ]
@@ -0,0 +1,49 @@
+from usb_tool.backend import pci_ids
+
+PCI_IDS_SAMPLE = b"""#
+#\tList of PCI ID's
+#
+1002  Advanced Micro Devices, Inc. [AMD/ATI]
+\t43ee  Promontory USB 3.2 Host Controller
+1b21  ASMedia Technology Inc.
+\t2142  ASM2142/ASM3142 USB 3.1 Host Controller
+\t\t1043 8756  PRIME X470-PRO
+# Trailing vendor comment
+\t3242  ASM3242 USB 3.2 Host Controller
+8086  Intel Corporation
+\t7ae0  Alder Lake-S PCH USB 3.2 Gen 2x2 XHCI Controller
+C 0c  Serial bus controller
+\t03  USB controller
+"""
+
+
+def test_pci_ids_index_resolves_vendor_and_device_names():
+    index = pci_ids.PciIdsIndex(PCI_IDS_SAMPLE)
+
+    assert len(index) == 3
+    assert index.vendor_name(0x8086) == "Intel Corporation"
+    assert index.device_name(0x8086, 0x7AE0) == ("Alder Lake-S PCH USB 3.2 Gen 2x2 XHCI Controller")
+    assert index.device_name(0x1B21, 0x3242) == "ASM3242 USB 3.2 Host Controller"
+
+
+def test_pci_ids_index_returns_none_for_unknown_ids():
+    index = pci_ids.PciIdsIndex(PCI_IDS_SAMPLE)
+
+    assert index.vendor_name(0x1234) is None
+    assert index.device_name(0x1002, 0x1234) is None
+    assert index.device_name(0x8086, 0x0003) is None
+
+
+def test_load_pci_ids_index_is_memoized_per_path_set(tmp_path, monkeypatch):
+    database = tmp_path / "pci.ids"
+    database.write_bytes(PCI_IDS_SAMPLE)
+    monkeypatch.setattr(pci_ids, "_index_cache", {})
+    paths = (str(tmp_path / "missing.ids"), str(database))
+
+    first = pci_ids.load_pci_ids_index(paths)
+    database.unlink()
+    second = pci_ids.load_pci_ids_index(paths)
+
+    assert first is not None
+    assert first is second
+    assert pci_ids.load_pci_ids_index((str(tmp_path / "missing.ids"),)) is None
@@ -0,0 +1,123 @@
+import math
+import sys
+import time
+
+import pytest
+
+from usb_tool import probe_workers, services
+from usb_tool.deadline import scan_deadline
+from usb_tool.models import PokeResult
+from usb_tool.quarantine import ProbeQuarantine
+
+# A worker whose READ BUFFER answers with its pid, hangs for serial "HANG" and
+# reports an I/O error for serial "FAIL".
+_FAKE_WORKER = """
+import os, time
+from usb_tool import device_version, probe_workers
+
+def _query(vendor_id, product_id, serial_number, profile=None, **kwargs):
+    if serial_number == "HANG":
+        time.sleep(60)
+    if serial_number == "FAIL":
+        profile["read_error"] = "OSError"
+        return device_version._parse_payload_best_effort(b"")
+    data = b"\\x00\\x00\\x01\\x23 21-00000000000 pid=" + str(os.getpid()).encode()
+    info = device_version._parse_payload_best_effort(data)
+    info.raw_data = data
+    return info
+
+device_version.query_device_version = _query
+probe_workers.run_worker()
+"""
+
+
+@pytest.fixture
+def fake_pool():
+    pool = probe_workers.ProbeWorkerPool(size=1, command=[sys.executable, "-c", _FAKE_WORKER])
+    yield pool
+    pool.close()
+
+
+def _worker_pid(info):
+    return int(info.raw_data.rsplit(b"pid=", 1)[1])
+
+
+def test_poke_results_round_trip_through_compact_records():
+    results = [
+        PokeResult(success=True, elapsed_ms=1.5, command_ms=0.25, scsi_status=0, host_status=0),
+        PokeResult(success=False, elapsed_ms=3.0, sense=b"\x70\x00\x02", error="medium error"),
+    ]
+
+    payload = probe_workers._pack_poke_results(results)
+    decoded = probe_workers._unpack_poke_results(payload)
+
+    assert len(payload) == 2 * probe_workers._POKE_RECORD.size + 3 + len("medium error")
+    assert [result.success for result in decoded] == [True, False]
+    assert decoded[0].command_ms == pytest.approx(0.25)
+    assert decoded[0].driver_status is None
+    assert decoded[1].command_ms is None
+    assert not math.isnan(decoded[1].elapsed_ms)
+    assert decoded[1].sense == b"\x70\x00\x02"
+    assert decoded[1].error == "medium error"
+
+
+def test_module_docstring_documents_the_poke_record_format():
+    assert f"``{probe_workers._POKE_RECORD.format}``" in (probe_workers.__doc__ or "")
+
+
+def test_worker_is_reused_across_version_probes(fake_pool):
+    profile: dict = {}
+    first = fake_pool.query_device_version(0x0984, 0x1407, "SER1", profile=profile)
+    second = fake_pool.query_device_version(0x0984, 0x1407, "SER2")
+
+    assert first.scb_part_number == "21-0000"
+    assert first.bridge_fw == "0123"
+    assert profile["payload_len"] == len(first.raw_data)
+    assert "read_error" not in profile
+    assert _worker_pid(first) == _worker_pid(second)
+
+
+def test_worker_reports_read_error_without_payload(fake_pool):
+    profile: dict = {}
+    info = fake_pool.query_device_version(0x0984, 0x1407, "FAIL", profile=profile)
+
+    assert info.raw_data == b""
+    assert profile["read_error"] == "OSError"
+
+
+def test_stuck_worker_is_abandoned_at_the_deadline(fake_pool):
+    start = time.monotonic()
+    with scan_deadline(0.5), pytest.raises(TimeoutError):
+        fake_pool.query_device_version(0x0984, 0x1407, "HANG")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2.0
+    assert len(fake_pool.abandoned) == 1
+    # The next call gets a fresh worker instead of queueing behind the stuck one.
+    info = fake_pool.query_device_version(0x0984, 0x1407, "SER1")
+    assert _worker_pid(info) != fake_pool.abandoned[0]
+
+
+def test_poke_in_worker_reports_failure_for_missing_target(tmp_path):
+    with probe_workers.probe_workers(1) as pool:
+        result = pool.poke(str(tmp_path / "missing"))
+
+    assert result.success is False
+    assert probe_workers.get_probe_pool() is None
+
+
+def test_populate_device_version_quarantines_worker_timeouts(tmp_path, monkeypatch):
+    quarantine = ProbeQuarantine(tmp_path / "quarantine.json")
+    monkeypatch.setattr(services, "get_probe_quarantine", lambda: quarantine)
+    monkeypatch.setattr(services, "_should_probe_device_version", lambda: True)
+
+    with (
+        probe_workers.probe_workers(1, command=[sys.executable, "-c", _FAKE_WORKER]),
+        scan_deadline(0.5),
+    ):
+        info = services.populate_device_version(0x0984, 0x1407, "HANG")
+
+    assert info["scbPartNumber"] == "N/A"
+    entry = quarantine.active_entry("0984:1407:HANG")
+    assert entry is not None
+    assert entry.last_error == "TimeoutError"
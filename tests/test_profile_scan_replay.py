@@ -0,0 +1,239 @@
+"""Offline replay of recorded helper output against benchmarks/profile_scan_baselines.json.
+
+Each ``tests/mock_data/<platform>/<scenario>/replay.json`` names the helper commands
+a backend runs and the recorded stdout for each, plus the version-probe answer per
+serial. The scan runs with ``profile_scan=True`` on any host, the stages it reports
+are parsed from stderr, and each one must stay within baseline x threshold_multiplier.
+"""
+
+import contextlib
+import io
+import json
+import re
+import shlex
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from usb_tool.backend import linux, macos, windows
+
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_MOCK_DATA = _REPO_ROOT / "tests" / "mock_data"
+_BASELINES = json.loads(
+    (_REPO_ROOT / "benchmarks" / "profile_scan_baselines.json").read_text(encoding="utf-8")
+)
+_RUNS = 5
+# Timer resolution and scheduler jitter on sub-millisecond stages; not a budget.
+_NOISE_FLOOR_MS = 1.0
+_TEXT_METRIC = re.compile(r"(\w+)=(\d+(?:\.\d+)?)ms\b")
+_SCENARIOS = sorted(
+    (path.parent.parent.name, path.parent.name) for path in _MOCK_DATA.glob("*/*/replay.json")
+)
+
+
+class _CommandReplay:
+    """Stands in for ``subprocess.run`` and answers only recorded commands."""
+
+    def __init__(self, scenario_dir: Path, commands: list[dict[str, Any]]):
+        self.outputs: dict[tuple[str, ...], tuple[int, str]] = {}
+        for entry in commands:
+            stdout_file = entry.get("stdout_file")
+            stdout = (scenario_dir / stdout_file).read_text(encoding="utf-8") if stdout_file else ""
+            argv = tuple(shlex.split(entry["command"]))
+            self.outputs[argv] = (int(entry.get("returncode", 0)), stdout)
+        self.unexpected: list[str] = []
+
+    def __call__(self, argv: Any, *args: Any, **kwargs: Any) -> SimpleNamespace:
+        key = tuple(str(part) for part in argv)
+        if key not in self.outputs:
+            self.unexpected.append(shlex.join(key))
+            raise FileNotFoundError(key[0])
+        returncode, stdout = self.outputs[key]
+        if not kwargs.get("text") and not kwargs.get("encoding"):
+            return SimpleNamespace(returncode=returncode, stdout=stdout.encode(), stderr=b"")
+        return SimpleNamespace(returncode=returncode, stdout=stdout, stderr="")
+
+
+class _WmiReplay:
+    """Answers ``ExecQuery``/``Get`` from recorded WMI rows, keyed by class name."""
+
+    def __init__(self, tables: dict[str, list[dict[str, Any]]], objects: dict[str, Any]):
+        self.tables = tables
+        self.objects = objects
+
+    def ExecQuery(self, query: str) -> list[SimpleNamespace]:  # noqa: N802
+        match = re.search(r"\bFROM\s+(\w+)", query, re.IGNORECASE)
+        rows = self.tables.get(match.group(1), []) if match else []
+        return [SimpleNamespace(**row) for row in rows]
+
+    def Get(self, path: str) -> SimpleNamespace:  # noqa: N802
+        return SimpleNamespace(**self.objects[path])
+
+    def ConnectServer(self, *_args: Any) -> "_WmiReplay":  # noqa: N802
+        return self
+
+
+def _load_json_records(path: Path) -> list[dict[str, Any]]:
+    text = path.read_text(encoding="utf-8").strip()
+    if not text:
+        return []
+    # PowerShell's ConvertTo-Json writes a lone object instead of a one-item list.
+    records = json.loads(text)
+    return records if isinstance(records, list) else [records]
+
+
+def _replay_version_probe(version_info: dict[str, dict[str, str]]):
+    def _populate(vendor_id: int, product_id: int, serial_number: str, **_kwargs: Any) -> dict:
+        result = dict.fromkeys(("scbPartNumber", "hardwareVersion", "modelID", "mcuFW"), "N/A")
+        result["bridgeFW"] = "N/A"
+        result.update(version_info.get(serial_number, {}))
+        return result
+
+    return _populate
+
+
+def _install_linux(monkeypatch, scenario_dir: Path, tmp_path: Path, manifest: dict) -> Any:
+    # Missing sysfs and udev roots send every lookup through the recorded helpers.
+    missing = str(tmp_path / "missing")
+    monkeypatch.setattr(
+        linux, "populate_device_version", _replay_version_probe(manifest["version_info"])
+    )
+    return linux.LinuxBackend(sysfs_root=missing, udev_data_root=missing)
+
+
+def _install_macos(monkeypatch, scenario_dir: Path, tmp_path: Path, manifest: dict) -> Any:
+    monkeypatch.delenv("USB_TOOL_FORCE_MACOS_VERSION_PROBE", raising=False)
+    monkeypatch.setattr(
+        macos, "populate_device_version", _replay_version_probe(manifest["version_info"])
+    )
+    return macos.MacOSBackend()
+
+
+def _install_windows(monkeypatch, scenario_dir: Path, tmp_path: Path, manifest: dict) -> Any:
+    monkeypatch.setattr(
+        windows, "populate_device_version", _replay_version_probe(manifest["version_info"])
+    )
+    if "wmi" not in manifest:
+        monkeypatch.setattr(
+            windows.WindowsBackend,
+            "_resolve_native_scan_binary",
+            lambda self: Path("windows_native_scan.exe"),
+        )
+        return windows.WindowsBackend()
+
+    tables = dict(manifest["wmi"])
+    objects: dict[str, Any] = {}
+    links = []
+    # controllers.json rows become Win32_USBControllerDevice associations.
+    for index, row in enumerate(
+        _load_json_records(scenario_dir / manifest["usb_controllers_file"])
+    ):
+        objects[f"controller:{index}"] = {"Name": row["ControllerName"]}
+        objects[f"device:{index}"] = {"DeviceID": row["DeviceID"]}
+        links.append({"Antecedent": f"controller:{index}", "Dependent": f"device:{index}"})
+    tables["Win32_USBControllerDevice"] = links
+    service = _WmiReplay(tables, objects)
+
+    def _initialize_wmi(self) -> None:
+        self.locator = service
+        self.service = service
+        self._wmi_ready = True
+
+    monkeypatch.setattr(windows.WindowsBackend, "_resolve_native_scan_binary", lambda self: None)
+    monkeypatch.setattr(windows.WindowsBackend, "_initialize_wmi", _initialize_wmi)
+    # SetupAPI and libusb have no text form, so their parsed records are replayed.
+    monkeypatch.setattr(
+        windows.WindowsBackend,
+        "_get_disk_interface_records",
+        lambda self: [dict(record) for record in manifest["disk_interfaces"]],
+    )
+    monkeypatch.setattr(
+        windows.WindowsBackend,
+        "_get_apricorn_libusb_data",
+        lambda self: [dict(record) for record in manifest["libusb_devices"]],
+    )
+    return windows.WindowsBackend()
+
+
+_INSTALLERS = {"linux": _install_linux, "macos": _install_macos, "windows": _install_windows}
+
+
+def _iter_profile_records(stderr_text: str):
+    lines = stderr_text.splitlines()
+    index = 0
+    while index < len(lines):
+        prefix, separator, body = lines[index].partition(": ")
+        index += 1
+        if not separator:
+            continue
+        if body.strip() != "{":
+            yield prefix, body
+            continue
+        # Windows JSON profiles are pretty-printed across several lines.
+        block = [body]
+        depth = body.count("{") - body.count("}")
+        while depth > 0 and index < len(lines):
+            block.append(lines[index])
+            depth += lines[index].count("{") - lines[index].count("}")
+            index += 1
+        yield prefix, json.loads("\n".join(block))
+
+
+def _parse_stage_metrics(stderr_text: str, platform: str) -> dict[str, float]:
+    """Collect the named stage timings that ``--profile-scan`` reports for ``platform``."""
+    metrics: dict[str, float] = {}
+    for prefix, body in _iter_profile_records(stderr_text):
+        if not prefix.startswith(f"{platform}-"):
+            continue
+        if isinstance(body, dict):
+            for key, value in body.items():
+                if isinstance(value, dict) and isinstance(value.get("total_ms"), (int, float)):
+                    metrics[key] = float(value["total_ms"])
+                elif key.endswith("_ms") and isinstance(value, (int, float)):
+                    metrics[key.removesuffix("_ms")] = float(value)
+        elif "scan-profile" in prefix:
+            metrics.update({key: float(value) for key, value in _TEXT_METRIC.findall(body)})
+    return metrics
+
+
+def _replay_scan(platform: str, scenario: str, monkeypatch, tmp_path: Path):
+    scenario_dir = _MOCK_DATA / platform / scenario
+    manifest = json.loads((scenario_dir / "replay.json").read_text(encoding="utf-8"))
+    runner = _CommandReplay(scenario_dir, manifest.get("commands", []))
+    monkeypatch.setattr(f"usb_tool.backend.{platform}.subprocess.run", runner)
+    backend = _INSTALLERS[platform](monkeypatch, scenario_dir, tmp_path, manifest)
+
+    best: dict[str, float] = {}
+    devices: list[Any] = []
+    for _ in range(_RUNS):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            devices = backend.scan_devices(profile_scan=True)
+        for stage, elapsed_ms in _parse_stage_metrics(stderr.getvalue(), platform).items():
+            best[stage] = min(elapsed_ms, best.get(stage, elapsed_ms))
+    return manifest, runner, devices, best
+
+
+@pytest.mark.parametrize(("platform", "scenario"), _SCENARIOS, ids="/".join)
+def test_replayed_scan_stays_within_profile_baseline(platform, scenario, monkeypatch, tmp_path):
+    manifest, runner, devices, measured = _replay_scan(platform, scenario, monkeypatch, tmp_path)
+
+    assert runner.unexpected == [], "scan ran helpers the recording does not cover"
+    # The replay only means something if the recorded device still parses the same way.
+    serialized = [device.to_dict() for device in devices]
+    assert len(serialized) == len(manifest["expected_devices"])
+    for actual, expected in zip(serialized, manifest["expected_devices"], strict=True):
+        assert {key: actual.get(key) for key in expected} == expected
+
+    baseline = _BASELINES[platform][manifest["baseline"]]
+    multiplier = float(baseline["threshold_multiplier"])
+    compared = sorted(set(baseline["metrics"]) & set(measured))
+    assert "total" in compared, f"no comparable stages in {sorted(measured)}"
+    over_budget = {
+        stage: f"{measured[stage]:.2f}ms > {baseline['metrics'][stage] * multiplier:.2f}ms"
+        for stage in compared
+        if measured[stage] > baseline["metrics"][stage] * multiplier + _NOISE_FLOOR_MS
+    }
+    assert over_budget == {}
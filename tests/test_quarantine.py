@@ -0,0 +1,218 @@
+"""Tests for the probe quarantine (negative cache) and its use by scans and pokes."""
+
+import pytest
+
+from usb_tool import device_version, quarantine
+from usb_tool.backend.base import AbstractBackend
+from usb_tool.models import PokeResult, UsbDeviceInfo
+from usb_tool.quarantine import ProbeQuarantine, default_quarantine_path, quarantine_key
+from usb_tool.services import DeviceManager, populate_device_version
+
+_KEY = quarantine_key(0x0984, 0x1407, "SER1")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(quarantine.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def failing_query(monkeypatch):
+    calls = []
+    errors = ["OSError"]
+
+    def _fake_query(*args, profile=None, **kwargs):
+        calls.append(args)
+        if errors[0] and profile is not None:
+            profile["read_error"] = errors[0]
+        return device_version.DeviceVersionInfo(scb_part_number="N/A", mcu_fw=(None, None, None))
+
+    monkeypatch.setattr("usb_tool.services.platform.system", lambda: "Linux")
+    monkeypatch.setattr("usb_tool.services.query_device_version", _fake_query)
+    return calls, errors
+
+
+def test_backoff_doubles_per_consecutive_failure_and_caps(tmp_path, clock):
+    store = ProbeQuarantine(tmp_path / "q.json", base_backoff_s=10, max_backoff_s=35)
+    waits = []
+    for _ in range(4):
+        entry = store.record_failure(_KEY, "TimeoutError", "usb:1-4")
+        waits.append(entry.until - clock[0])
+    assert waits == [10, 20, 35, 35]
+    assert store.check(_KEY, "usb:1-4") is not None
+    clock[0] += 36
+    assert store.check(_KEY, "usb:1-4") is None
+    # Expired but not cleared: the next failure keeps counting.
+    assert store.record_failure(_KEY, "OSError", "usb:1-4").failures == 5
+
+
+def test_success_and_reenumeration_clear_the_entry(tmp_path, clock):
+    store = ProbeQuarantine(tmp_path / "q.json")
+    store.record_failure(_KEY, "OSError", "usb:1-4")
+    store.record_success(_KEY)
+    assert len(store) == 0
+
+    store.record_failure(_KEY, "OSError", "usb:1-4")
+    # Replugged: the kernel gave it a new address.
+    assert store.check(_KEY, "usb:1-9") is None
+    assert len(store) == 0
+
+
+def test_entries_persist_across_instances_and_tolerate_corruption(tmp_path, clock):
+    path = tmp_path / "q.json"
+    ProbeQuarantine(path).record_failure(_KEY, "TimeoutError")
+    entry = ProbeQuarantine(path).active_entry(_KEY)
+    assert entry is not None and entry.last_error == "TimeoutError"
+
+    path.write_text("{not json", encoding="utf-8")
+    assert ProbeQuarantine(path).active_entry(_KEY) is None
+
+
+def test_instances_see_each_others_updates(tmp_path, clock):
+    path = tmp_path / "q.json"
+    reader = ProbeQuarantine(path)
+    assert reader.check(_KEY) is None
+
+    # Another process (here: another instance) records failures after the first read.
+    writers = [ProbeQuarantine(path) for _ in range(2)]
+    writers[0].record_failure(_KEY, "TimeoutError")
+    writers[1].record_failure(_KEY, "OSError")
+
+    entry = reader.check(_KEY)
+    assert entry is not None and entry.failures == 2
+    assert (tmp_path / "q.json.lock").exists()
+
+
+def test_populate_device_version_skips_quarantined_devices(failing_query, clock):
+    calls, errors = failing_query
+    profile: dict = {}
+    populate_device_version(0x0984, 0x1407, "SER1", identity="usb:1-4")
+    result = populate_device_version(0x0984, 0x1407, "SER1", identity="usb:1-4", profile=profile)
+
+    assert len(calls) == 1
+    assert profile["quarantine"] == "skipped"
+    assert result["scbPartNumber"] == "N/A"
+    assert default_quarantine_path().is_file()
+
+    clock[0] += quarantine.DEFAULT_BASE_BACKOFF_S
+    errors[0] = ""
+    populate_device_version(0x0984, 0x1407, "SER1", identity="usb:1-4")
+    populate_device_version(0x0984, 0x1407, "SER1", identity="usb:1-4")
+    assert len(calls) == 3
+
+
+def test_permission_errors_do_not_quarantine(failing_query, clock):
+    calls, errors = failing_query
+    errors[0] = "PermissionError"
+    populate_device_version(0x0984, 0x1407, "SER1")
+    populate_device_version(0x0984, 0x1407, "SER1")
+    assert len(calls) == 2
+
+
+def test_quarantine_can_be_disabled(failing_query, monkeypatch, clock):
+    calls, _ = failing_query
+    monkeypatch.setenv("USB_TOOL_PROBE_QUARANTINE", "0")
+    populate_device_version(0x0984, 0x1407, "SER1")
+    populate_device_version(0x0984, 0x1407, "SER1")
+    assert len(calls) == 2
+
+
+def test_empty_read_that_hits_the_transport_timeout_counts_as_timeout(monkeypatch):
+    monkeypatch.setattr(device_version, "_READ_BUFFER_TIMEOUT_SEC", 0)
+    monkeypatch.setattr(device_version, "_query_usb_core", lambda *args: b"")
+    profile: dict = {}
+    device_version.query_device_version(0x0984, 0x1407, "SER1", profile=profile)
+    assert profile["read_error"] == "TimeoutError"
+
+
+class _PokeBackend(AbstractBackend):
+    def __init__(self) -> None:
+        self.pokes: list[object] = []
+
+    def scan_devices(self, expanded=False, profile_scan=False):
+        device = UsbDeviceInfo(
+            bcdUSB=3.0,
+            idVendor="0984",
+            idProduct="1407",
+            bcdDevice="0502",
+            iManufacturer="Apricorn",
+            iProduct="Secure Key 3.0",
+            iSerial="SER1",
+            driveSizeGB="16",
+            mediaType="Removable Media",
+        )
+        device.blockDevice = "/dev/sdb"
+        return [device]
+
+    def poke_device(self, device_identifier, lba=0):
+        self.pokes.append(device_identifier)
+        return True
+
+    def poke_device_result(self, device_identifier, lba=0):
+        self.pokes.append(device_identifier)
+        return PokeResult(success=True)
+
+    def sort_devices(self, devices):
+        return devices
+
+
+def test_device_manager_reports_quarantine_and_skips_pokes(clock):
+    backend = _PokeBackend()
+    manager = DeviceManager(backend=backend)
+    [healthy] = manager.list_devices()
+    assert "quarantine" not in healthy.to_dict()
+
+    store = quarantine.get_probe_quarantine()
+    assert store is not None
+    store.record_failure(_KEY, "TimeoutError", "usb:1-4")
+    [device] = manager.list_devices()
+
+    assert device.to_dict()["quarantine"]["failures"] == 1
+    assert device.quarantine["lastError"] == "TimeoutError"
+    result = manager.poke_with_result("/dev/sdb")
+    assert not result.success and "quarantined" in result.error
+    assert not manager.poke("/dev/sdb")
+    assert manager.poke_burst("/dev/sdb", 3).error_count == 3
+    assert backend.pokes == []
+
+    clock[0] += quarantine.DEFAULT_BASE_BACKOFF_S
+    assert manager.poke_with_result("/dev/sdb").success
+    assert backend.pokes == ["/dev/sdb"]
+
+
+class _FakeMonitor:
+    expanded = False
+
+    def __init__(self) -> None:
+        self.subscribers: list = []
+
+    def start(self) -> None:
+        pass
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return lambda: None
+
+    def notify(self, action, device):
+        for callback in self.subscribers:
+            callback(action, device)
+
+
+def test_unplug_resets_the_devices_quarantine(clock):
+    backend = _PokeBackend()
+    monitor = _FakeMonitor()
+    backend.create_hotplug_monitor = lambda expanded=False, device_lock=None: monitor
+    manager = DeviceManager(backend=backend)
+    manager.subscribe(lambda action, device: None)
+    [device] = backend.scan_devices()
+    store = quarantine.get_probe_quarantine()
+    assert store is not None
+
+    store.record_failure(_KEY, "TimeoutError")
+    monitor.notify("add", device)
+    assert store.active_entry(_KEY) is not None
+
+    monitor.notify("remove", device)
+    assert store.active_entry(_KEY) is None
@@ -0,0 +1,155 @@
+"""Tests for the scan tracer and its exporters."""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from usb_tool import device_version, tracing
+from usb_tool.backend import linux
+from usb_tool.tracing import Tracer, export_chrome_trace, export_json, export_text, get_tracer
+
+
+def test_default_tracer_is_disabled_and_records_nothing():
+    tracer = get_tracer()
+    assert not tracer.enabled
+    with tracer.span("scan", block_device="/dev/sda") as span:
+        span.set(device_count=1)
+    tracer.event("linux-scan-profile details", device_count=1)
+    tracer.add_span("lsblk", 0.0, 1.0)
+    assert tracer.current() is None
+    assert tracer.spans() == []
+
+
+def test_tracing_context_restores_previous_tracer():
+    before = get_tracer()
+    with tracing.tracing() as tracer:
+        assert get_tracer() is tracer
+        assert tracer.enabled
+    assert get_tracer() is before
+
+
+def test_spans_nest_on_one_thread_and_record_errors():
+    tracer = Tracer()
+    try:
+        with tracer.span("scan", category="scan") as outer:
+            with tracer.span("lsblk", category="linux-scan") as inner:
+                inner.set(drives=2)
+            tracer.event("linux-scan-profile details", device_count=2)
+            raise RuntimeError("helper missing")
+    except RuntimeError:
+        pass
+
+    spans = {span.name: span for span in tracer.spans()}
+    assert spans["lsblk"].parent_id == outer.span_id
+    assert spans["lsblk"].attrs == {"drives": 2}
+    assert spans["linux-scan-profile details"].parent_id == outer.span_id
+    assert spans["linux-scan-profile details"].instant
+    assert spans["scan"].parent_id is None
+    assert spans["scan"].attrs["error"] == "RuntimeError: helper missing"
+    assert tracer.current() is None
+
+
+def test_worker_thread_spans_take_an_explicit_parent():
+    tracer = Tracer()
+    with tracer.span("scan") as root:
+        parent = tracer.current()
+
+        def _worker() -> None:
+            with tracer.span("populate_device_version", parent=parent):
+                pass
+
+        thread = threading.Thread(target=_worker, name="probe-0")
+        thread.start()
+        thread.join()
+
+    worker = next(span for span in tracer.spans() if span.name == "populate_device_version")
+    assert worker.parent_id == root.span_id
+    assert worker.thread_name == "probe-0"
+    assert worker.thread_id != root.thread_id
+
+
+def test_exporters_render_spans_and_events():
+    tracer = Tracer()
+    with tracer.span("scan", category="scan", expanded=False):
+        tracer.event("linux-scan-profile details", device_count=1)
+
+    chrome = export_chrome_trace(tracer)
+    json.dumps(chrome)
+    phases = [event["ph"] for event in chrome["traceEvents"]]
+    assert phases == ["M", "X", "i"]
+    complete = chrome["traceEvents"][1]
+    assert complete["name"] == "scan"
+    assert complete["args"] == {"expanded": False}
+    assert complete["dur"] >= 0
+
+    records = export_json(tracer)
+    assert [record["kind"] for record in records] == ["span", "event"]
+    assert records[1]["parent"] == records[0]["id"]
+    assert records[1]["duration_ms"] is None
+
+    lines = export_text(tracer).splitlines()
+    assert lines[0].startswith("scan scan: duration_ms=")
+    assert lines[1] == "linux-scan-profile details: device_count=1"
+
+
+def test_write_trace_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="svg"):
+        tracing.write_trace(Tracer(), str(tmp_path / "trace.out"), "svg")
+
+
+def test_write_trace_chrome_output_is_loadable(tmp_path):
+    tracer = Tracer()
+    with tracer.span("scan"):
+        pass
+    path = tmp_path / "trace.json"
+    tracing.write_trace(tracer, str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))["traceEvents"][1]["name"] == "scan"
+
+
+def test_query_device_version_reports_transport_and_parse_spans(monkeypatch):
+    monkeypatch.setattr(device_version, "_query_usb_core", lambda *args: b"")
+    with tracing.tracing() as tracer:
+        device_version.query_device_version(0x0984, 0x1410, "141420000016", profile={})
+
+    spans = {span.name: span for span in tracer.spans()}
+    query = spans["query_device_version"]
+    assert query.attrs["product_id"] == "1410"
+    assert query.attrs["payload_len"] == 0
+    assert spans["read_buffer"].parent_id == query.span_id
+    assert spans["read_buffer"].attrs["transport"] == "libusb"
+
+
+def test_linux_version_probes_show_as_overlapping_worker_spans(monkeypatch):
+    # Both probes must be in flight at once for the barrier to release.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _populate(*_args, **_kwargs):
+        barrier.wait()
+        return dict.fromkeys(linux.VERSION_FIELD_NAMES, "N/A")
+
+    monkeypatch.setattr(linux, "populate_device_version", _populate)
+    candidates = [
+        SimpleNamespace(
+            vid="0984",
+            pid="1410",
+            serial=f"SERIAL{index}",
+            block_device=f"/dev/sd{letter}",
+            size_gb="16.0",
+            bcd_device="0502",
+            identity="",
+        )
+        for index, letter in enumerate("ab")
+    ]
+    backend = linux.LinuxBackend()
+    with tracing.tracing() as tracer:
+        with tracer.span("scan") as root:
+            list(backend._iter_device_versions(candidates))
+
+    probes = [span for span in tracer.spans() if span.name == "populate_device_version"]
+    assert len(probes) == 2
+    assert {span.parent_id for span in probes} == {root.span_id}
+    assert probes[0].thread_id != probes[1].thread_id
+    first, second = probes
+    assert first.end is not None and second.start < first.end
@@ -17,3 +17,11 @@ def test_parse_usb_version():
     """parse_usb_version converts BCD values to strings."""
     assert utils.parse_usb_version(0x0310) == "3.1"
     assert utils.parse_usb_version(0x0211) == "2.11"
+
+
+def test_percentile():
+    """percentile interpolates between ranks and handles empty input."""
+    assert utils.percentile([], 50) is None
+    assert utils.percentile([5.0], 99) == 5.0
+    assert utils.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert utils.percentile([4.0, 1.0, 3.0, 2.0], 100) == 4.0
@@ -30,7 +30,7 @@ def test_get_version_prefers_repo_pyproject_over_installed_metadata(monkeypatch,
     _write_pyproject(pyproject, "1.4.7")
     monkeypatch.delenv("USB_TOOL_VERSION", raising=False)
     monkeypatch.setattr(version_mod, "_module_root_candidates", lambda: iter([tmp_path]))
-    monkeypatch.setattr(version_mod.importlib.metadata, "version", lambda _name: "9.8.7")
+    monkeypatch.setattr(importlib.metadata, "version", lambda _name: "9.8.7")
 
     resolved = version_mod.get_version()
 
@@ -42,7 +42,7 @@ def test_get_version_falls_back_to_metadata_when_repo_name_mismatches(monkeypatc
     _write_pyproject(pyproject, "1.4.7", name="not-apricorn-usb-toolkit")
     monkeypatch.delenv("USB_TOOL_VERSION", raising=False)
     monkeypatch.setattr(version_mod, "_module_root_candidates", lambda: iter([tmp_path]))
-    monkeypatch.setattr(version_mod.importlib.metadata, "version", lambda _name: "9.8.7")
+    monkeypatch.setattr(importlib.metadata, "version", lambda _name: "9.8.7")
 
     resolved = version_mod.get_version()
 
@@ -56,7 +56,7 @@ def test_get_version_returns_unknown_when_no_source_is_available(monkeypatch):
     def _missing(_name: str) -> str:
         raise importlib.metadata.PackageNotFoundError
 
-    monkeypatch.setattr(version_mod.importlib.metadata, "version", _missing)
+    monkeypatch.setattr(importlib.metadata, "version", _missing)
 
     resolved = version_mod.get_version()
 
@@ -1,4 +1,6 @@
 import sys
+import threading
+import types
 from unittest.mock import patch
 
 import pytest
@@ -171,6 +173,58 @@ def test_populate_device_version_queries_macos(monkeypatch):
     assert captured["bsd_name"] == "/dev/disk4"
 
 
+@pytest.fixture
+def fake_pyusb(monkeypatch):
+    usb = types.ModuleType("usb")
+    usb.core = types.ModuleType("usb.core")
+    usb.util = types.ModuleType("usb.util")
+    for name, module in (("usb", usb), ("usb.core", usb.core), ("usb.util", usb.util)):
+        monkeypatch.setitem(sys.modules, name, module)
+    return usb
+
+
+def test_macos_probe_remounts_even_when_the_read_fails(monkeypatch, fake_pyusb):
+    commands = []
+    monkeypatch.setattr(device_version.sys, "platform", "darwin")
+    monkeypatch.setattr(device_version.time, "sleep", lambda _seconds: None)
+    monkeypatch.setattr(
+        device_version.subprocess, "run", lambda cmd, **_kwargs: commands.append(cmd[:2])
+    )
+
+    def _not_found(*_args):
+        raise ValueError("Device not found")
+
+    monkeypatch.setattr(device_version, "_libusb_read_buffer", _not_found)
+
+    with pytest.raises(ValueError):
+        device_version._query_usb_core(0x0984, 0x1407, "SER123", "/dev/disk4")
+
+    assert commands == [["diskutil", "unmountDisk"], ["diskutil", "mountDisk"]]
+    assert device_version._wait_for_remounts(0) is True
+
+
+def test_exit_waits_for_an_abandoned_macos_probe_to_remount(monkeypatch, fake_pyusb):
+    release = threading.Event()
+    monkeypatch.setattr(device_version.sys, "platform", "darwin")
+    monkeypatch.setattr(device_version.time, "sleep", lambda _seconds: None)
+    monkeypatch.setattr(device_version.subprocess, "run", lambda *_args, **_kwargs: None)
+    # Stands in for a libusb read the scan deadline gave up on.
+    monkeypatch.setattr(device_version, "_libusb_read_buffer", lambda *_args: release.wait(5))
+
+    probe = threading.Thread(
+        target=device_version._query_usb_core,
+        args=(0x0984, 0x1407, "SER123", "/dev/disk4"),
+        daemon=True,
+    )
+    probe.start()
+    try:
+        assert device_version._wait_for_remounts(0.05) is False
+    finally:
+        release.set()
+    assert device_version._wait_for_remounts(5) is True
+    probe.join(timeout=5)
+
+
 def test_query_device_version_uses_linux_sg_io(monkeypatch):
     payload = bytes.fromhex(
         "5917046341707269636f726e536563757265204b657920332e3020203678000328"
@@ -255,7 +309,7 @@ def test_linux_scan_hides_version_fields_when_bridge_mismatches_bcd():
             "_resolve_probe_controllers",
             return_value={"/dev/sda": "Intel"},
         ),
-        patch.object(LinuxBackend, "_get_lsusb_details", return_value=lsusb_details),
+        patch.object(LinuxBackend, "_get_usb_descriptor_details", return_value=lsusb_details),
         patch(
             "usb_tool.backend.linux.populate_device_version",
             return_value={
@@ -315,7 +369,7 @@ def test_linux_scan_keeps_version_fields_when_bridge_matches_bcd():
             "_resolve_probe_controllers",
             return_value={"/dev/sda": "Intel"},
         ),
-        patch.object(LinuxBackend, "_get_lsusb_details", return_value=lsusb_details),
+        patch.object(LinuxBackend, "_get_usb_descriptor_details", return_value=lsusb_details),
         patch(
             "usb_tool.backend.linux.populate_device_version",
             return_value={
@@ -350,3 +404,27 @@ def test_windows_read_buffer_uses_device_namespace_path(monkeypatch):
         device_version._windows_read_buffer(4)
 
     assert captured["path"] == r"\\.\PhysicalDrive4"
+
+
+@pytest.mark.skipif(sys.platform != "win32", reason="Windows SCSI pass-through")
+def test_windows_read_buffer_returns_full_buffer_on_short_transfer(monkeypatch):
+    import ctypes
+
+    payload = b"\x00\x00\x01\x23 21-0000 OOB"
+
+    def _fake_ioctl(_handle, _code, in_buffer, *_args):
+        # An OOB-mode device: CHECK CONDITION and no transfer length, data present.
+        sptd = in_buffer._obj.sptd
+        ctypes.memmove(sptd.DataBuffer, payload, len(payload))
+        sptd.DataTransferLength = 0
+        sptd.ScsiStatus = 2
+        return 1
+
+    monkeypatch.setattr("ctypes.windll.kernel32.CreateFileW", lambda *_args: 7)
+    monkeypatch.setattr("ctypes.windll.kernel32.DeviceIoControl", _fake_ioctl)
+    monkeypatch.setattr("ctypes.windll.kernel32.CloseHandle", lambda _handle: 1)
+
+    data = device_version._windows_read_buffer(4)
+
+    assert len(data) == device_version.READ_BUFFER_LENGTH
+    assert data.startswith(payload)
@@ -891,6 +891,8 @@ def test_scan_devices_native_invokes_python_version_probe_only_for_na_drive_size
                     "iSerial": "SER123",
                     "driveSizeGB": "N/A",
                     "physicalDriveNum": 7,
+                    "busNumber": 2,
+                    "deviceAddress": 5,
                 },
                 "2": {
                     "idVendor": "0984",
@@ -915,9 +917,41 @@ def test_scan_devices_native_invokes_python_version_probe_only_for_na_drive_size
         "1407",
         "SER123",
         7,
+        bcd_device="0502",
+        identity="usb:2-5",
     )
 
 
+def test_iter_devices_native_yields_unprobed_devices_before_version_probes():
+    backend = object.__new__(WindowsBackend)
+    backend._native_scan_binary = "windows_native_scan.exe"
+    backend._native_scan_path_for_run = None
+    backend._native_scan_enabled = True
+    probed = []
+    backend._timed_populate_device_version = MagicMock(
+        side_effect=lambda *args, **kwargs: probed.append(args[2]) or {"_profile_ms": 1.0}
+    )
+    payload = {
+        "devices": [
+            {
+                "1": {"idVendor": "0984", "iSerial": "OOB1", "driveSizeGB": "N/A"},
+                "2": {"idVendor": "0984", "iSerial": "READY", "driveSizeGB": 16},
+            }
+        ]
+    }
+    native_result = SimpleNamespace(returncode=0, stdout=json.dumps(payload), stderr="")
+
+    with patch("usb_tool.backend.windows.subprocess.run", return_value=native_result):
+        devices = backend.iter_devices()
+        first = next(devices)
+        assert first.iSerial == "READY"
+        assert probed == []
+        remaining = list(devices)
+
+    assert [device.iSerial for device in remaining] == ["OOB1"]
+    assert probed == ["OOB1"]
+
+
 def test_scan_devices_native_attaches_version_fields_from_python_probe():
     backend = object.__new__(WindowsBackend)
     backend._native_scan_binary = "windows_native_scan.exe"
@@ -1031,6 +1065,7 @@ def test_timed_populate_device_version_tracks_profile_metrics_without_emitting_l
         physical_drive_num=None,
         device_path=None,
         profile=None,
+        **_kwargs,
     ):
         if profile is not None:
             profile.update(